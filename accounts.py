@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+수집 대상 계정 목록 (계정별 토큰 / 스프레드시트 / 출력 폴더)
+
+등록 방법 (둘 중 하나, 없으면 기존처럼 환경변수/config.py의 계정 1개만 수집):
+  ACCOUNTS_JSON  환경변수에 JSON 문자열 (GitHub Actions Secret용)
+  ACCOUNTS_FILE  JSON 파일 경로 (로컬용, 기본값 accounts.json)
+
+형식:
+  {"accounts": [
+    {"name": "flyingjapan", "ig_id": "1784...", "token_env": "ACCESS_TOKEN_FLYINGJAPAN",
+     "spreadsheet_id": "1AbC...", "data_dir": "docs/data/flyingjapan"}
+  ]}
+  - 토큰은 token_env(환경변수 이름) 또는 access_token(직접 입력) 중 하나
+  - data_dir 생략 시 docs/data/<name>
+"""
+
+import json
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Account:
+    """계정 1개의 수집 컨텍스트
+
+    Graph 클라이언트(= 속도 제한기)와 스프레드시트 연결을 계정마다 따로 가지므로
+    여러 계정을 동시에 수집해도 호출 한도와 오류가 서로 섞이지 않는다.
+    """
+
+    def __init__(self, name, ig_id, access_token, spreadsheet_id, data_dir, state_dir, graph,
+                 token_secret="ACCESS_TOKEN", token_file=None):
+        self.name = name
+        self.ig_id = ig_id
+        self.access_token = access_token
+        self.spreadsheet_id = spreadsheet_id
+        self.data_dir = data_dir
+        self.state_dir = state_dir
+        self.graph = graph
+        self.token_secret = token_secret  # 토큰 갱신 시 업데이트할 GitHub Secret 이름
+        self.token_file = token_file      # 토큰 갱신 시 새 토큰으로 바꿔 쓸 로컬 파일
+        self.spreadsheet = None           # get_sheet()에서 한 번 열고 재사용
+        self.metrics = None               # 이번 실행의 RunMetrics (run_account에서 생성)
+
+    def state_path(self, filename):
+        return os.path.join(self.state_dir, filename)
+
+    def __repr__(self):
+        return f"Account({self.name!r}, ig_id={self.ig_id!r})"
+
+
+def load_registry():
+    """ACCOUNTS_JSON / ACCOUNTS_FILE → (계정 설정 목록, 설정 파일 경로 또는 None)
+
+    등록된 계정이 없으면 ([], None)
+    """
+    inline = os.environ.get("ACCOUNTS_JSON", "").strip()
+    if inline:
+        return _validate(json.loads(inline)), None
+    path = os.environ.get("ACCOUNTS_FILE", os.path.join(BASE_DIR, "accounts.json"))
+    if not os.path.exists(path):
+        return [], None
+    with open(path, "r", encoding="utf-8") as f:
+        return _validate(json.load(f)), path
+
+
+def _validate(registry):
+    entries = registry.get("accounts", []) if isinstance(registry, dict) else registry
+    names = set()
+    for entry in entries:
+        for key in ("name", "ig_id", "spreadsheet_id"):
+            if not entry.get(key):
+                raise ValueError(f"계정 설정에 {key}가 없습니다: {entry}")
+        if not entry.get("access_token") and not entry.get("token_env"):
+            raise ValueError(f"계정 '{entry['name']}'에 access_token 또는 token_env가 필요합니다")
+        if entry["name"] in names:
+            raise ValueError(f"계정 이름 중복: {entry['name']}")
+        names.add(entry["name"])
+    return entries
+
+
+def account_from_entry(entry, state_root, graph, registry_path=None):
+    """계정 설정 1개 → Account (토큰은 token_env 환경변수 우선)"""
+    token_env = entry.get("token_env")
+    access_token = os.environ.get(token_env, "") if token_env else entry["access_token"]
+    data_dir = entry.get("data_dir") or os.path.join("docs", "data", entry["name"])
+    return Account(
+        name=entry["name"],
+        ig_id=str(entry["ig_id"]),
+        access_token=access_token,
+        spreadsheet_id=entry["spreadsheet_id"],
+        data_dir=data_dir if os.path.isabs(data_dir) else os.path.join(BASE_DIR, data_dir),
+        state_dir=os.path.join(state_root, entry["name"]),
+        graph=graph,
+        token_secret=entry.get("token_secret") or token_env,
+        token_file=None if token_env else registry_path,
+    )
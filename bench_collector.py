@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+수집기 처리량 벤치마크 (실제 API 대신 mock_graph_server.py 목 서버 사용)
+게시물 수 × 인사이트 요청 방식마다 collect_all_insights를 별도 프로세스에서 실행하고
+소요 시간 / 요청 수 / 최대 메모리(RSS)를 표로 출력
+
+사용 예:
+  python bench_collector.py                                  # 500 / 5,000 / 50,000개, batch 모드
+  python bench_collector.py --sizes 500,5000 --modes single,batch,inline --latency-ms 20
+  python bench_collector.py --json bench_output.json         # 결과 저장
+  python bench_collector.py --baseline bench_output.json     # 이전 결과보다 느려지거나 요청이 늘면 종료 코드 1
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_graph_server import MOCK_IG_ID, MockGraphServer, add_fault_arguments, fault_options
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_child(args):
+    """(자식 프로세스) 수집 1회 실행 → 결과 JSON을 args.result에 기록
+
+    ig_insights는 import 시 설정을 읽으므로 환경변수를 먼저 채운 뒤 import한다.
+    """
+    state_dir = tempfile.mkdtemp(prefix="bench_state_")
+    os.environ.update({
+        "GITHUB_ACTIONS": "1",  # config.py 대신 환경변수에서 설정 읽기
+        "GRAPH_BASE_URL": args.base_url,
+        "INSTAGRAM_BUSINESS_ACCOUNT_ID": MOCK_IG_ID,
+        "ACCESS_TOKEN": "mock-token",
+        "STATE_DIR": state_dir,
+        "INSIGHTS_RATE_PER_SEC": str(args.rate),
+    })
+    sys.path.insert(0, BASE_DIR)
+    import resource
+    import tracemalloc
+    import ig_insights
+    from accounts import Account
+
+    account = Account(
+        name="bench",
+        ig_id=MOCK_IG_ID,
+        access_token="mock-token",
+        spreadsheet_id="",
+        data_dir=state_dir,
+        state_dir=state_dir,
+        graph=ig_insights.new_graph_client(),
+    )
+    if args.tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    # 게시물별 진행 로그는 버림 (5만 줄 출력 자체가 측정을 왜곡)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results, _, _ = ig_insights.collect_all_insights(account, limit=args.posts, mode=args.mode)
+    elapsed = time.perf_counter() - started
+    result = {
+        "rows": len(results),
+        "seconds": round(elapsed, 3),
+        # 리눅스 ru_maxrss 단위는 KB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    if args.tracemalloc:
+        result["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def bench_once(server, posts, mode, args):
+    """목 서버 통계를 초기화하고 자식 프로세스에서 수집 1회 → 결과 dict"""
+    server.graph.reset()
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        result_path = tmp.name
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--child",
+        "--base-url", server.base_url,
+        "--posts", str(posts),
+        "--mode", mode,
+        "--rate", str(args.rate),
+        "--result", result_path,
+    ]
+    if args.tracemalloc:
+        cmd.append("--tracemalloc")
+    try:
+        subprocess.run(cmd, check=True, cwd=BASE_DIR)
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    finally:
+        os.remove(result_path)
+
+    stats = server.graph.snapshot()
+    result.update({
+        "posts": posts,
+        "mode": mode,
+        "requests": stats.get("requests", 0),
+        "batch_items": stats.get("batch_items", 0),
+        "retried": stats.get("errors", 0) + stats.get("throttled", 0),
+        "mb_received": round(stats.get("bytes_out", 0) / 1024 / 1024, 1),
+        "posts_per_sec": round(result["rows"] / result["seconds"], 1) if result["seconds"] else 0,
+    })
+    return result
+
+
+def print_table(results):
+    header = f"{'게시물':>8} {'모드':>7} {'소요(초)':>9} {'요청 수':>8} {'batch 하위':>10} {'오류 응답':>8} {'수신(MB)':>9} {'게시물/초':>9} {'최대 RSS(MB)':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['posts']:>8,} {r['mode']:>7} {r['seconds']:>9.2f} {r['requests']:>8,} {r['batch_items']:>10,} "
+              f"{r['retried']:>8,} {r['mb_received']:>9.1f} {r['posts_per_sec']:>9,.0f} {r['peak_rss_mb']:>12.1f}")
+
+
+def compare_baseline(results, baseline_path, tolerance):
+    """이전 결과와 비교 → 회귀 목록 (소요 시간 tolerance 초과 증가 / 요청 수 증가)"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["posts"], r["mode"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        base = baseline.get((r["posts"], r["mode"]))
+        if not base:
+            continue
+        if r["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append(f"{r['posts']:,}개 {r['mode']}: 소요 {base['seconds']:.2f}초 → {r['seconds']:.2f}초")
+        if r["requests"] > base["requests"]:
+            regressions.append(f"{r['posts']:,}개 {r['mode']}: 요청 {base['requests']:,}회 → {r['requests']:,}회")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="collect_all_insights 처리량 벤치마크 (목 Graph 서버)")
+    parser.add_argument("--sizes", default="500,5000,50000", help="게시물 수 목록 (쉼표 구분)")
+    parser.add_argument("--modes", default="batch", help="인사이트 요청 방식 목록: single,batch,inline")
+    parser.add_argument("--rate", type=float, default=0, help="INSIGHTS_RATE_PER_SEC (0이면 속도 제한 없음)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Python 힙 최대 사용량도 측정 (느려짐)")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 소요 시간 증가율 (기본 20%%)")
+    add_fault_arguments(parser)
+    # 내부용: 자식 프로세스 실행
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--posts", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    results = []
+    with MockGraphServer(posts=max(sizes), **fault_options(args)) as server:
+        print(f"목 Graph 서버: {server.base_url} (게시물 {max(sizes):,}개)")
+        for posts in sizes:
+            for mode in modes:
+                print(f"  수집 중: {posts:,}개 / {mode} ...", flush=True)
+                results.append(bench_once(server, posts, mode, args))
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "options": vars(args), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ 성능 회귀:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n기준 결과 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Google Sheets 호출 비용 벤치마크 (mock_sheets.py 메모리 대역 사용, 인증 불필요)
+수집 1회의 시트 단계를 실제 함수 그대로 실행하고 단계별 읽기/쓰기 호출 수, 셀 수, 바이트를 집계
+
+단계: 시트 읽기 → 자동수집 기록 → 팔로워추적 → 일별종합리포트 → 행 수 메타데이터
+      → JSON 내보내기(export_json, 시트 다시 읽기) → 서식 적용(format_sheet)
+1회차는 빈 스프레드시트(시트 생성 포함), 2회차부터는 하루씩 지난 다음 날 실행을 흉내 냄
+  - 게시물 일부(--churn)의 지표 변화
+  - 체크 일자 / 팔로워 수 / 팔로워 대비 도달율 열 변화 (모든 행)
+  - 새 게시물(--new-posts)이 맨 위에 추가
+
+사용 예:
+  python bench_sheets.py                              # 게시물 500개, 2회 실행
+  python bench_sheets.py --posts 300 --runs 3 --churn 0.2 --new-posts 5
+  python bench_sheets.py --json sheets_cost.json      # 결과 저장
+  python bench_sheets.py --baseline sheets_cost.json  # 이전 결과보다 호출·셀·바이트가 늘면 종료 코드 1
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# ig_insights / export_json / format_sheet는 import 시 설정을 읽음 → config.py 대신 환경변수 사용
+os.environ.setdefault("GITHUB_ACTIONS", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import export_json
+import format_sheet
+import ig_insights
+from accounts import Account
+from mock_graph_server import MockGraph
+from mock_sheets import MockSheetsSession
+from sheet_snapshot import SheetSnapshot
+
+SPREADSHEET_ID = "bench-spreadsheet"
+METRICS = ["read_calls", "write_calls", "cells_read", "cells_written", "batch_requests", "bytes_sent", "bytes_received"]
+
+
+def synthetic_rows(graph, posts, run, runs, churn, new_posts):
+    """목 Graph 데이터 → run회차(0부터, 하루씩 지남)의 자동수집 행
+
+    목 게시물 번호가 작을수록 최신 → 마지막 회차가 번호 0부터 보이도록 회차마다 new_posts개씩 앞으로 당김
+    run회차에는 최근 게시물 churn 비율만 지표가 바뀜
+    """
+    offset = new_posts * (runs - 1 - run)
+    visible = posts + new_posts * run
+    changed = int(visible * churn) if run else 0
+    day = datetime.now() + timedelta(days=run)
+    check_date = f"{day.strftime('%y.%m.%d')}({ig_insights.WEEKDAYS_KO[day.weekday()]})"
+    rows = []
+    for n, i in enumerate(range(offset, offset + visible)):
+        media = graph.media(i)
+        values = graph.insights_values(i)
+        scale = 1 + 0.05 * run if n < changed else 1
+        metrics = ig_insights.insights_metrics(media["media_type"]).split(",")
+        insights = {m: int(values[m] * scale) for m in metrics}
+        rows.append(ig_insights.build_row(media, insights, graph.followers + run, graph.username, check_date))
+    return rows
+
+
+def run_once(session, spreadsheet, account, rows, followers, following):
+    """run_account + export_json.main + format_sheet의 시트 단계를 순서대로 실행"""
+    with session.stage("시트 읽기"):
+        snapshot = SheetSnapshot(spreadsheet, ig_insights.SHEET_TITLES)
+    with session.stage("자동수집 기록"):
+        auto_values = ig_insights.write_to_sheet(account, rows, snapshot)
+    with session.stage("팔로워추적"):
+        follower_values = ig_insights.write_follower_tracking(spreadsheet, followers, following, snapshot)
+    with session.stage("일별종합리포트"):
+        report_values = ig_insights.write_daily_report(spreadsheet, rows, followers, following, snapshot)
+    with session.stage("행 수 메타데이터"):
+        ig_insights.record_row_counts(snapshot, {
+            "자동수집": auto_values,
+            "팔로워추적": follower_values,
+            "일별종합리포트": report_values,
+        })
+    with session.stage("JSON 내보내기"):
+        export_snapshot = SheetSnapshot(spreadsheet, export_json.SHEET_TITLES)
+        posts = export_json.export_posts(export_snapshot)
+        export_json.export_followers(export_snapshot)
+        export_json.export_daily_report(export_snapshot)
+    with session.stage("서식 적용"):
+        format_sheet.apply_layouts(spreadsheet)
+    return posts
+
+
+def print_table(run, report):
+    header = f"{'단계':<14}" + "".join(f"{name:>15}" for name in METRICS)
+    print(f"\n[{run}회차]")
+    print(header)
+    print("-" * len(header))
+    for stage, counters in report.items():
+        print(f"{stage:<14}" + "".join(f"{counters.get(name, 0):>15,}" for name in METRICS))
+
+
+def compare_baseline(results, baseline_path):
+    """이전 결과와 비교 → 회귀 목록 (회차·단계별 지표가 하나라도 늘면 회귀)"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("posts") != results["posts"]:
+        print(f"  (기준 결과의 게시물 수가 다름: {baseline.get('posts')} → {results['posts']})")
+    regressions = []
+    for run, report in enumerate(results["runs"], start=1):
+        if run > len(baseline["runs"]):
+            break
+        base_report = baseline["runs"][run - 1]
+        for stage, counters in report.items():
+            for name in METRICS:
+                before = base_report.get(stage, {}).get(name, 0)
+                after = counters.get(name, 0)
+                if after > before:
+                    regressions.append(f"{run}회차 {stage} {name}: {before:,} → {after:,}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Sheets 호출 비용 벤치마크 (메모리 대역)")
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=2, help="실행 횟수 (1회차는 빈 스프레드시트)")
+    parser.add_argument("--churn", type=float, default=0.1, help="2회차부터 지표가 바뀌는 게시물 비율")
+    parser.add_argument("--new-posts", type=int, default=3, help="2회차부터 회차마다 맨 위에 추가되는 새 게시물 수")
+    parser.add_argument("--loose-grid", action="store_true", help="시트 크기를 넘는 쓰기를 오류 대신 자동 확장")
+    parser.add_argument("--verbose", action="store_true", help="시트 기록 함수의 로그 출력")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    session = MockSheetsSession(strict_grid=not args.loose_grid)
+    session.create_spreadsheet(SPREADSHEET_ID)
+    account = Account("bench", "", "", SPREADSHEET_ID, data_dir="", state_dir="", graph=None)
+    account.spreadsheet = session.client().open_by_key(SPREADSHEET_ID)
+    graph = MockGraph(posts=args.posts + args.new_posts * (args.runs - 1))
+
+    results = {"posts": args.posts, "churn": args.churn, "new_posts": args.new_posts, "runs": []}
+    for run in range(args.runs):
+        rows = synthetic_rows(graph, args.posts, run, args.runs, args.churn, args.new_posts)
+        session.reset_stats()
+        started = time.perf_counter()
+        log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+        with log:
+            posts = run_once(session, account.spreadsheet, account, rows, graph.followers + run, 321)
+        elapsed = time.perf_counter() - started
+        report = session.report()
+        results["runs"].append(report)
+        print_table(run + 1, report)
+        if run:
+            print(f"  다음 날 실행: 체크 일자 {rows[0][1]}, 팔로워 {graph.followers + run:,}명, "
+                  f"새 게시물 {args.new_posts}개, 지표 변화 {int(len(rows) * args.churn):,}개")
+        print(f"  내보낸 게시물 {len(posts):,}개 / 대역 처리 {elapsed:.2f}초")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline)
+        if regressions:
+            print("\n⚠️ 시트 호출 비용 증가:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n기준 결과 대비 증가 없음")
+
+
+if __name__ == "__main__":
+    main()
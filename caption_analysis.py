@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+캡션 분석 (제목 / 카테고리 / 해시태그 / 멘션 / 이모지 수 / 길이)
+정규식은 import 시 한 번만 컴파일하고, 결과는 (게시물 ID, 캡션) 해시로 디스크에 캐시
+캡션이 바뀌지 않은 게시물은 매일 다시 분석하지 않음
+"""
+
+import hashlib
+import json
+import os
+import re
+
+# 분석 규칙이 바뀌면 올려서 캐시 전체를 무효화
+ANALYZER_VERSION = 1
+
+TITLE_MAX_LEN = 80
+NO_CAPTION_TITLE = "(캡션 없음)"
+
+# 제목 판정: 이 패턴을 지운 뒤 2글자 이상 남으면 텍스트 줄 (이모지만 있는 줄 건너뛰기)
+NON_TEXT_RE = re.compile(r'[^\w\s가-힣a-zA-Z0-9]')
+# 해시태그 / 멘션 (한 번의 탐색으로 둘 다 수집, 멘션 끝의 마침표는 제외)
+TAG_RE = re.compile(r'#(\w+)|@(\w(?:[\w.]*\w)?)')
+EMOJI_RE = re.compile(
+    "[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF\u3030\u303D\u3297\u3299]"
+)
+
+
+def extract_title(caption):
+    """한글/영문 텍스트가 포함된 첫 줄 (최대 80자, 없으면 첫 줄)"""
+    if not caption:
+        return NO_CAPTION_TITLE
+    first = ""
+    for line in caption.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if not first:
+            first = line
+        if len(NON_TEXT_RE.sub("", line).strip()) >= 2:
+            return line[:TITLE_MAX_LEN]
+    return first[:TITLE_MAX_LEN]
+
+
+def analyze_caption(caption, matcher, default_category="기타"):
+    """캡션 1건 분석 → dict
+
+    matcher: 카테고리 KeywordMatcher (매칭이 가장 많은 카테고리, 동점이면 사전 순서)
+    """
+    caption = caption or ""
+    hashtags, mentions = [], []
+    for m in TAG_RE.finditer(caption):
+        if m.group(1):
+            hashtags.append(m.group(1))
+        else:
+            mentions.append(m.group(2))
+    scores = matcher.counts(caption)
+    best = max(scores, key=scores.get, default=None)
+    return {
+        "title": extract_title(caption),
+        "category": best if caption and best is not None and scores[best] > 0 else default_category,
+        "category_scores": {label: n for label, n in scores.items() if n},
+        "hashtags": hashtags,
+        "mentions": mentions,
+        "emoji_count": len(EMOJI_RE.findall(caption)),
+        "length": len(caption),
+    }
+
+
+class CaptionAnalyzer:
+    """게시물별 캡션 분석 결과를 캐시해 두고 캡션이 바뀐 게시물만 다시 분석
+
+    캐시 키 = sha1(분석기 버전, 키워드 사전 지문, 게시물 ID, 캡션)
+    path가 None이면 캐시 없이 매번 분석
+    """
+
+    def __init__(self, matcher, path=None):
+        self.matcher = matcher
+        self.path = path
+        self.entries = {}  # 게시물 ID → {"key", "analysis"}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("captions", {})
+
+    def cache_key(self, media_id, caption):
+        payload = f"{ANALYZER_VERSION}\0{self.matcher.fingerprint}\0{media_id}\0{caption or ''}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def analyze(self, media_id, caption):
+        key = self.cache_key(media_id, caption)
+        entry = self.entries.get(media_id)
+        if entry and entry.get("key") == key:
+            self.hits += 1
+            return entry["analysis"]
+        self.misses += 1
+        analysis = analyze_caption(caption, self.matcher)
+        self.entries[media_id] = {"key": key, "analysis": analysis}
+        return analysis
+
+    def prune(self, active_ids):
+        """목록에서 사라진(삭제된) 게시물 캐시 제거"""
+        active = set(active_ids)
+        for media_id in [m for m in self.entries if m not in active]:
+            del self.entries[media_id]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"captions": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
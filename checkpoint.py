@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+수집 도중 중단된 실행을 이어서 하기 위한 인사이트 기록 (계정별 state/collect_journal.jsonl)
+인사이트를 받는 대로 한 줄씩 추가하고, 다음 실행을 --resume으로 시작하면
+같은 날 기록된 게시물은 Graph 요청 없이 그대로 쓰고 빠졌거나 실패한 게시물만 다시 요청한다.
+수집 → 시트 기록까지 모두 끝나면 파일을 지움
+"""
+
+import json
+import os
+import threading
+
+JOURNAL_FILE = "collect_journal.jsonl"
+
+
+class CollectJournal:
+    """첫 줄은 {"date", "ig_id"}, 그 뒤로 게시물마다 {"id", "insights"} 한 줄
+
+    resume=True이면 같은 날짜·계정의 기존 기록을 읽고 이어서 추가, 아니면 새로 시작.
+    중단 시점에 쓰다 만 줄은 무시한다.
+    """
+
+    def __init__(self, path, check_date, ig_id, resume=False):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        header = {"date": check_date, "ig_id": ig_id}
+        if resume and os.path.exists(path):
+            self.entries = self._load(path, header)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self.entries:
+            self.file = open(path, "a", encoding="utf-8")
+            self.file.write("\n")  # 쓰다 만 마지막 줄과 붙지 않게 (빈 줄은 읽을 때 무시)
+        else:
+            self.file = open(path, "w", encoding="utf-8")
+            self._write(header)
+
+    @staticmethod
+    def _load(path, header):
+        entries = {}
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                if json.loads(f.readline()) != header:
+                    return {}  # 다른 날짜·계정의 기록 → 처음부터
+            except ValueError:
+                return {}
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry["id"]] = entry["insights"]
+        return entries
+
+    def _write(self, obj):
+        # 한 줄씩 바로 flush → 프로세스가 죽어도 이미 쓴 줄은 남음 (인사이트 워커 스레드에서 동시에 호출)
+        line = json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+
+    def get(self, media_id):
+        """이전 실행에서 받은 인사이트 (없으면 None)"""
+        return self.entries.get(media_id)
+
+    def record(self, media_id, insights):
+        """새로 받은 인사이트 기록 (실패한 빈 결과는 기록하지 않음 → 이어서 할 때 다시 요청)"""
+        if insights:
+            self._write({"id": media_id, "insights": insights})
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def discard(self):
+        """실행이 끝까지 성공하면 기록 삭제"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+게시물 지표 수렴 추적 → 오래되어 수치가 멈춘 게시물은 인사이트 재수집 주기를 늘림
+매일(daily) → 매주(weekly) → 매월(monthly) 단계로 승격, 수치가 다시 움직이면 매일로 복귀
+"""
+
+import json
+import os
+from datetime import date
+
+# (단계 이름, 재수집 간격 일수)
+TIERS = [("daily", 1), ("weekly", 7), ("monthly", 30)]
+
+
+def _within(old, new, tolerance):
+    """두 값의 차이가 허용 범위 이내인지 (상대 오차, 최소 1 허용)"""
+    if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+        return old == new
+    return abs(new - old) <= max(1, tolerance * abs(old))
+
+
+def _is_stable(snapshots, tolerance):
+    """연속한 스냅샷끼리 모든 지표가 허용 범위 이내인지"""
+    for prev, cur in zip(snapshots, snapshots[1:]):
+        keys = set(prev["metrics"]) | set(cur["metrics"])
+        if not all(_within(prev["metrics"].get(k), cur["metrics"].get(k), tolerance) for k in keys):
+            return False
+    return True
+
+
+class ConvergenceTracker:
+    """게시물별 최근 N개 지표 스냅샷을 기억하고 재수집 여부를 판단
+
+    - K번 연속 수집에서 지표 변화가 tolerance 이내면 다음 단계(주간 → 월간)로 승격
+    - 재수집 대상이 아닌 날은 마지막으로 수집한 인사이트를 그대로 재사용
+    - 업로드 후 min_age_days가 지나지 않은 게시물은 항상 매일 수집
+    """
+
+    def __init__(self, path, history=5, tolerance=0.02, stable_runs=3, min_age_days=14):
+        self.path = path
+        self.history = max(history, stable_runs + 1)
+        self.tolerance = tolerance
+        self.stable_runs = stable_runs
+        self.min_age_days = min_age_days
+        self.posts = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.posts = json.load(f).get("posts", {})
+
+    def is_due(self, media_id, today):
+        """오늘 인사이트를 새로 가져와야 하는지"""
+        entry = self.posts.get(media_id)
+        if not entry or not entry.get("insights"):
+            return True
+        interval = TIERS[entry.get("tier", 0)][1]
+        last = date.fromisoformat(entry["last_fetched"])
+        return (today - last).days >= interval
+
+    def cached_insights(self, media_id):
+        """마지막으로 수집한 인사이트 (없으면 None)"""
+        entry = self.posts.get(media_id)
+        return dict(entry["insights"]) if entry and entry.get("insights") else None
+
+    def record(self, media_id, insights, today, age_days):
+        """새로 수집한 인사이트 기록 + 수렴 단계 갱신 (빈 결과는 기록하지 않음, 하루에 한 번만 반영)"""
+        if not insights:
+            return
+        entry = self.posts.setdefault(media_id, {"snapshots": [], "tier": 0, "tier_runs": 0})
+        if entry.get("last_fetched") == today.isoformat() and entry["snapshots"]:
+            # 같은 날 다시 기록 (중단 후 이어서 수집 등) → 그날 스냅샷만 교체, 단계는 그대로
+            entry["snapshots"][-1]["metrics"] = insights
+            entry["insights"] = insights
+            return
+        entry["snapshots"] = (entry["snapshots"] + [{
+            "date": today.isoformat(),
+            "metrics": insights,
+        }])[-self.history:]
+        entry["insights"] = insights
+        entry["last_fetched"] = today.isoformat()
+        entry["tier_runs"] = entry.get("tier_runs", 0) + 1
+
+        window = entry["snapshots"][-(self.stable_runs + 1):]
+        stable = len(window) == self.stable_runs + 1 and _is_stable(window, self.tolerance)
+        if not stable or age_days < self.min_age_days:
+            if entry["tier"] != 0:
+                entry["tier"], entry["tier_runs"] = 0, 0
+        elif entry["tier_runs"] >= self.stable_runs and entry["tier"] < len(TIERS) - 1:
+            entry["tier"] += 1
+            entry["tier_runs"] = 0
+
+    def prune(self, active_ids):
+        """목록에서 사라진(삭제된) 게시물 상태 제거"""
+        active = set(active_ids)
+        for media_id in [m for m in self.posts if m not in active]:
+            del self.posts[media_id]
+
+    def tier_counts(self):
+        """단계별 게시물 수 (로그 출력용)"""
+        counts = {name: 0 for name, _ in TIERS}
+        for entry in self.posts.values():
+            counts[TIERS[entry.get("tier", 0)][0]] += 1
+        return counts
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"posts": self.posts}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -279,6 +279,7 @@ function saveManualInput() {
     post.follows = follows;
     post.follow_rate = (follows != null && post.reach > 0) ? +(follows / post.reach * 100).toFixed(2) : null;
     post._hasManualData = true;
+    DATA.rollups = null; // 미리 계산한 팔로우 합계와 달라짐
   }
 
   closeManualInputModal();
@@ -301,19 +302,345 @@ function setupManualInputModal() {
   });
 }
 
+// ── Data Loading (열 형식 posts + 압축본) ──
+// export_json.py가 만든 월별 조각(.gz): 필드별 배열 + media_type/category 코드표
+function decodeColumnar(data) {
+  const { fields, columns, dicts = {}, count } = data;
+  const cols = fields.map(f => dicts[f] ? columns[f].map(code => dicts[f][code]) : columns[f]);
+  const rows = new Array(count);
+  for (let i = 0; i < count; i++) {
+    const row = {};
+    for (let j = 0; j < fields.length; j++) row[fields[j]] = cols[j][i];
+    rows[i] = row;
+  }
+  return rows;
+}
+
+async function fetchJson(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(url + ' ' + res.status);
+  return res.json();
+}
+
+// 압축본이 있는 JSON 읽기: .gz는 브라우저가 DecompressionStream을 지원할 때만, 아니면 압축 안 된 파일
+async function fetchCompressedJson(path, fetcher = fetch) {
+  if (typeof DecompressionStream !== 'undefined') {
+    try {
+      const res = await fetcher(path + '.gz');
+      if (res.ok) {
+        const stream = res.body.pipeThrough(new DecompressionStream('gzip'));
+        return await new Response(stream).json();
+      }
+    } catch (e) { /* 압축 안 된 파일로 재시도 */ }
+  }
+  const res = await fetcher(path);
+  if (!res.ok) throw new Error(path + ' ' + res.status);
+  return res.json();
+}
+
+async function fetchColumnar(path, fetcher = fetch) {
+  return decodeColumnar(await fetchCompressedJson(path, fetcher));
+}
+
+// manifest가 없는 예전 데이터: 단일 열 형식 파일 → 행 형식(posts.json) 순서로 대체
+async function loadPosts(name) {
+  try {
+    return await fetchColumnar('data/' + name + '_columnar.json');
+  } catch (e) {
+    return fetchJson('data/' + name + '.json');
+  }
+}
+
+// ── Month Shards (manifest.json + posts/YYYY-MM.<내용 해시>.json) ──
+// 파일 이름에 내용 해시가 있어 한 번 받은 조각은 바뀌지 않음 → Cache API에 보관하고 다음 방문부터 재사용
+const SHARD_CACHE = 'ig-post-shards-v1';
+const loadedShards = new Map(); // 파일 → 게시물 배열 (이번 페이지에서 이미 읽은 조각)
+
+async function openShardCache() {
+  try { return typeof caches !== 'undefined' ? await caches.open(SHARD_CACHE) : null; } catch (e) { return null; }
+}
+
+function immutableFetcher(cache) {
+  if (!cache) return fetch;
+  return async url => {
+    const hit = await cache.match(url);
+    if (hit) return hit;
+    const res = await fetch(url);
+    if (res.ok) await cache.put(url, res.clone());
+    return res;
+  };
+}
+
+// 조각에서 뺀 실행 값(manifest.run_fields: check_date, followers) 채우기 + 팔로워 대비 도달율 다시 계산
+function applyRunFields(posts, runFields = {}) {
+  const followers = runFields.followers;
+  posts.forEach(p => {
+    Object.assign(p, runFields);
+    if (p.follower_reach_rate !== undefined) return;
+    p.follower_reach_rate = p.reach == null || followers == null ? null
+      : followers > 0 ? +(p.reach / followers * 100).toFixed(1) : 0;
+  });
+  return posts;
+}
+
+// months(['2026-02', ...])가 있으면 그 달 조각만, 없으면 전체 → manifest 순서(최근 월부터)대로 합친 게시물
+async function loadShards(manifest, months = null) {
+  const cache = await openShardCache();
+  const fetcher = immutableFetcher(cache);
+  const shards = manifest.shards.filter(s => !months || months.includes(s.month));
+  const parts = await Promise.all(shards.map(async s => {
+    if (!loadedShards.has(s.file)) {
+      loadedShards.set(s.file, applyRunFields(await fetchColumnar('data/' + s.file, fetcher), manifest.run_fields));
+    }
+    return loadedShards.get(s.file);
+  }));
+  // manifest에 없는 예전 조각은 캐시에서 삭제
+  if (cache && !months) {
+    const current = new Set();
+    manifest.shards.forEach(s => ['', '.gz'].forEach(ext => current.add(new URL('data/' + s.file + ext, location.href).href)));
+    (await cache.keys()).forEach(req => { if (!current.has(req.url)) cache.delete(req); });
+  }
+  return parts.flat();
+}
+
+// 첫 화면용 게시물: 가장 최근 월 조각만 (나머지 월은 loadRemainingPosts로 이어서)
+// 날짜 없는 게시물 조각은 나중에, 날짜 있는 조각이 하나도 없으면 전체
+async function loadFirstPosts(manifest) {
+  const latest = manifest.shards.find(s => s.month !== 'unknown');
+  return loadShards(manifest, latest ? [latest.month] : null);
+}
+
+async function loadManifest() {
+  try { return await fetchJson('data/manifest.json'); } catch (e) { return null; }
+}
+
+// ── Post History (post_history.jsonl: 키프레임 + 전날 대비 변경분, export_json.py / post_history.py) ──
+const postShortcode = url => ((url || '').match(/instagram\.com\/(?:p|reel|[^/]+\/reel)\/([A-Za-z0-9_-]+)/) || [])[1] || null;
+const postKey = p => p._key || postShortcode(p.url) || p.title;
+
+function parseHistory(text) {
+  const entries = [];
+  text.split('\n').forEach(line => {
+    if (!line) return;
+    try { entries.push(JSON.parse(line)); } catch (e) { /* 쓰다 만 줄 무시 */ }
+  });
+  return entries;
+}
+
+// date(YYYY-MM-DD) 이전 마지막 기록 시점의 게시물 지표 → [{_key, 필드: 값}] (마지막 키프레임부터 변경분 적용)
+function historyPosts(entries, date) {
+  let end = entries.findIndex(e => e.date > date);
+  if (end < 0) end = entries.length;
+  let start = end - 1;
+  while (start >= 0 && !entries[start].key) start--;
+  if (start < 0) return [];
+  let fields = entries[start].fields;
+  const state = new Map();
+  entries.slice(start, end).forEach(entry => {
+    if (entry.key) {
+      state.clear();
+      fields = entry.fields;
+      Object.entries(entry.posts).forEach(([code, values]) => state.set(code, values.slice()));
+      return;
+    }
+    (entry.removed || []).forEach(code => state.delete(code));
+    Object.entries(entry.posts).forEach(([code, pairs]) => {
+      const values = state.get(code) || new Array(fields.length).fill(null);
+      for (let i = 0; i < pairs.length; i += 2) values[pairs[i]] = pairs[i + 1];
+      state.set(code, values);
+    });
+  });
+  return [...state].map(([code, values]) => {
+    const post = { _key: code };
+    fields.forEach((f, i) => { post[f] = values[i]; });
+    return post;
+  });
+}
+
+// 비교 기준 날짜: 1 → 직전 기록, N → 마지막 기록 N일 전 이전의 가장 최근 기록 (dates: 기록 날짜 목록)
+function historyBaselineDate(dates, days) {
+  if (dates.length < 2) return null;
+  if (days <= 1) return dates[dates.length - 2];
+  const target = new Date(dates[dates.length - 1]);
+  target.setDate(target.getDate() - days);
+  const iso = target.toISOString().slice(0, 10);
+  const found = dates.filter(d => d <= iso);
+  return found.length ? found[found.length - 1] : null;
+}
+
+// 이력 목록: post_history/index.json (키프레임마다 나눈 조각), 없으면(조각 도입 전 데이터) 전체 파일 하나를 조각 하나로
+const historySegments = new Map(); // 파일 → 항목 목록 (이번 페이지에서 이미 받은 조각)
+
+async function loadHistory() {
+  try {
+    return (await fetchJson('data/post_history/index.json')).segments;
+  } catch (e) {
+    const res = await fetch('data/post_history.jsonl');
+    if (!res.ok) return [];
+    const entries = parseHistory(await res.text());
+    historySegments.set('post_history.jsonl', entries);
+    return entries.length ? [{ file: 'post_history.jsonl', dates: entries.map(e => e.date) }] : [];
+  }
+}
+
+const historyDates = segments => segments.flatMap(s => s.dates);
+
+// date가 속한 조각만 받아서 그날의 게시물 지표 복원
+async function historyPostsAt(segments, date) {
+  const segment = segments.filter(s => s.dates[0] <= date).pop();
+  if (!segment) return [];
+  if (!historySegments.has(segment.file)) {
+    const res = await fetch('data/' + segment.file);
+    if (!res.ok) throw new Error(segment.file + ' ' + res.status);
+    historySegments.set(segment.file, parseHistory(await res.text()));
+  }
+  return historyPosts(historySegments.get(segment.file), date);
+}
+
+// 그날의 팔로워 수(followers.json, 날짜 "26.02.07(토)")
+function followersOn(isoDate) {
+  const prefix = isoDate.slice(2).replace(/-/g, '.');
+  const entry = (DATA.followers || []).find(f => (f.date || '').startsWith(prefix));
+  return entry ? entry.followers : null;
+}
+
+// 비교 기준(전일 / N일 전) 변경 → 표·KPI의 변화량 다시 계산
+async function setCompareDays(days) {
+  const segments = DATA.history || [];
+  const date = historyBaselineDate(historyDates(segments), days);
+  const baseline = date ? await historyPostsAt(segments, date).catch(() => []) : [];
+  // 이력에 없는 팔로워 수·팔로워 대비 도달율은 그날의 followers.json 값으로
+  const followers = date ? followersOn(date) : null;
+  applyRunFields(baseline, followers != null ? { followers } : {});
+  baseline.forEach(p => {
+    p.follow_rate = (p.follows != null && p.reach > 0) ? +(p.follows / p.reach * 100).toFixed(2) : null;
+  });
+  DATA.postsYesterday = baseline;
+  DATA._hasYesterday = baseline.length > 0;
+  DATA._compareDate = date;
+}
+
+// ── Period Rollups (rollups.json: 마일스톤 × 유형 × 기간별 집계, export_json.py / rollups.py) ──
+// KPI·요일별 차트는 게시물을 다시 훑지 않고 여기서 읽음. 없거나 오래된 파일이면 게시물로 직접 계산
+const ROLLUP_SUM_FIELDS = ['reach', 'views', 'likes', 'saves', 'shares', 'comments', 'engagement', 'follows',
+  'engagement_rate', 'save_rate', 'share_rate'];
+const ROLLUP_MISSING_FIELDS = ['reach', 'views', 'likes', 'saves', 'shares', 'comments',
+  'engagement_rate', 'save_rate', 'share_rate'];
+
+async function loadRollups() {
+  const data = await fetchCompressedJson('data/rollups.json');
+  return data.format === 1 ? data : null;
+}
+
+// 게시물 목록 → 집계 (rollups.py와 같은 값, rollups.json이 없을 때 사용)
+function postStats(posts) {
+  const stats = { posts: posts.length, top: null, zero_reach: 0, zero_engagement_rate: 0 };
+  ROLLUP_SUM_FIELDS.forEach(f => { stats[f] = 0; });
+  ROLLUP_MISSING_FIELDS.forEach(f => { stats['missing_' + f] = 0; });
+  let top = null;
+  posts.forEach(p => {
+    ROLLUP_SUM_FIELDS.forEach(f => {
+      stats[f] += f === 'engagement' ? (p.likes||0)+(p.saves||0)+(p.shares||0)+(p.comments||0) : (p[f] || 0);
+    });
+    ROLLUP_MISSING_FIELDS.forEach(f => { if (p[f] == null) stats['missing_' + f]++; });
+    if (!p.reach) stats.zero_reach++;
+    if (!p.engagement_rate) stats.zero_engagement_rate++;
+    if (!top || (top.rank !== 1 && (p.rank === 1 || (p.reach||0) > (top.reach||0)))) top = p;
+  });
+  stats.top = top ? top.title : null;
+  return stats;
+}
+
+function decodeRollup(values) {
+  const stats = {};
+  DATA.rollups.fields.forEach((f, i) => { stats[f] = (values && values[i]) || 0; });
+  stats.top = values && values[1] != null ? DATA.rollups.titles[values[1]] : null;
+  return stats;
+}
+
+// 현재 마일스톤 필터의 기간 집계 원본 값 (period: total/year/month/week/day/dow, start: 기간 시작일)
+// before / after 그룹에 없는 키는 기간 시작일이 그쪽이면 all 그룹의 값, 아니면 게시물 없음
+function rollupValue(period, key, start, type = 'ALL') {
+  const groups = DATA.rollups.groups;
+  const own = (groups[milestoneFilter] || {})[type] || {};
+  if (period === 'total') return own.total;
+  if (own[period] && key in own[period]) return own[period][key];
+  if (milestoneFilter === 'all') return null;
+  const onSide = milestoneFilter === 'before' ? start < MILESTONE_DATE : start >= MILESTONE_DATE;
+  const base = ((groups.all || {})[type] || {})[period] || {};
+  return onSide ? base[key] || null : null;
+}
+
+// 기간 집계 (rollups.json이 없으면 null → 호출한 쪽에서 게시물로 계산)
+function rollupStats(period, key = null, start = null, type = 'ALL') {
+  if (!DATA.rollups) return null;
+  return decodeRollup(rollupValue(period, key, start, type));
+}
+
+// 요일별 집계 (월~일 7개) — scope: 'all' 또는 'YYYY-MM'
+function rollupDowStats(scope, start = null, type = 'ALL') {
+  if (!DATA.rollups) return null;
+  const days = rollupValue('dow', scope, start, type) || [];
+  return [0, 1, 2, 3, 4, 5, 6].map(i => decodeRollup(days[i]));
+}
+
+const ymKey = (year, month) => `${year}-${String(month + 1).padStart(2, '0')}`;
+const ymdKey = date => `${ymKey(date.getFullYear(), date.getMonth())}-${String(date.getDate()).padStart(2, '0')}`;
+
 // ── Data Store ──
-let DATA = { posts: [], followers: [], daily: [], meta: {}, postsYesterday: [] };
+let DATA = { posts: [], followers: [], daily: [], meta: {}, postsYesterday: [], rollups: null };
 
 // ── Init ──
+// 게시물 공통 처리: 팔로우 전환율 + 수동 입력 병합 (릴스 프로필 지표)
+function preparePosts(posts) {
+  // 팔로우 전환율 계산 (follows / reach × 100) — reach > 0 검증
+  posts.forEach(p => {
+    p.follow_rate = (p.follows != null && p.reach > 0) ? +(p.follows / p.reach * 100).toFixed(2) : null;
+  });
+  applyManualData(posts);
+}
+
+// 집계는 같은 내보내기에서 만든 것만, 수동 입력으로 팔로우 수가 바뀌었으면 게시물로 직접 계산
+function usableRollups(rollups, meta, posts) {
+  return rollups && rollups.updated_at === meta.updated_at && !posts.some(p => p._hasManualData) ? rollups : null;
+}
+
+// 나머지 월 조각을 받아 전체 게시물로 교체 후 다시 그림 (KPI·요일별 차트는 rollups.json이라 첫 화면부터 전체 기간)
+async function loadRemainingPosts(manifest, rollups) {
+  const updateEl = document.getElementById('update-time');
+  updateEl.textContent = `${DATA.meta.updated_at_ko} · 이전 게시물 불러오는 중…`;
+  try {
+    const posts = await loadShards(manifest);
+    preparePosts(posts);
+    DATA.posts = posts;
+    DATA.rollups = usableRollups(rollups, DATA.meta, posts);
+    // 첫 화면에서 사용자가 바꾼 표 검색·필터·정렬·페이지는 그대로
+    const tableState = postTableState();
+    destroyAllCharts();
+    renderAll();
+    restorePostTableState(tableState);
+  } catch (e) {
+    console.warn('이전 게시물 로딩 실패:', e);
+  }
+  updateEl.textContent = DATA.meta.updated_at_ko;
+}
+
 async function init() {
   try {
-    const [posts, followers, daily, meta, postsYesterday] = await Promise.all([
-      fetch('data/posts.json').then(r => r.json()),
+    let [manifest, followers, daily, meta, history, rollups] = await Promise.all([
+      loadManifest(),
       fetch('data/followers.json').then(r => r.json()),
       fetch('data/daily_report.json').then(r => r.json()),
       fetch('data/meta.json').then(r => r.json()),
-      fetch('data/posts_yesterday.json').then(r => r.ok ? r.json() : []).catch(() => []),
+      loadHistory().catch(() => []),
+      loadRollups().catch(() => null),
     ]);
+    let posts = manifest ? await loadFirstPosts(manifest).catch(() => null) : null;
+    if (!posts) {
+      // manifest가 없거나(조각 도입 전 데이터) 조각을 못 읽으면 단일 파일 전체
+      posts = await loadPosts('posts');
+      manifest = null;
+    }
     // 비율 필드 정규화: 0.059 형태(소수)를 5.9 형태(퍼센트)로 통일
     const rateFields = ['avg_engagement_rate', 'avg_save_rate', 'avg_share_rate'];
     daily.forEach(d => {
@@ -322,19 +649,23 @@ async function init() {
       });
     });
 
-    // 팔로우 전환율 계산 (follows / reach × 100) — reach > 0 검증
-    posts.forEach(p => {
-      p.follow_rate = (p.follows != null && p.reach > 0) ? +(p.follows / p.reach * 100).toFixed(2) : null;
-    });
-    postsYesterday.forEach(p => {
-      p.follow_rate = (p.follows != null && p.reach > 0) ? +(p.follows / p.reach * 100).toFixed(2) : null;
-    });
+    preparePosts(posts);
 
-    DATA = { posts, followers, daily, meta, postsYesterday };
-    DATA._hasYesterday = postsYesterday.length > 0;
+    DATA = { posts, followers, daily, meta, history, postsYesterday: [] };
+    if (history.length) {
+      await setCompareDays(1);
+    } else {
+      // 이력 파일 도입 전 데이터: 예전 posts_yesterday.json
+      DATA.postsYesterday = await loadPosts('posts_yesterday').catch(() => []);
+      DATA.postsYesterday.forEach(p => {
+        p.follow_rate = (p.follows != null && p.reach > 0) ? +(p.follows / p.reach * 100).toFixed(2) : null;
+      });
+      DATA._hasYesterday = DATA.postsYesterday.length > 0;
+    }
+    const compareControl = document.getElementById('compare-control');
+    if (compareControl) compareControl.style.display = historyDates(history).length > 1 ? '' : 'none';
 
-    // 수동 입력 데이터 병합 (릴스 프로필 지표)
-    applyManualData(DATA.posts);
+    DATA.rollups = usableRollups(rollups, meta, posts);
 
     document.getElementById('update-time').textContent = meta.updated_at_ko;
     document.getElementById('loading').classList.add('hidden');
@@ -343,6 +674,8 @@ async function init() {
     setupMilestoneFilter();
     setupManualInputModal();
     renderAll();
+    // 최근 월만으로 먼저 그린 뒤 나머지 월 (다음 방문부터는 Cache API에서 바로)
+    if (manifest && !manifest.shards.every(s => loadedShards.has(s.file))) loadRemainingPosts(manifest, rollups);
   } catch (e) {
     document.getElementById('loading').innerHTML = '<p>데이터 로딩 실패: ' + e.message + '</p>';
   }
@@ -571,8 +904,13 @@ function groupPostsByPeriod(posts, mode, year, month, weekIdx) {
   return posts; // total, avg
 }
 
-function renderKpiStats(mode, periodPosts) {
-  const posts = periodPosts || filterByMilestone(DATA.posts);
+// 기간 선택 모드가 아닐 때(전체 / 평균)의 집계
+function totalKpiStats() {
+  return rollupStats('total') || postStats(filterByMilestone(DATA.posts));
+}
+
+function renderKpiStats(mode, stats) {
+  stats = stats || totalKpiStats();
   const followers = filterFollowersByMilestone(DATA.followers);
   const daily = filterDailyByMilestone(DATA.daily);
   const isAvg = (mode === 'avg');
@@ -581,39 +919,25 @@ function renderKpiStats(mode, periodPosts) {
 
   // Build stat values
   const latestFollowers = followers.length ? followers[followers.length - 1].followers : null;
-  const engRates = posts.map(p => p.engagement_rate).filter(v => v != null);
-  const saveRates = posts.map(p => p.save_rate).filter(v => v != null);
-  const shareRates = posts.map(p => p.share_rate).filter(v => v != null);
+  // 값 있는 게시물 평균 (평균 모드) / 합계
+  const sumOrAvg = f => isAvg ? Math.round(stats[f] / ((stats.posts - stats['missing_' + f]) || 1)) : stats[f];
+  const perPost = f => isAvg ? Math.round(stats.posts ? stats[f] / stats.posts : 0) : stats[f];
+  const rateAvg = f => stats.posts > stats['missing_' + f] ? +(stats[f] / (stats.posts - stats['missing_' + f])).toFixed(1) : null;
 
   const statFields = [
-    { id: 'posts', val: posts.length, label: isPeriod ? '게시물 수' : '총 게시물' },
+    { id: 'posts', val: stats.posts, label: isPeriod ? '게시물 수' : '총 게시물' },
     { id: 'followers', val: latestFollowers, label: '현재 팔로워', noAvg: true },
-    { id: 'reach',
-      val: isAvg ? Math.round(avg(posts.map(p => p.reach).filter(v => v != null))) : sum(posts.map(p => p.reach)),
-      label: isAvg ? '평균 도달' : '전체 도달', daily: 'total_reach' },
-    { id: 'views',
-      val: isAvg ? Math.round(avg(posts.map(p => p.views).filter(v => v != null))) : sum(posts.map(p => p.views)),
-      label: isAvg ? '평균 조회수' : '전체 조회수', daily: 'total_views' },
-    { id: 'likes',
-      val: isAvg ? Math.round(avg(posts.map(p => p.likes).filter(v => v != null))) : sum(posts.map(p => p.likes)),
-      label: isAvg ? '평균 좋아요' : '전체 좋아요', daily: 'total_likes' },
-    { id: 'saves',
-      val: isAvg ? Math.round(avg(posts.map(p => p.saves).filter(v => v != null))) : sum(posts.map(p => p.saves)),
-      label: isAvg ? '평균 저장' : '전체 저장', daily: 'total_saves' },
-    { id: 'shares',
-      val: isAvg ? Math.round(avg(posts.map(p => p.shares).filter(v => v != null))) : sum(posts.map(p => p.shares)),
-      label: isAvg ? '평균 공유' : '전체 공유', daily: 'total_shares' },
-    { id: 'comments',
-      val: isAvg ? Math.round(avg(posts.map(p => p.comments).filter(v => v != null))) : sum(posts.map(p => p.comments)),
-      label: isAvg ? '평균 댓글' : '전체 댓글', daily: 'total_comments' },
-    { id: 'engagement',
-      val: isAvg ? Math.round(avg(posts.map(p => (p.likes||0)+(p.saves||0)+(p.shares||0)+(p.comments||0)))) : sum(posts.map(p => (p.likes||0)+(p.saves||0)+(p.shares||0)+(p.comments||0))),
-      label: isAvg ? '평균 참여' : '전체 참여', daily: 'total_engagement' },
-    { id: 'engagement_rate', val: engRates.length ? +avg(engRates).toFixed(1) : null, label: '평균 참여율', isPct: true, daily: 'avg_engagement_rate' },
-    { id: 'save_rate', val: saveRates.length ? +avg(saveRates).toFixed(1) : null, label: '평균 저장율', isPct: true, daily: 'avg_save_rate' },
-    { id: 'share_rate', val: shareRates.length ? +avg(shareRates).toFixed(1) : null, label: '평균 공유율', isPct: true, daily: 'avg_share_rate' },
-    { id: 'follows',
-      val: isAvg ? Math.round(avg(posts.map(p => p.follows || 0))) : sum(posts.map(p => p.follows || 0)),
+    { id: 'reach', val: sumOrAvg('reach'), label: isAvg ? '평균 도달' : '전체 도달', daily: 'total_reach' },
+    { id: 'views', val: sumOrAvg('views'), label: isAvg ? '평균 조회수' : '전체 조회수', daily: 'total_views' },
+    { id: 'likes', val: sumOrAvg('likes'), label: isAvg ? '평균 좋아요' : '전체 좋아요', daily: 'total_likes' },
+    { id: 'saves', val: sumOrAvg('saves'), label: isAvg ? '평균 저장' : '전체 저장', daily: 'total_saves' },
+    { id: 'shares', val: sumOrAvg('shares'), label: isAvg ? '평균 공유' : '전체 공유', daily: 'total_shares' },
+    { id: 'comments', val: sumOrAvg('comments'), label: isAvg ? '평균 댓글' : '전체 댓글', daily: 'total_comments' },
+    { id: 'engagement', val: perPost('engagement'), label: isAvg ? '평균 참여' : '전체 참여', daily: 'total_engagement' },
+    { id: 'engagement_rate', val: rateAvg('engagement_rate'), label: '평균 참여율', isPct: true, daily: 'avg_engagement_rate' },
+    { id: 'save_rate', val: rateAvg('save_rate'), label: '평균 저장율', isPct: true, daily: 'avg_save_rate' },
+    { id: 'share_rate', val: rateAvg('share_rate'), label: '평균 공유율', isPct: true, daily: 'avg_share_rate' },
+    { id: 'follows', val: perPost('follows'),
       label: isAvg ? '평균 팔로우 유입 (릴스제외)' : '팔로우 유입 합계 (릴스제외)' },
     { id: 'top_post', val: null, label: 'TOP 게시물', isText: true },
   ];
@@ -635,10 +959,9 @@ function renderKpiStats(mode, periodPosts) {
     }
 
     if (f.id === 'top_post') {
-      const top = posts.find(p => p.rank === 1) || (posts.length ? [...posts].sort((a,b) => (b.reach||0)-(a.reach||0))[0] : null);
       if (valueEl) {
-        if (top) {
-          valueEl.innerHTML = `<span title="종합순위 1위 (도달·참여·저장·공유 종합)">${top.title}</span>`;
+        if (stats.top != null) {
+          valueEl.innerHTML = `<span title="종합순위 1위 (도달·참여·저장·공유 종합)">${stats.top}</span>`;
         } else {
           valueEl.textContent = '-';
         }
@@ -788,7 +1111,6 @@ function updateKpiPeriodSelectors(mode) {
 
 function refreshKpiForPeriod() {
   const mode = currentKpiMode;
-  const posts = filterByMilestone(DATA.posts);
   const yearEl = document.getElementById('kpi-year');
   const monthEl = document.getElementById('kpi-month');
   const weekEl = document.getElementById('kpi-week');
@@ -798,8 +1120,28 @@ function refreshKpiForPeriod() {
   let periodIdx = 0;
   if (mode === 'weekly') periodIdx = weekEl ? parseInt(weekEl.value) : 0;
   if (mode === 'daily') periodIdx = dayEl ? parseInt(dayEl.value) : 1;
-  const filtered = groupPostsByPeriod(posts, mode, year, month, periodIdx);
-  renderKpiStats(mode, filtered);
+  const stats = periodRollupStats(mode, year, month, periodIdx);
+  renderKpiStats(mode, stats || postStats(groupPostsByPeriod(filterByMilestone(DATA.posts), mode, year, month, periodIdx)));
+}
+
+// groupPostsByPeriod와 같은 기간의 집계를 rollups.json에서 (없으면 null)
+function periodRollupStats(mode, year, month, periodIdx) {
+  if (!DATA.rollups) return null;
+  if (mode === 'yearly') {
+    // 게시물 없는 연도는 groupPostsByPeriod처럼 전체 기간
+    const stats = year ? rollupStats('year', String(year), new Date(year, 0, 1)) : null;
+    return stats && stats.posts ? stats : rollupStats('total');
+  }
+  if (mode === 'monthly') return rollupStats('month', ymKey(year, month), new Date(year, month, 1));
+  if (mode === 'weekly') {
+    const week = getWeeksInMonth(year, month)[periodIdx];
+    return week ? rollupStats('week', `${ymKey(year, month)}-${periodIdx}`, week.start) : postStats([]);
+  }
+  if (mode === 'daily') {
+    const date = new Date(year, month, periodIdx);
+    return rollupStats('day', ymdKey(date), date);
+  }
+  return rollupStats('total');
 }
 
 // Stats column toggle UI
@@ -828,7 +1170,7 @@ document.getElementById('kpi-mode-dropdown')?.addEventListener('change', functio
   currentKpiMode = this.value;
   if (this.value === 'total' || this.value === 'avg') {
     document.getElementById('kpi-period-selectors').innerHTML = '';
-    renderKpiStats(this.value, filterByMilestone(DATA.posts));
+    renderKpiStats(this.value);
   } else {
     updateKpiPeriodSelectors(this.value);
   }
@@ -1033,7 +1375,7 @@ function renderOverview() {
   // Unified KPI Stats
   const mode = currentKpiMode;
   if (mode === 'total' || mode === 'avg') {
-    renderKpiStats(mode, posts);
+    renderKpiStats(mode);
   } else {
     updateKpiPeriodSelectors(mode);
   }
@@ -1147,7 +1489,7 @@ let yesterdayMap = new Map();
 function buildYesterdayMap() {
   yesterdayMap = new Map();
   (DATA.postsYesterday || []).forEach(p => {
-    const key = p.url || p.title;
+    const key = postKey(p);
     if (key) yesterdayMap.set(key, p);
   });
 }
@@ -1155,7 +1497,7 @@ function buildYesterdayMap() {
 // Format cell with change (compact or full numbers with tooltip)
 function fmtWithChange(value, field, row) {
   if (value == null) return '-';
-  const key = row.url || row.title;
+  const key = postKey(row);
   const prev = yesterdayMap.get(key);
   let html = `<span title="${fmt(value)}">${fmtCell(value)}</span>`;
   if (prev && prev[field] != null) {
@@ -1205,7 +1547,7 @@ const colDef = {
       if (v == null) return '-';
       const color = v >= 5 ? '#00c853' : v >= 3 ? '#ffd600' : '#9499b3';
       const row = cell.getRow().getData();
-      const key = row.url || row.title;
+      const key = postKey(row);
       const prev = yesterdayMap.get(key);
       let changeHtml = '';
       if (prev && prev.engagement_rate != null) {
@@ -1355,9 +1697,8 @@ document.getElementById('compact-toggle-btn')?.addEventListener('click', () => {
   // 게시물 테이블 셀 다시 그리기
   if (postTable) postTable.redraw(true);
   // KPI 카드 숫자 갱신 (차트 제외한 가벼운 업데이트)
-  const posts = filterByMilestone(DATA.posts);
   const mode = currentKpiMode;
-  if (mode === 'total' || mode === 'avg') renderKpiStats(mode, posts);
+  if (mode === 'total' || mode === 'avg') renderKpiStats(mode);
   // 카테고리 & 콘텐츠 탭 테이블 갱신
   renderCategory();
   renderContent();
@@ -1506,9 +1847,27 @@ function updateDowSelectors(mode, keepValues) {
   });
 }
 
+const DOW_ORDER = ['월', '화', '수', '목', '금', '토', '일'];
+
+// upload_date의 "(요일)" 기준 월~일 7개 게시물 목록
+function postsByDow(posts) {
+  const groups = DOW_ORDER.map(() => []);
+  posts.forEach(p => {
+    const m = p.upload_date.match(/\((.)\)/);
+    const i = m ? DOW_ORDER.indexOf(m[1]) : -1;
+    if (i >= 0) groups[i].push(p);
+  });
+  return groups;
+}
+
+// 값이 0이 아닌 게시물의 평균 (없으면 0)
+function nonzeroAvg(stats, field) {
+  const n = stats.posts - stats['zero_' + field];
+  return n ? stats[field] / n : 0;
+}
+
 // 실제 차트 데이터 렌더링
 function renderDowChartData() {
-  const posts = filterByMilestone(DATA.posts);
   const mode = dowCurrentMode;
   if (dowChartInstance) dowChartInstance.destroy();
 
@@ -1519,20 +1878,30 @@ function renderDowChartData() {
 
   // ── 일별 모드: 해당 월 전체 날짜별 ──
   if (mode === 'daily') {
-    const monthPosts = posts.filter(p => {
-      const d = parseUploadDate(p.upload_date);
-      return d && d.getFullYear() === selYear && d.getMonth() === selMonth;
-    });
     const daysInMonth = new Date(selYear, selMonth + 1, 0).getDate();
     const allDays = [];
     for (let i = 1; i <= daysInMonth; i++) {
       const dt = new Date(selYear, selMonth, i);
       const dayChar = ['일','월','화','수','목','금','토'][dt.getDay()];
-      allDays.push({ date: dt, label: `${String(i).padStart(2,'0')}(${dayChar})`, reach: [], eng: [] });
+      allDays.push({ date: dt, label: `${String(i).padStart(2,'0')}(${dayChar})` });
     }
-    monthPosts.forEach(p => {
-      const d = parseUploadDate(p.upload_date);
-      if (d) { const idx = d.getDate() - 1; if (allDays[idx]) { if (p.reach) allDays[idx].reach.push(p.reach); if (p.engagement_rate) allDays[idx].eng.push(p.engagement_rate); } }
+    let dayStats;
+    if (DATA.rollups) {
+      dayStats = allDays.map(d => rollupStats('day', ymdKey(d.date), d.date));
+    } else {
+      const byDay = allDays.map(() => []);
+      filterByMilestone(DATA.posts).forEach(p => {
+        const d = parseUploadDate(p.upload_date);
+        if (d && d.getFullYear() === selYear && d.getMonth() === selMonth) byDay[d.getDate() - 1].push(p);
+      });
+      dayStats = byDay.map(postStats);
+    }
+    // 도달·참여율이 있는 게시물만 (0은 제외)
+    allDays.forEach((d, i) => {
+      const st = dayStats[i];
+      d.reach = st.reach;
+      d.count = st.posts - st.zero_reach;
+      d.eng = nonzeroAvg(st, 'engagement_rate');
     });
     const today = new Date();
     const entries = allDays.filter(d => d.date <= today);
@@ -1541,8 +1910,8 @@ function renderDowChartData() {
     dowChartInstance = new ApexCharts(document.getElementById('chart-daily-reach'), {
       ...chartTheme,
       series: [
-        { name: '총 도달', type: 'bar', data: entries.map(e => sum(e.reach)) },
-        { name: '평균 참여율', type: 'line', data: entries.map(e => e.eng.length ? +avg(e.eng).toFixed(1) : 0) },
+        { name: '총 도달', type: 'bar', data: entries.map(e => e.reach) },
+        { name: '평균 참여율', type: 'line', data: entries.map(e => +e.eng.toFixed(1)) },
       ],
       chart: { ...chartTheme.chart, type: 'line', height: 300 },
       xaxis: { categories: entries.map(e => e.label), labels: { style: { fontSize: '10px' }, rotate: -45, rotateAlways: true } },
@@ -1554,8 +1923,8 @@ function renderDowChartData() {
       plotOptions: { bar: { borderRadius: 2, columnWidth: '70%' } },
       stroke: { width: [0, 2] }, markers: { size: [0, 3] }, grid: chartTheme.grid,
       tooltip: { ...chartTheme.tooltip, shared: true, custom: ({ dataPointIndex }) => {
-        const e = entries[dataPointIndex]; const cnt = e.reach.length;
-        return `<div style="padding:10px;font-size:12px"><strong>${titleLabel} ${e.label}</strong>${cnt ? ` (${cnt}개)` : ' (없음)'}<br>총 도달: <b>${fmt(sum(e.reach))}</b><br>참여율: <b>${e.eng.length ? avg(e.eng).toFixed(1) : 0}%</b></div>`;
+        const e = entries[dataPointIndex]; const cnt = e.count;
+        return `<div style="padding:10px;font-size:12px"><strong>${titleLabel} ${e.label}</strong>${cnt ? ` (${cnt}개)` : ' (없음)'}<br>총 도달: <b>${fmt(e.reach)}</b><br>참여율: <b>${e.eng ? e.eng.toFixed(1) : 0}%</b></div>`;
       }},
     });
     dowChartInstance.render();
@@ -1563,39 +1932,43 @@ function renderDowChartData() {
   }
 
   // ── 요일별 평균 모드 (전체 / 월별 / 주별) ──
-  const dayOrder = ['월', '화', '수', '목', '금', '토', '일'];
-  let filtered = posts;
+  let inScope = null; // 선택한 월 / 주 조건 (없으면 전체)
   let modeLabel = '전체';
+  let dowStats = null; // 월~일 집계
 
   if (mode === 'month') {
-    filtered = posts.filter(p => { const d = parseUploadDate(p.upload_date); return d && d.getFullYear() === selYear && d.getMonth() === selMonth; });
+    inScope = d => d.getFullYear() === selYear && d.getMonth() === selMonth;
     modeLabel = `${selYear}년 ${selMonth+1}월`;
+    dowStats = rollupDowStats(ymKey(selYear, selMonth), new Date(selYear, selMonth, 1));
   } else if (mode === 'week') {
     const weeks = getWeeksInMonth(selYear, selMonth);
     const weekEl = document.getElementById('dow-week');
     const wi = weekEl ? parseInt(weekEl.value) : weeks.length - 1;
     const week = weeks[wi];
     if (week) {
-      filtered = posts.filter(p => {
-        const d = parseUploadDate(p.upload_date);
-        return d && d >= week.start && d <= week.endDate;
-      });
+      inScope = d => d >= week.start && d <= week.endDate;
       modeLabel = `${selYear}년 ${selMonth+1}월 ${wi+1}주차 (${week.label})`;
+      // 한 주 안의 요일은 하루씩 → 일별 집계 그대로
+      if (DATA.rollups) {
+        dowStats = DOW_ORDER.map(() => postStats([]));
+        for (let dt = new Date(week.start); dt <= week.endDate; dt.setDate(dt.getDate() + 1)) {
+          dowStats[(dt.getDay() + 6) % 7] = rollupStats('day', ymdKey(dt), new Date(dt));
+        }
+      }
     }
   }
+  if (!inScope) dowStats = rollupDowStats('all');
 
-  const dayMap = {};
-  dayOrder.forEach(d => { dayMap[d] = { reach: [], eng: [], count: 0, posts: [] }; });
-  filtered.forEach(p => {
-    const m = p.upload_date.match(/\((.)\)/);
-    if (m && dayMap[m[1]]) {
-      dayMap[m[1]].count++;
-      dayMap[m[1]].posts.push(p);
-      if (p.reach) dayMap[m[1]].reach.push(p.reach);
-      if (p.engagement_rate) dayMap[m[1]].eng.push(p.engagement_rate);
-    }
-  });
-  const stats = dayOrder.map(d => ({ day: d, count: dayMap[d].count, avgReach: avg(dayMap[d].reach), avgEng: avg(dayMap[d].eng), posts: dayMap[d].posts }));
+  // 게시물 목록은 rollups.json이 없을 때와 요일 클릭(상세 모달) 때만 만듦
+  const scopePosts = () => {
+    const posts = filterByMilestone(DATA.posts);
+    return inScope ? posts.filter(p => { const d = parseUploadDate(p.upload_date); return d && inScope(d); }) : posts;
+  };
+  if (!dowStats) dowStats = postsByDow(scopePosts()).map(postStats);
+  const stats = DOW_ORDER.map((d, i) => ({
+    day: d, count: dowStats[i].posts,
+    avgReach: nonzeroAvg(dowStats[i], 'reach'), avgEng: nonzeroAvg(dowStats[i], 'engagement_rate'),
+  }));
 
   dowChartInstance = new ApexCharts(document.getElementById('chart-daily-reach'), {
     ...chartTheme,
@@ -1611,8 +1984,8 @@ function renderDowChartData() {
         dataPointSelection: function(event, chartContext, config) {
           const dayIndex = config.dataPointIndex;
           const dayStats = stats[dayIndex];
-          if (dayStats && dayStats.posts.length > 0) {
-            showDayPostsModal(dayStats, modeLabel);
+          if (dayStats && dayStats.count > 0) {
+            showDayPostsModal({ ...dayStats, posts: postsByDow(scopePosts())[dayIndex] }, modeLabel);
           }
         }
       }
@@ -1846,20 +2219,15 @@ function renderPostTable() {
   // Bind event listeners only once
   if (!renderPostTable._bound) {
     renderPostTable._bound = true;
-    document.getElementById('sort-select').addEventListener('change', function() {
-      const [field, dir] = this.value.split('|');
-      currentSortField = field;
-      const rankedData = recalcRankedData(filterByMilestone(DATA.posts), field, dir);
-      // Tabulator 내부 소터 클리어 → replaceData 순서 유지
-      postTable.clearSort();
-      // 칼럼 순서 유지하면서 데이터만 교체
-      if (userColumnOrder) {
-        postTable.replaceData(rankedData);
-      } else {
-        postTable.setColumns(buildColumns(field));
-        postTable.replaceData(rankedData);
-      }
-      applyFilters();
+    document.getElementById('sort-select').addEventListener('change', applySortSelect);
+    document.getElementById('compare-select')?.addEventListener('change', async function() {
+      await setCompareDays(+this.value);
+      buildYesterdayMap();
+      postTable.redraw(true);
+      const mode = currentKpiMode;
+      if (mode === 'total' || mode === 'avg') renderKpiStats(mode);
+      const noticeEl = document.getElementById('no-yesterday-notice');
+      if (noticeEl) noticeEl.style.display = DATA._hasYesterday ? 'none' : 'flex';
     });
     document.getElementById('filter-category').addEventListener('change', applyFilters);
     document.getElementById('filter-type').addEventListener('change', applyFilters);
@@ -1867,6 +2235,44 @@ function renderPostTable() {
   }
 }
 
+// 정렬 드롭다운 값으로 순위 다시 계산
+function applySortSelect() {
+  const [field, dir] = document.getElementById('sort-select').value.split('|');
+  currentSortField = field;
+  const rankedData = recalcRankedData(filterByMilestone(DATA.posts), field, dir);
+  // Tabulator 내부 소터 클리어 → replaceData 순서 유지
+  postTable.clearSort();
+  // 칼럼 순서 유지하면서 데이터만 교체
+  if (!userColumnOrder) postTable.setColumns(buildColumns(field));
+  const replaced = postTable.replaceData(rankedData);
+  applyFilters();
+  return replaced;
+}
+
+// 표를 다시 만들 때 되살릴 상태 (검색어·유형 입력칸은 그대로 남고, 카테고리 목록은 새로 채워짐)
+function postTableState() {
+  if (!postTable) return null;
+  return {
+    category: document.getElementById('filter-category').value,
+    sorters: postTable.getSorters().map(s => ({ column: s.field, dir: s.dir })),
+    pageSize: postTable.getPageSize(),
+    page: postTable.getPage(),
+  };
+}
+
+function restorePostTableState(state) {
+  if (!state || !postTable) return;
+  const catSelect = document.getElementById('filter-category');
+  if ([...catSelect.options].some(o => o.value === state.category)) catSelect.value = state.category;
+  postTable.on('tableBuilt', async () => {
+    if (state.pageSize !== postTable.getPageSize()) postTable.setPageSize(state.pageSize);
+    if (document.getElementById('sort-select').value !== 'rank|asc') await applySortSelect();
+    else applyFilters();
+    if (state.sorters.length) postTable.setSort(state.sorters);
+    if (state.page > 1) postTable.setPage(Math.min(state.page, postTable.getPageMax()));
+  });
+}
+
 function applyFilters() {
   const cat = document.getElementById('filter-category').value;
   const type = document.getElementById('filter-type').value;
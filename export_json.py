@@ -4,6 +4,8 @@ Google Sheets 데이터를 JSON 파일로 내보내기
 GitHub Pages 대시보드에서 사용할 정적 데이터 생성
 """
 
+import gzip
+import hashlib
 import json
 import os
 import sys
@@ -21,6 +23,29 @@ else:
 import gspread
 from google.oauth2.service_account import Credentials
 
+from sheet_snapshot import SheetSnapshot
+from post_history import HISTORY_FILE, SEGMENT_DIR, append_day, read_history, write_segments
+from rollups import ROLLUPS_FILE, build_rollups
+
+# .br 압축본은 brotli 패키지가 있을 때만 생성
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SHEET_TITLES = ["자동수집", "팔로워추적", "일별종합리포트"]
+
+# 열 형식 posts 파일 (대시보드용) — 값 종류가 적은 필드는 사전(코드표)으로 저장
+COLUMNAR_FORMAT = 1
+DICT_FIELDS = ("media_type", "category")
+
+# 업로드 월별 posts 조각 (docs/data/posts/YYYY-MM.<내용 해시>.json) + 목록 manifest.json
+SHARD_DIR = "posts"
+MANIFEST_FILE = "manifest.json"
+# 실행마다 모든 행이 같이 바뀌는 값 → 조각에서 빼고 manifest에 한 번만 (follower_reach_rate는 reach ÷ followers로 다시 계산)
+RUN_FIELDS = ("check_date", "followers")
+SHARD_EXCLUDED_FIELDS = RUN_FIELDS + ("follower_reach_rate",)
+
 
 def get_sheet():
     """Google Sheets 연결"""
@@ -74,66 +99,43 @@ def extract_url_from_hyperlink(formula):
     return m.group(1) if m else formula
 
 
-def export_posts(spreadsheet):
-    """자동수집 시트 → posts.json"""
-    print("  자동수집 시트 읽는 중...")
-    ws = spreadsheet.worksheet("자동수집")
-    all_values = ws.get_all_values()
-
-    # G열 HYPERLINK 수식에서 URL 추출
-    formulas = ws.get("G1:G500", value_render_option="FORMULA")
-
-    if len(all_values) < 2:
-        return []
-
-    posts = []
-    for i, row in enumerate(all_values[1:], start=1):
-        # TOTAL, 평균 행 건너뛰기
-        if len(row) > 5 and row[5] in ("TOTAL", "평균"):
-            break
-
-        # URL 추출
-        url = ""
-        if i < len(formulas) and formulas[i]:
-            url = extract_url_from_hyperlink(formulas[i][0] if formulas[i] else "")
-
-        post = {
-            "upload_date": row[0] if len(row) > 0 else "",
-            "check_date": row[1] if len(row) > 1 else "",
-            "media_type": row[2] if len(row) > 2 else "",
-            "rank": parse_number(row[3]) if len(row) > 3 else None,
-            "category": row[4] if len(row) > 4 else "",
-            "title": row[5] if len(row) > 5 else "",
-            "url": url,
-            "reach": parse_number(row[7]) if len(row) > 7 else None,
-            "views": parse_number(row[8]) if len(row) > 8 else None,
-            "likes": parse_number(row[9]) if len(row) > 9 else None,
-            "saves": parse_number(row[10]) if len(row) > 10 else None,
-            "shares": parse_number(row[11]) if len(row) > 11 else None,
-            "comments": parse_number(row[12]) if len(row) > 12 else None,
-            "total_interactions": parse_number(row[13]) if len(row) > 13 else None,
-            "engagement_count": parse_number(row[14]) if len(row) > 14 else None,
-            "engagement_rate": parse_percent(row[15]) if len(row) > 15 else None,
-            "save_rate": parse_percent(row[16]) if len(row) > 16 else None,
-            "share_rate": parse_percent(row[17]) if len(row) > 17 else None,
-            "follower_reach_rate": parse_percent(row[18]) if len(row) > 18 else None,
-            "profile_visits": parse_number(row[19]) if len(row) > 19 else None,
-            "profile_activity": parse_number(row[20]) if len(row) > 20 else None,
-            "follows": parse_number(row[21]) if len(row) > 21 else None,
-            "followers": parse_number(row[22]) if len(row) > 22 else None,
-            "composite_score": parse_number(row[23]) if len(row) > 23 else None,
-        }
-        posts.append(post)
-
-    return posts
-
-
-def export_followers(spreadsheet):
-    """팔로워추적 시트 → followers.json"""
-    print("  팔로워추적 시트 읽는 중...")
-    ws = spreadsheet.worksheet("팔로워추적")
-    all_values = ws.get_all_values()
-
+def row_to_post(row, url):
+    """자동수집 행(A~X열) → posts.json 항목 (시트 표시값 / 수집 직후 메모리 값 모두 처리)"""
+    return {
+        "upload_date": row[0] if len(row) > 0 else "",
+        "check_date": row[1] if len(row) > 1 else "",
+        "media_type": row[2] if len(row) > 2 else "",
+        "rank": parse_number(row[3]) if len(row) > 3 else None,
+        "category": row[4] if len(row) > 4 else "",
+        "title": row[5] if len(row) > 5 else "",
+        "url": url,
+        "reach": parse_number(row[7]) if len(row) > 7 else None,
+        "views": parse_number(row[8]) if len(row) > 8 else None,
+        "likes": parse_number(row[9]) if len(row) > 9 else None,
+        "saves": parse_number(row[10]) if len(row) > 10 else None,
+        "shares": parse_number(row[11]) if len(row) > 11 else None,
+        "comments": parse_number(row[12]) if len(row) > 12 else None,
+        "total_interactions": parse_number(row[13]) if len(row) > 13 else None,
+        "engagement_count": parse_number(row[14]) if len(row) > 14 else None,
+        "engagement_rate": parse_percent(row[15]) if len(row) > 15 else None,
+        "save_rate": parse_percent(row[16]) if len(row) > 16 else None,
+        "share_rate": parse_percent(row[17]) if len(row) > 17 else None,
+        "follower_reach_rate": parse_percent(row[18]) if len(row) > 18 else None,
+        "profile_visits": parse_number(row[19]) if len(row) > 19 else None,
+        "profile_activity": parse_number(row[20]) if len(row) > 20 else None,
+        "follows": parse_number(row[21]) if len(row) > 21 else None,
+        "followers": parse_number(row[22]) if len(row) > 22 else None,
+        "composite_score": parse_number(row[23]) if len(row) > 23 else None,
+    }
+
+
+def posts_from_rows(rows):
+    """ig_insights 수집 결과 행(헤더/합계 행 없음, G열은 HYPERLINK 수식) → posts.json"""
+    return [row_to_post(row, extract_url_from_hyperlink(row[6] if len(row) > 6 else "")) for row in rows]
+
+
+def followers_from_values(all_values):
+    """팔로워추적 시트 값(헤더 포함) → followers.json"""
     if len(all_values) < 2:
         return []
 
@@ -153,12 +155,8 @@ def export_followers(spreadsheet):
     return followers
 
 
-def export_daily_report(spreadsheet):
-    """일별종합리포트 시트 → daily_report.json"""
-    print("  일별종합리포트 시트 읽는 중...")
-    ws = spreadsheet.worksheet("일별종합리포트")
-    all_values = ws.get_all_values()
-
+def daily_report_from_values(all_values):
+    """일별종합리포트 시트 값(헤더 포함) → daily_report.json"""
     if len(all_values) < 2:
         return []
 
@@ -188,23 +186,163 @@ def export_daily_report(spreadsheet):
     return reports
 
 
-def main():
-    KST = timezone(timedelta(hours=9))
-    now = datetime.now(KST)
+def export_posts(snapshot):
+    """자동수집 시트 → posts.json"""
+    all_values = snapshot.values("자동수집")
 
-    print("=" * 50)
-    print("  Google Sheets → JSON 내보내기")
-    print(f"  실행 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} KST")
-    print("=" * 50)
+    # G열 HYPERLINK 수식에서 URL 추출
+    formulas = snapshot.formulas("자동수집")
 
-    spreadsheet = get_sheet()
+    if len(all_values) < 2:
+        return []
+
+    posts = []
+    for i, row in enumerate(all_values[1:], start=1):
+        # TOTAL, 평균 행 건너뛰기
+        if len(row) > 5 and row[5] in ("TOTAL", "평균"):
+            break
+
+        # URL 추출
+        url = ""
+        if i < len(formulas) and len(formulas[i]) > 6:
+            url = extract_url_from_hyperlink(str(formulas[i][6]))
+
+        posts.append(row_to_post(row, url))
+
+    return posts
+
+
+def export_followers(snapshot):
+    """팔로워추적 시트 → followers.json"""
+    return followers_from_values(snapshot.values("팔로워추적"))
 
-    posts = export_posts(spreadsheet)
-    followers = export_followers(spreadsheet)
-    daily_report = export_daily_report(spreadsheet)
+
+def export_daily_report(snapshot):
+    """일별종합리포트 시트 → daily_report.json"""
+    return daily_report_from_values(snapshot.values("일별종합리포트"))
+
+
+def _compact_value(val):
+    """정수인 float(6561.0 등)은 정수로 → JSON에서 '.0' 제거"""
+    if isinstance(val, float) and val.is_integer():
+        return int(val)
+    return val
+
+
+def to_columnar(records, dict_fields=DICT_FIELDS):
+    """[{필드: 값}, ...] → 필드별 배열 (키 이름을 게시물마다 반복하지 않음)
+
+    {"format": 1, "count": N, "fields": [...], "dicts": {필드: [값, ...]}, "columns": {필드: [값 또는 사전 코드, ...]}}
+    """
+    fields = list(records[0]) if records else []
+    columns, dicts = {}, {}
+    for field in fields:
+        values = [_compact_value(r.get(field)) for r in records]
+        if field in dict_fields:
+            codes = {}
+            columns[field] = [codes.setdefault(v, len(codes)) for v in values]
+            dicts[field] = list(codes)
+        else:
+            columns[field] = values
+    return {"format": COLUMNAR_FORMAT, "count": len(records), "fields": fields, "dicts": dicts, "columns": columns}
+
+
+def from_columnar(data):
+    """to_columnar의 역변환 (검증·다른 스크립트용)"""
+    dicts = data.get("dicts", {})
+    columns = [
+        [dicts[f][c] for c in data["columns"][f]] if f in dicts else data["columns"][f]
+        for f in data["fields"]
+    ]
+    return [dict(zip(data["fields"], values)) for values in zip(*columns)] if columns else []
+
+
+def _compact_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_compressed(path, data):
+    """공백 없는 JSON + .gz / .br 압축본 저장 → (원본, gz, br) 바이트 수 (br 없으면 None)
+
+    gzip 헤더의 시각은 0으로 고정 → 내용이 같으면 파일도 같아서 커밋 diff가 생기지 않음
+    """
+    raw = data if isinstance(data, bytes) else _compact_json(data)
+    outputs = {path: raw, path + ".gz": gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        outputs[path + ".br"] = brotli.compress(raw, quality=11)
+    for out_path, content in outputs.items():
+        with open(out_path, "wb") as f:
+            f.write(content)
+    br = outputs.get(path + ".br")
+    return len(raw), len(outputs[path + ".gz"]), len(br) if br is not None else None
+
+
+def post_month(post):
+    """upload_date "26.02.07(토)" → "2026-02" (형식이 다르면 "unknown")"""
+    m = re.match(r"(\d{2})\.(\d{2})\.", post.get("upload_date") or "")
+    return f"20{m.group(1)}-{m.group(2)}" if m else "unknown"
+
+
+def write_shards(posts, data_dir):
+    """posts를 업로드 월별 열 형식 파일로 나눠 저장 → manifest의 shards 목록 (최근 월부터)
+
+    파일 이름에 내용 해시를 넣어서 지표가 그대로인 달은 다음 날에도 이름이 같음 → 커밋 diff 없음, 브라우저는 캐시 재사용.
+    매일 바뀌는 실행 값(SHARD_EXCLUDED_FIELDS)은 조각에 넣지 않음 (manifest의 run_fields).
+    manifest에 없는 예전 조각 파일은 삭제한다.
+    """
+    shard_dir = os.path.join(data_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    months = {}
+    for post in posts:
+        months.setdefault(post_month(post), []).append(post)
+
+    shards, keep = [], set()
+    for month in sorted(months, reverse=True):
+        rows = [{k: v for k, v in post.items() if k not in SHARD_EXCLUDED_FIELDS} for post in months[month]]
+        raw = _compact_json(to_columnar(rows))
+        digest = hashlib.sha256(raw).hexdigest()[:12]
+        filename = f"{month}.{digest}.json"
+        size, gz_size, _ = write_compressed(os.path.join(shard_dir, filename), raw)
+        keep.update({filename, filename + ".gz", filename + ".br"})
+        shards.append({
+            "month": month,
+            "file": f"{SHARD_DIR}/{filename}",
+            "rows": len(months[month]),
+            "bytes": size,
+            "gz_bytes": gz_size,
+        })
+    for name in os.listdir(shard_dir):
+        if name not in keep:
+            os.remove(os.path.join(shard_dir, name))
+    return shards
+
+
+def migrate_posts_yesterday(data_dir, history_path):
+    """이력 파일이 없으면 예전 posts_yesterday.json으로 첫 키프레임을 만들고 예전 파일 삭제 (한 번만)"""
+    yesterday_path = os.path.join(data_dir, "posts_yesterday.json")
+    if os.path.exists(history_path) or not os.path.exists(yesterday_path):
+        return
+    with open(yesterday_path, "r", encoding="utf-8") as f:
+        posts = json.load(f)
+    # check_date "26.02.07(토)" → 2026-02-07
+    m = re.match(r"(\d{2})\.(\d{2})\.(\d{2})", posts[0].get("check_date", "")) if posts else None
+    if m:
+        append_day(history_path, f"20{m.group(1)}-{m.group(2)}-{m.group(3)}", posts)
+    for name in ("posts_yesterday.json", "posts_yesterday_columnar.json",
+                 "posts_yesterday_columnar.json.gz", "posts_yesterday_columnar.json.br"):
+        if os.path.exists(os.path.join(data_dir, name)):
+            os.remove(os.path.join(data_dir, name))
+    print(f"  posts_yesterday.json → {HISTORY_FILE} 이전 완료")
+
+
+def write_outputs(posts, followers, daily_report, data_dir=None):
+    """posts / followers / daily_report / meta JSON 저장 (docs/data/)"""
+    KST = timezone(timedelta(hours=9))
+    now = datetime.now(KST)
 
     # docs/data/ 디렉토리 생성
-    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs", "data")
+    if data_dir is None:
+        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs", "data")
     os.makedirs(data_dir, exist_ok=True)
 
     # JSON 파일 저장
@@ -214,15 +352,38 @@ def main():
             json.dump(data, f, ensure_ascii=False, indent=2)
         print(f"  {filename}: {len(data) if isinstance(data, list) else 1}건 저장")
 
-    # 기존 posts.json → posts_yesterday.json으로 복사 (전일 대비 비교용)
-    posts_path = os.path.join(data_dir, "posts.json")
-    posts_yesterday_path = os.path.join(data_dir, "posts_yesterday.json")
-    if os.path.exists(posts_path):
-        import shutil
-        shutil.copy2(posts_path, posts_yesterday_path)
-        print(f"  posts_yesterday.json: 이전 데이터 백업 완료")
+    # 게시물별 지표 변화 이력에 오늘 값 추가 (전일 / N일 전 비교용, posts_yesterday.json 대체)
+    history_path = os.path.join(data_dir, HISTORY_FILE)
+    migrate_posts_yesterday(data_dir, history_path)
+    entry = append_day(history_path, now.strftime("%Y-%m-%d"), posts)
+    kind = "키프레임" if entry.get("key") else "변경분"
+    history = read_history(history_path)
+    print(f"  {HISTORY_FILE}: {kind} {len(entry['posts'])}개 게시물 추가 (총 {len(history)}일)")
+    # 대시보드는 비교 날짜가 속한 키프레임 조각만 받음
+    segments = write_segments(history, data_dir)
+    print(f"  {SEGMENT_DIR}/: 조각 {len(segments)}개")
 
     write_json("posts.json", posts)
+    # 대시보드는 월별 조각(열 형식 + 압축본)을 읽음 (posts.json은 scoring.py 등 다른 도구용으로 유지)
+    shards = write_shards(posts, data_dir)
+    print(f"  {SHARD_DIR}/: 조각 {len(shards)}개 ({sum(s['bytes'] for s in shards) / 1024:,.1f}KB, "
+          f"gz {sum(s['gz_bytes'] for s in shards) / 1024:,.1f}KB)")
+    # 조각 도입 전의 단일 열 형식 파일은 대시보드가 더 읽지 않음 → 삭제
+    for name in ("posts_columnar.json", "posts_columnar.json.gz", "posts_columnar.json.br"):
+        if os.path.exists(os.path.join(data_dir, name)):
+            os.remove(os.path.join(data_dir, name))
+    write_json(MANIFEST_FILE, {
+        "format": COLUMNAR_FORMAT,
+        "updated_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "post_count": len(posts),
+        # 조각에서 뺀 실행 값 (수집 결과는 모든 행이 같은 확인 날짜·팔로워 수)
+        "run_fields": {f: posts[0].get(f) for f in RUN_FIELDS} if posts else {},
+        "shards": shards,
+    })
+    # KPI / 요일별 차트용 기간 집계 — 대시보드가 게시물을 읽는 순서(조각 순서)대로 더해서 브라우저 계산과 같은 값
+    rollups = build_rollups(sorted(posts, key=post_month, reverse=True), now.strftime("%Y-%m-%d %H:%M:%S"))
+    size, gz_size, _ = write_compressed(os.path.join(data_dir, ROLLUPS_FILE), rollups)
+    print(f"  {ROLLUPS_FILE}: {size / 1024:,.1f}KB (gz {gz_size / 1024:,.1f}KB)")
     write_json("followers.json", followers)
     write_json("daily_report.json", daily_report)
     write_json("meta.json", {
@@ -231,8 +392,29 @@ def main():
         "post_count": len(posts),
         "follower_days": len(followers),
         "report_days": len(daily_report),
+        "history_days": len(history),
     })
 
+
+def main():
+    KST = timezone(timedelta(hours=9))
+    now = datetime.now(KST)
+
+    print("=" * 50)
+    print("  Google Sheets → JSON 내보내기")
+    print(f"  실행 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} KST")
+    print("=" * 50)
+
+    # 세 시트를 한 번의 읽기 요청으로 가져옴
+    print("  시트 읽는 중 (자동수집 / 팔로워추적 / 일별종합리포트)...")
+    snapshot = SheetSnapshot(get_sheet(), SHEET_TITLES)
+
+    posts = export_posts(snapshot)
+    followers = export_followers(snapshot)
+    daily_report = export_daily_report(snapshot)
+
+    write_outputs(posts, followers, daily_report)
+
     print(f"\n{'=' * 50}")
     print(f"  내보내기 완료!")
     print(f"  게시물: {len(posts)}건 | 팔로워추적: {len(followers)}일 | 리포트: {len(daily_report)}일")
@@ -1,15 +1,37 @@
 #!/usr/bin/env python3
 """
 Google Sheets 서식 꾸미기 - 색상, 굵기, 열 너비, 테두리 등
+
+시트별 서식은 아래 레이아웃 정의(열/구역 단위)로만 관리하고 sheet_layout이 요청으로 변환한다.
+  - 행 수는 수집기가 시트 개발자 메타데이터에 남긴 값을 사용 (셀 값을 내려받지 않음)
+  - 적용한 레이아웃의 지문과 행 수를 메타데이터에 저장 → 둘 다 그대로면 서식 요청 0건,
+    행만 늘었으면 늘어난 행(예전 TOTAL/평균 행부터)만 서식 적용
+
+사용 예:
+  python format_sheet.py            # 바뀐 시트만 서식 적용
+  python format_sheet.py --force    # 지문과 무관하게 전체 다시 적용
+  python format_sheet.py --recount  # 메타데이터 대신 시트에서 행 수를 다시 셈
 """
 
+import argparse
 import gspread
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
 import os
 import sys
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from config import GOOGLE_CREDENTIALS_FILE, SPREADSHEET_ID
+# 설정 불러오기: GitHub Actions → 환경변수 / 로컬 → config.py
+if os.environ.get("GITHUB_ACTIONS"):
+    GOOGLE_CREDENTIALS_FILE = "google_credentials.json"
+    SPREADSHEET_ID = os.environ.get("SPREADSHEET_ID", "")
+else:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from config import GOOGLE_CREDENTIALS_FILE, SPREADSHEET_ID
+
+from sheet_layout import (
+    FINGERPRINT_KEY, FORMATTED_ROWS_KEY, METADATA_FIELDS, ROW_COUNT_KEY,
+    compile_layout, fingerprint, growth_start, metadata_request, sheet_metadata,
+)
 
 
 def get_sheet():
@@ -23,848 +45,192 @@ def get_sheet():
     return client.open_by_key(SPREADSHEET_ID)
 
 
-def format_auto_sheet():
-    """자동수집 시트 서식 적용"""
-    spreadsheet = get_sheet()
-    worksheet = spreadsheet.worksheet("자동수집")
+# ─── 공통 서식 ───────────────────────────────────────────
 
-    sheet_id = worksheet.id
-    data = worksheet.get_all_values()
-    data_count = len(data) - 1  # 헤더 제외
-    last_row = len(data)
-    total_row = last_row - 1  # TOTAL 행
-    avg_row = last_row         # 평균 행
-
-    requests_list = []
-
-    # ─── 1. 열 너비 설정 ─────────────────────────────
-    col_widths = {
-        0: 110,   # A: 업로드 일자
-        1: 100,   # B: 체크 일자
-        2: 130,   # C: 콘텐츠 유형
-        3: 50,    # D: 순위
-        4: 100,   # E: 카테고리 ← NEW
-        5: 250,   # F: 콘텐츠 제목
-        6: 80,    # G: 링크
-        7: 80,    # H: 도달
-        8: 80,    # I: 노출
-        9: 70,    # J: 좋아요
-        10: 70,   # K: 저장
-        11: 70,   # L: 공유
-        12: 70,   # M: 댓글
-        13: 90,   # N: 총 상호작용
-        14: 100,  # O: 참여수
-        15: 80,   # P: 참여율
-        16: 80,   # Q: 저장율
-        17: 80,   # R: 공유율
-        18: 110,  # S: 팔로워 대비 도달율
-        19: 100,  # T: 프로필 방문
-        20: 110,  # U: 외부링크
-        21: 80,   # V: 팔로우
-        22: 90,   # W: 팔로워 수
-        23: 80,   # X: 종합점수
+def _style(bg=None, font_size=9, bold=False, align="CENTER", **extra):
+    fmt = {
+        "textFormat": {"fontSize": font_size, **({"bold": True} if bold else {})},
+        "horizontalAlignment": align,
+        "verticalAlignment": "MIDDLE",
     }
-    for col, width in col_widths.items():
-        requests_list.append({
-            "updateDimensionProperties": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "dimension": "COLUMNS",
-                    "startIndex": col,
-                    "endIndex": col + 1,
-                },
-                "properties": {"pixelSize": width},
-                "fields": "pixelSize",
-            }
-        })
-
-    # ─── 2. 헤더 행 서식 (1행) ─────────────────────────
-    # 헤더 배경색: 진한 네이비
-    requests_list.append({
-        "repeatCell": {
-            "range": {
-                "sheetId": sheet_id,
-                "startRowIndex": 0,
-                "endRowIndex": 1,
-                "startColumnIndex": 0,
-                "endColumnIndex": 24,
-            },
-            "cell": {
-                "userEnteredFormat": {
-                    "backgroundColor": {"red": 0.15, "green": 0.18, "blue": 0.28},
-                    "textFormat": {
-                        "foregroundColor": {"red": 1, "green": 1, "blue": 1},
-                        "bold": True,
-                        "fontSize": 10,
-                    },
-                    "horizontalAlignment": "CENTER",
-                    "verticalAlignment": "MIDDLE",
-                    "wrapStrategy": "WRAP",
-                }
-            },
-            "fields": "userEnteredFormat",
-        }
-    })
-
-    # 헤더 행 높이
-    requests_list.append({
-        "updateDimensionProperties": {
-            "range": {
-                "sheetId": sheet_id,
-                "dimension": "ROWS",
-                "startIndex": 0,
-                "endIndex": 1,
-            },
-            "properties": {"pixelSize": 45},
-            "fields": "pixelSize",
-        }
-    })
-
-    # ─── 3. Info 영역 (A~F열) 배경색: 연한 회색 ─────────
-    if data_count > 0:
-        # A~D열 (업로드일자, 체크일자, 유형, 순위): 가운데 정렬
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 0,
-                    "endColumnIndex": 4,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.95, "green": 0.95, "blue": 0.97},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-        # D열 (순위): 볼드 + 연한 빨강 배경
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 3,
-                    "endColumnIndex": 4,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 1.0, "green": 0.9, "blue": 0.9},
-                        "textFormat": {"fontSize": 10, "bold": True},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-        # E열 (카테고리): 가운데 정렬 + 연한 회색
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 4,
-                    "endColumnIndex": 5,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.95, "green": 0.95, "blue": 0.97},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-        # F열 (콘텐츠 제목): 왼쪽 정렬
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 5,
-                    "endColumnIndex": 6,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.95, "green": 0.95, "blue": 0.97},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "LEFT",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-        # G열 (링크): 가운데 정렬
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 6,
-                    "endColumnIndex": 7,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.95, "green": 0.95, "blue": 0.97},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 4. 도달/노출 영역 (H~I열) 배경색: 연한 파랑 ─────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 7,
-                    "endColumnIndex": 9,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.87, "green": 0.92, "blue": 1.0},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 5. 반응(참여) 영역 (J~O열) 배경색: 연한 녹색 ─────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 9,
-                    "endColumnIndex": 15,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.88, "green": 0.97, "blue": 0.88},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 6. 비율 영역 (P~S열) 배경색: 연한 노랑 ─────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 15,
-                    "endColumnIndex": 19,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 1.0, "green": 0.98, "blue": 0.88},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                        "numberFormat": {"type": "NUMBER", "pattern": "0.00%"},
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 7. 수기입력 영역 (T~V열) 배경색: 연한 주황 ─────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 19,
-                    "endColumnIndex": 22,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 1.0, "green": 0.93, "blue": 0.85},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 8. 팔로워 수 (W열) 배경색: 연한 보라 ─────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 22,
-                    "endColumnIndex": 23,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.92, "green": 0.88, "blue": 1.0},
-                        "textFormat": {"fontSize": 9},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 8-1. 종합점수 (X열) 배경색: 연한 빨강 ─────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 23,
-                    "endColumnIndex": 24,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 1.0, "green": 0.9, "blue": 0.9},
-                        "textFormat": {"fontSize": 9, "bold": True},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 9. TOTAL 행 서식 ─────────────────────────────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": total_row - 1,
-                    "endRowIndex": total_row,
-                    "startColumnIndex": 0,
-                    "endColumnIndex": 24,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.2, "green": 0.25, "blue": 0.35},
-                        "textFormat": {
-                            "foregroundColor": {"red": 1, "green": 1, "blue": 1},
-                            "bold": True,
-                            "fontSize": 10,
-                        },
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 10. 평균 행 서식 ─────────────────────────────
-    if data_count > 0:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": avg_row - 1,
-                    "endRowIndex": avg_row,
-                    "startColumnIndex": 0,
-                    "endColumnIndex": 24,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.95, "green": 0.85, "blue": 0.55},
-                        "textFormat": {
-                            "bold": True,
-                            "fontSize": 10,
-                        },
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-    # ─── 11. 전체 테두리 ─────────────────────────────
-    requests_list.append({
-        "updateBorders": {
-            "range": {
-                "sheetId": sheet_id,
-                "startRowIndex": 0,
-                "endRowIndex": last_row,
-                "startColumnIndex": 0,
-                "endColumnIndex": 24,
-            },
-            "top": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "bottom": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "left": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "right": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "innerHorizontal": {"style": "SOLID", "color": {"red": 0.85, "green": 0.85, "blue": 0.85}},
-            "innerVertical": {"style": "SOLID", "color": {"red": 0.85, "green": 0.85, "blue": 0.85}},
-        }
-    })
-
-    # ─── 12. 1행 고정 ─────────────────────────────────
-    requests_list.append({
-        "updateSheetProperties": {
-            "properties": {
-                "sheetId": sheet_id,
-                "gridProperties": {"frozenRowCount": 1},
-            },
-            "fields": "gridProperties.frozenRowCount",
-        }
-    })
-
-    # ─── 13. 숫자 형식 (천 단위 콤마) ─────────────────
-    if data_count > 0:
-        # H~O열, T~W열: 숫자 콤마
-        for col_range in [(7, 15), (19, 23)]:
-            requests_list.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": sheet_id,
-                        "startRowIndex": 1,
-                        "endRowIndex": data_count + 1,
-                        "startColumnIndex": col_range[0],
-                        "endColumnIndex": col_range[1],
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "numberFormat": {"type": "NUMBER", "pattern": "#,##0"},
-                        }
-                    },
-                    "fields": "userEnteredFormat.numberFormat",
-                }
-            })
-
-        # P~S열: 퍼센트 텍스트 (이미 "1.5%" 형태로 입력됨) - 가운데 정렬만
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 15,
-                    "endColumnIndex": 19,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "horizontalAlignment": "CENTER",
-                    }
-                },
-                "fields": "userEnteredFormat.horizontalAlignment",
-            }
-        })
-
-    # ─── 14. 카테고리 드롭다운 (E열) ─────────────────
-    if data_count > 0:
-        categories = ["맛집", "여행지", "현지정보", "여행팁", "숙소", "로컬", "할인정보", "기타"]
-        requests_list.append({
-            "setDataValidation": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": data_count + 1,
-                    "startColumnIndex": 4,
-                    "endColumnIndex": 5,
-                },
-                "rule": {
-                    "condition": {
-                        "type": "ONE_OF_LIST",
-                        "values": [{"userEnteredValue": c} for c in categories],
-                    },
-                    "showCustomUi": True,
-                    "strict": False,  # 사용자가 새 카테고리 직접 입력 가능
-                },
-            }
-        })
-
-    # 실행
-    spreadsheet.batch_update({"requests": requests_list})
-    print("✅ '자동수집' 시트 서식 적용 완료!")
-
-
-def format_follower_sheet():
-    """팔로워추적 시트 서식 적용"""
-    spreadsheet = get_sheet()
-    try:
-        worksheet = spreadsheet.worksheet("팔로워추적")
-    except gspread.exceptions.WorksheetNotFound:
-        print("팔로워추적 시트가 없습니다.")
-        return
-
-    sheet_id = worksheet.id
-    data = worksheet.get_all_values()
-
-    requests_list = []
-
-    # 헤더 서식
-    requests_list.append({
-        "repeatCell": {
-            "range": {
-                "sheetId": sheet_id,
-                "startRowIndex": 0,
-                "endRowIndex": 1,
-                "startColumnIndex": 0,
-                "endColumnIndex": 6,
-            },
-            "cell": {
-                "userEnteredFormat": {
-                    "backgroundColor": {"red": 0.15, "green": 0.18, "blue": 0.28},
-                    "textFormat": {
-                        "foregroundColor": {"red": 1, "green": 1, "blue": 1},
-                        "bold": True,
-                        "fontSize": 10,
-                    },
-                    "horizontalAlignment": "CENTER",
-                    "verticalAlignment": "MIDDLE",
-                }
-            },
-            "fields": "userEnteredFormat",
-        }
+    if bg:
+        fmt["backgroundColor"] = {"red": bg[0], "green": bg[1], "blue": bg[2]}
+    fmt.update(extra)
+    return fmt
+
+
+# 헤더: 진한 네이비 + 흰색 굵은 글씨
+HEADER = {
+    "backgroundColor": {"red": 0.15, "green": 0.18, "blue": 0.28},
+    "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True, "fontSize": 10},
+    "horizontalAlignment": "CENTER",
+    "verticalAlignment": "MIDDLE",
+}
+HEADER_WRAP = {**HEADER, "wrapStrategy": "WRAP"}
+
+GRAY = (0.95, 0.95, 0.97)
+BLUE = (0.87, 0.92, 1.0)
+GREEN = (0.88, 0.97, 0.88)
+YELLOW = (1.0, 0.98, 0.88)
+ORANGE = (1.0, 0.93, 0.85)
+PURPLE = (0.92, 0.88, 1.0)
+RED = (1.0, 0.9, 0.9)
+
+# 천 단위 콤마 (기존 서식 위에 숫자 형식만 덧씌움)
+COMMA = {"numberFormat": {"type": "NUMBER", "pattern": "#,##0"}}
+PERCENT = {"type": "NUMBER", "pattern": "0.00%"}
+
+CATEGORIES = ["맛집", "여행지", "현지정보", "여행팁", "숙소", "로컬", "할인정보", "기타"]
+
+
+# ─── 시트별 레이아웃 ─────────────────────────────────────
+
+AUTO_SHEET_LAYOUT = {
+    "columns": 24,
+    # A 업로드 일자 ~ X 종합점수
+    "widths": [110, 100, 130, 50, 100, 250, 80, 80, 80, 70, 70, 70,
+               70, 90, 100, 80, 80, 80, 110, 100, 110, 80, 90, 80],
+    "header": HEADER_WRAP,
+    "header_height": 45,
+    "body": [
+        (0, 7, _style(GRAY)),                          # A~G: Info 영역 (연한 회색)
+        (3, 4, _style(RED, font_size=10, bold=True)),  # D: 순위
+        (5, 6, _style(GRAY, align="LEFT")),            # F: 콘텐츠 제목 (왼쪽 정렬)
+        (7, 9, _style(BLUE)),                          # H~I: 도달/노출
+        (9, 15, _style(GREEN)),                        # J~O: 반응(참여)
+        (15, 19, _style(YELLOW, numberFormat=PERCENT)),  # P~S: 비율
+        (19, 22, _style(ORANGE)),                      # T~V: 프로필/팔로우
+        (22, 23, _style(PURPLE)),                      # W: 팔로워 수
+        (23, 24, _style(RED, bold=True)),              # X: 종합점수
+    ],
+    "overlays": [(7, 15, COMMA), (19, 23, COMMA)],     # H~O, T~W: 숫자 콤마
+    "footer": [
+        # TOTAL 행
+        {
+            "backgroundColor": {"red": 0.2, "green": 0.25, "blue": 0.35},
+            "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}, "bold": True, "fontSize": 10},
+            "horizontalAlignment": "CENTER",
+            "verticalAlignment": "MIDDLE",
+        },
+        # 평균 행
+        _style((0.95, 0.85, 0.55), font_size=10, bold=True),
+    ],
+    # E열 카테고리 드롭다운 (사용자가 새 카테고리 직접 입력 가능)
+    "validations": [(4, 5, {
+        "condition": {"type": "ONE_OF_LIST", "values": [{"userEnteredValue": c} for c in CATEGORIES]},
+        "showCustomUi": True,
+        "strict": False,
+    })],
+    "borders": True,
+    "frozen_rows": 1,
+    "count_column": "F",  # 행 수 재계산 기준 열 (TOTAL/평균 행은 A열이 비어 있음)
+}
+
+FOLLOWER_LAYOUT = {
+    "columns": 6,
+    "widths": [120, 90, 90, 90, 90, 150],
+    "header": HEADER,
+    "body": [(0, 6, _style(font_size=10))],
+    "overlays": [(1, 5, COMMA)],
+    "frozen_rows": 1,
+    "count_column": "A",
+}
+
+DAILY_REPORT_LAYOUT = {
+    "columns": 16,
+    # 날짜, 팔로워, 팔로워 변화, 팔로잉, 게시물 수, 총 도달~총 참여수, 평균 참여율~공유율, 메모
+    "widths": [120, 90, 90, 90, 80, 90, 90, 80, 80, 80, 80, 90, 90, 90, 90, 150],
+    "header": HEADER_WRAP,
+    "header_height": 40,
+    "body": [
+        (0, 1, _style(GRAY, font_size=10)),     # A: 날짜
+        (1, 4, _style(PURPLE, font_size=10)),   # B~D: 팔로워
+        (4, 12, _style(BLUE, font_size=10)),    # E~L: 수치
+        (12, 15, _style(YELLOW, font_size=10)),  # M~O: 비율
+    ],
+    "overlays": [(1, 12, COMMA)],               # B~L: 숫자 콤마
+    "borders": True,
+    "frozen_rows": 1,
+    "count_column": "A",
+}
+
+LAYOUTS = {
+    "자동수집": AUTO_SHEET_LAYOUT,
+    "팔로워추적": FOLLOWER_LAYOUT,
+    "일별종합리포트": DAILY_REPORT_LAYOUT,
+}
+
+
+# ─── 적용 ────────────────────────────────────────────────
+
+def count_rows(spreadsheet, titles):
+    """메타데이터가 없는 시트의 행 수 — 기준 열 하나만 읽음 (시트 전체 요청 1회)"""
+    if not titles:
+        return {}
+    resp = spreadsheet.values_batch_get(
+        [absolute_range_name(t, f"{LAYOUTS[t]['count_column']}:{LAYOUTS[t]['count_column']}") for t in titles],
+        params={"majorDimension": "COLUMNS"},
+    )
+    counts = {}
+    for title, value_range in zip(titles, resp.get("valueRanges", [])):
+        values = value_range.get("values", [])
+        counts[title] = len(values[0]) if values else 0
+    return counts
+
+
+def apply_layouts(spreadsheet, layouts=None, force=False, recount=False):
+    """레이아웃이 바뀐 시트만 서식 적용 (메타데이터 조회 1회 + 필요 시 batchUpdate 1회)"""
+    layouts = layouts or LAYOUTS
+    meta = spreadsheet.fetch_sheet_metadata(params={
+        "fields": f"sheets(properties(sheetId,title),{METADATA_FIELDS})",
     })
-
-    # 열 너비
-    widths = {0: 120, 1: 90, 2: 90, 3: 90, 4: 90, 5: 150}
-    for col, w in widths.items():
-        requests_list.append({
-            "updateDimensionProperties": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "dimension": "COLUMNS",
-                    "startIndex": col,
-                    "endIndex": col + 1,
-                },
-                "properties": {"pixelSize": w},
-                "fields": "pixelSize",
-            }
-        })
-
-    # 데이터 영역 서식
-    if len(data) > 1:
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 0,
-                    "endColumnIndex": 6,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                        "textFormat": {"fontSize": 10},
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-        # 숫자 콤마
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 1,
-                    "endColumnIndex": 5,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "numberFormat": {"type": "NUMBER", "pattern": "#,##0"},
-                    }
-                },
-                "fields": "userEnteredFormat.numberFormat",
-            }
-        })
-
-    # 1행 고정
-    requests_list.append({
-        "updateSheetProperties": {
-            "properties": {
-                "sheetId": sheet_id,
-                "gridProperties": {"frozenRowCount": 1},
-            },
-            "fields": "gridProperties.frozenRowCount",
-        }
-    })
-
-    spreadsheet.batch_update({"requests": requests_list})
-    print("✅ '팔로워추적' 시트 서식 적용 완료!")
-
-
-def format_daily_report_sheet():
-    """일별종합리포트 시트 서식 적용"""
-    spreadsheet = get_sheet()
-    try:
-        worksheet = spreadsheet.worksheet("일별종합리포트")
-    except gspread.exceptions.WorksheetNotFound:
-        print("일별종합리포트 시트가 없습니다.")
-        return
-
-    sheet_id = worksheet.id
-    data = worksheet.get_all_values()
+    sheets = {s["properties"]["title"]: s for s in meta.get("sheets", []) if s["properties"]["title"] in layouts}
+    for title in layouts:
+        if title not in sheets:
+            print(f"{title} 시트가 없습니다.")
+
+    metadata = {title: sheet_metadata(sheet) for title, sheet in sheets.items()}
+    row_counts = {}
+    for title in sheets:
+        stored = metadata[title].get(ROW_COUNT_KEY)
+        if stored and not recount and stored[1].isdigit():
+            row_counts[title] = int(stored[1])
+    row_counts.update(count_rows(spreadsheet, [t for t in sheets if t not in row_counts]))
 
     requests_list = []
-
-    # 헤더 서식 (진한 네이비)
-    requests_list.append({
-        "repeatCell": {
-            "range": {
-                "sheetId": sheet_id,
-                "startRowIndex": 0,
-                "endRowIndex": 1,
-                "startColumnIndex": 0,
-                "endColumnIndex": 16,
-            },
-            "cell": {
-                "userEnteredFormat": {
-                    "backgroundColor": {"red": 0.15, "green": 0.18, "blue": 0.28},
-                    "textFormat": {
-                        "foregroundColor": {"red": 1, "green": 1, "blue": 1},
-                        "bold": True,
-                        "fontSize": 10,
-                    },
-                    "horizontalAlignment": "CENTER",
-                    "verticalAlignment": "MIDDLE",
-                    "wrapStrategy": "WRAP",
-                }
-            },
-            "fields": "userEnteredFormat",
-        }
-    })
-
-    # 헤더 행 높이
-    requests_list.append({
-        "updateDimensionProperties": {
-            "range": {
-                "sheetId": sheet_id,
-                "dimension": "ROWS",
-                "startIndex": 0,
-                "endIndex": 1,
-            },
-            "properties": {"pixelSize": 40},
-            "fields": "pixelSize",
-        }
-    })
-
-    # 열 너비
-    col_widths = {
-        0: 120,   # 날짜
-        1: 90,    # 팔로워
-        2: 90,    # 팔로워 변화
-        3: 90,    # 팔로잉
-        4: 80,    # 게시물 수
-        5: 90,    # 총 도달
-        6: 90,    # 총 노출
-        7: 80,    # 총 좋아요
-        8: 80,    # 총 저장
-        9: 80,    # 총 공유
-        10: 80,   # 총 댓글
-        11: 90,   # 총 참여수
-        12: 90,   # 평균 참여율
-        13: 90,   # 평균 저장율
-        14: 90,   # 평균 공유율
-        15: 150,  # 메모
-    }
-    for col, width in col_widths.items():
-        requests_list.append({
-            "updateDimensionProperties": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "dimension": "COLUMNS",
-                    "startIndex": col,
-                    "endIndex": col + 1,
-                },
-                "properties": {"pixelSize": width},
-                "fields": "pixelSize",
-            }
-        })
-
-    # 데이터 영역 서식
-    if len(data) > 1:
-        # 팔로워 영역 (B~D열): 연한 보라
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 1,
-                    "endColumnIndex": 4,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.92, "green": 0.88, "blue": 1.0},
-                        "textFormat": {"fontSize": 10},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-        # 수치 영역 (E~L열): 연한 파랑
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 4,
-                    "endColumnIndex": 12,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.87, "green": 0.92, "blue": 1.0},
-                        "textFormat": {"fontSize": 10},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-        # 비율 영역 (M~O열): 연한 노랑
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 12,
-                    "endColumnIndex": 15,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 1.0, "green": 0.98, "blue": 0.88},
-                        "textFormat": {"fontSize": 10},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-        # 날짜 열 (A열) + 메모 열 (P열): 기본 서식
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 0,
-                    "endColumnIndex": 1,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "backgroundColor": {"red": 0.95, "green": 0.95, "blue": 0.97},
-                        "textFormat": {"fontSize": 10},
-                        "horizontalAlignment": "CENTER",
-                        "verticalAlignment": "MIDDLE",
-                    }
-                },
-                "fields": "userEnteredFormat",
-            }
-        })
-
-        # 숫자 콤마 (B~L열)
-        requests_list.append({
-            "repeatCell": {
-                "range": {
-                    "sheetId": sheet_id,
-                    "startRowIndex": 1,
-                    "endRowIndex": len(data),
-                    "startColumnIndex": 1,
-                    "endColumnIndex": 12,
-                },
-                "cell": {
-                    "userEnteredFormat": {
-                        "numberFormat": {"type": "NUMBER", "pattern": "#,##0"},
-                    }
-                },
-                "fields": "userEnteredFormat.numberFormat",
-            }
-        })
-
-    # 테두리
-    requests_list.append({
-        "updateBorders": {
-            "range": {
-                "sheetId": sheet_id,
-                "startRowIndex": 0,
-                "endRowIndex": len(data),
-                "startColumnIndex": 0,
-                "endColumnIndex": 16,
-            },
-            "top": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "bottom": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "left": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "right": {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}},
-            "innerHorizontal": {"style": "SOLID", "color": {"red": 0.85, "green": 0.85, "blue": 0.85}},
-            "innerVertical": {"style": "SOLID", "color": {"red": 0.85, "green": 0.85, "blue": 0.85}},
-        }
-    })
-
-    # 1행 고정
-    requests_list.append({
-        "updateSheetProperties": {
-            "properties": {
-                "sheetId": sheet_id,
-                "gridProperties": {"frozenRowCount": 1},
-            },
-            "fields": "gridProperties.frozenRowCount",
-        }
-    })
-
-    spreadsheet.batch_update({"requests": requests_list})
-    print("✅ '일별종합리포트' 시트 서식 적용 완료!")
+    for title, sheet in sheets.items():
+        sheet_id = sheet["properties"]["sheetId"]
+        row_count = row_counts[title]
+        fp = fingerprint(layouts[title])
+        stored = metadata[title].get(FINGERPRINT_KEY)
+        formatted = metadata[title].get(FORMATTED_ROWS_KEY)
+        formatted = int(formatted[1]) if formatted and formatted[1].isdigit() else None
+        same_layout = bool(stored) and stored[1] == fp and not force
+        if same_layout and formatted == row_count:
+            print(f"  '{title}': 변경 없음 (서식 요청 생략)")
+            continue
+        # 레이아웃이 그대로이고 행만 늘었으면 늘어난 행만, 그 외(레이아웃 변경·행 감소·기록 없음)는 전체
+        grown = same_layout and formatted is not None and formatted < row_count
+        start_row = growth_start(layouts[title], formatted) if grown else 0
+        sheet_requests = compile_layout(layouts[title], sheet_id, row_count, start_row)
+        requests_list += sheet_requests
+        if not same_layout:
+            requests_list.append(metadata_request(sheet_id, FINGERPRINT_KEY, fp, metadata[title]))
+        requests_list.append(metadata_request(sheet_id, FORMATTED_ROWS_KEY, row_count, metadata[title]))
+        scope = f"{start_row + 1}행부터" if start_row else "전체"
+        print(f"  '{title}': {row_count}행 ({scope}), 서식 요청 {len(sheet_requests)}건")
+
+    if requests_list:
+        spreadsheet.batch_update({"requests": requests_list})
+    return requests_list
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Google Sheets 서식 적용")
+    parser.add_argument("--force", action="store_true", help="지문과 무관하게 전체 서식 다시 적용")
+    parser.add_argument("--recount", action="store_true", help="메타데이터 대신 시트에서 행 수를 다시 셈")
+    args = parser.parse_args()
+
     print("Google Sheets 서식 적용 중...")
-    format_auto_sheet()
-    format_follower_sheet()
-    format_daily_report_sheet()
-    print("\n모든 서식 적용 완료!")
+    applied = apply_layouts(get_sheet(), force=args.force, recount=args.recount)
+    print("\n모든 서식 적용 완료!" if applied else "\n서식 변경 없음 — 요청을 보내지 않았습니다.")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Instagram Graph API 공용 클라이언트
+연결 재사용(requests.Session) + 요청별 타임아웃 + 재시도(지수 백오프) + 오류 파싱 일원화
+"""
+
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from run_metrics import install_session_hook
+
+# 재시도 대상 Graph 오류 코드 (호출 한도 초과 계열)
+#   4: 앱 호출 한도, 17: 사용자 호출 한도, 32: 페이지 호출 한도, 613: 호출 빈도 제한
+THROTTLE_ERROR_CODES = {4, 17, 32, 613}
+
+
+def network_error_message(error, url):
+    """연결 오류 / 타임아웃 메시지 — 예외 문자열에는 access_token이 든 전체 URL이 들어 있어서
+    예외 종류 + 호스트·경로만 남김 (Actions 로그에 토큰 노출 방지)"""
+    parts = urlsplit(url)
+    return f"네트워크 오류: {type(error).__name__} ({parts.netloc}{parts.path})"
+
+
+class GraphAPIError(Exception):
+    """Graph API 오류 (응답의 error 객체 또는 HTTP/네트워크 오류)"""
+
+    def __init__(self, message, code=None, subcode=None, status=None, transient=False):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.subcode = subcode
+        self.status = status
+        self.transient = transient  # 연결 끊김 / 타임아웃
+
+    @property
+    def retryable(self):
+        """잠시 후 다시 시도하면 성공할 수 있는 오류인지 (호출 한도 / 서버 5xx / 네트워크)"""
+        if self.transient or self.code in THROTTLE_ERROR_CODES:
+            return True
+        return self.status is not None and self.status >= 500
+
+
+def parse_graph_error(body, status=None):
+    """응답 본문 → GraphAPIError (오류가 없으면 None)
+
+    일반 요청과 batch 하위 응답이 같은 규칙으로 오류를 판정하도록 한 곳에서 처리한다.
+    """
+    if isinstance(body, dict) and "error" in body:
+        error = body["error"] if isinstance(body["error"], dict) else {"message": str(body["error"])}
+        return GraphAPIError(
+            error.get("message", "알 수 없는 오류"),
+            code=error.get("code"),
+            subcode=error.get("error_subcode"),
+            status=status,
+        )
+    if status is not None and status >= 400:
+        return GraphAPIError(f"HTTP {status}", status=status)
+    return None
+
+
+class TokenBucket:
+    """스레드 간 공유하는 토큰 버킷 (초당 rate개, 최대 burst개까지 몰아서 허용)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst if burst else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기 (rate <= 0이면 제한 없음)"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate):
+        """초당 허용량 변경 (AdaptiveThrottle이 사용량에 맞춰 조절)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+
+
+def parse_usage_headers(headers):
+    """X-App-Usage / X-Business-Use-Case-Usage 헤더 → (최대 사용률 %, 접근 재개까지 남은 초)
+
+    두 헤더의 call_count / total_cputime / total_time 중 가장 높은 값을 사용률로 본다.
+    헤더가 없으면 (None, 0)
+    """
+    usage, regain = None, 0
+    app = headers.get("X-App-Usage")
+    if app:
+        try:
+            data = json.loads(app)
+            usage = max(float(data.get(k, 0) or 0) for k in ("call_count", "total_cputime", "total_time"))
+        except (ValueError, TypeError, AttributeError):
+            pass
+    buc = headers.get("X-Business-Use-Case-Usage")
+    if buc:
+        try:
+            for entries in json.loads(buc).values():
+                for entry in entries:
+                    pct = max(float(entry.get(k, 0) or 0) for k in ("call_count", "total_cputime", "total_time"))
+                    usage = pct if usage is None else max(usage, pct)
+                    # 단위: 분
+                    regain = max(regain, float(entry.get("estimated_time_to_regain_access", 0) or 0) * 60)
+        except (ValueError, TypeError, AttributeError):
+            pass
+    return usage, regain
+
+
+class AdaptiveThrottle:
+    """Graph 사용량 헤더에 맞춰 요청 속도·동시 요청 수를 조절
+
+    - 사용률이 low(%) 이하이면 속도·동시 요청 수를 조금씩 올림 (응답마다 최대 25% / 1개)
+    - low ~ high 사이에서는 사용률에 비례해서 낮춤 (높아지면 즉시 반영)
+    - high 이상이면 최소 속도·동시 요청 1개
+    - estimated_time_to_regain_access가 오면 그 시간 동안 모든 요청을 멈춤
+    """
+
+    def __init__(self, rate_limiter=None, max_rate=20.0, min_rate=0.5, concurrency=4, max_concurrency=8,
+                 low=50.0, high=90.0):
+        self.rate_limiter = rate_limiter
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = max(1, min(concurrency, self.max_concurrency))
+        self.low = low
+        self.high = high
+        self.active = 0
+        self.paused_until = 0.0
+        self.last_usage = None
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        """일시 정지가 끝나고 동시 요청 자리가 날 때까지 대기"""
+        with self.cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.active < self.limit:
+                    self.active += 1
+                    return
+                self.cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self):
+        with self.cond:
+            self.active -= 1
+            self.cond.notify_all()
+
+    def pause_remaining(self):
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def observe(self, headers):
+        """응답 헤더 반영 (헤더가 없으면 아무것도 바꾸지 않음)"""
+        usage, regain = parse_usage_headers(headers)
+        with self.cond:
+            if regain > 0:
+                until = time.monotonic() + regain
+                if until > self.paused_until:
+                    print(f"  [호출 한도] 접근 차단 → {regain:.0f}초 대기 (estimated_time_to_regain_access)")
+                    self.paused_until = until
+            if usage is None:
+                return
+            self.last_usage = usage
+            # 사용률 → 목표 비율 (low 이하 1.0, high 이상 0.0)
+            if usage <= self.low:
+                fraction = 1.0
+            elif usage >= self.high:
+                fraction = 0.0
+            else:
+                fraction = (self.high - usage) / (self.high - self.low)
+            target_limit = max(1, round(1 + (self.max_concurrency - 1) * fraction))
+            self.limit = min(target_limit, self.limit + 1)
+            if self.rate_limiter is not None:
+                current = self.rate_limiter.rate
+                target_rate = self.min_rate + (self.max_rate - self.min_rate) * fraction
+                rate = min(target_rate, current * 1.25) if target_rate > current else target_rate
+                if rate != current:
+                    self.rate_limiter.set_rate(rate)
+            self.cond.notify_all()
+
+
+class GraphClient:
+    """Graph API 호출 전용 클라이언트
+
+    - 하나의 requests.Session을 공유해서 keep-alive 연결 재사용 (TLS 핸드셰이크 1회)
+    - 모든 요청에 타임아웃 적용
+    - 5xx / 연결 끊김 / 타임아웃 / 호출 한도 오류(4, 17, 32, 613)는 지수 백오프 + 지터로 재시도
+    - throttle(AdaptiveThrottle)이 있으면 응답마다 사용량 헤더를 반영해서 속도·동시 요청 수 조절
+    - metrics(RunMetrics)를 지정하면 요청별 지연·바이트와 재시도 횟수를 현재 단계에 기록
+    - 오류는 GraphAPIError 하나로 통일해서 raise
+    """
+
+    def __init__(self, base_url, timeout=30, max_retries=4, backoff=1.0, max_backoff=60.0,
+                 rate_limiter=None, pool_size=10, throttle=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
+        self.throttle = throttle
+        self.metrics = None
+        self.session = requests.Session()
+        install_session_hook(self.session, lambda: self.metrics)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url(self, path):
+        """상대 경로 → 전체 URL (이미 전체 URL이면 그대로)"""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}" if path else self.base_url
+
+    def backoff_delay(self, attempt):
+        """attempt번째 재시도 대기 시간 (지수 증가, 절반은 무작위 지터)"""
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def request(self, method, path, params=None, data=None):
+        """요청 실행 → JSON 본문 (실패 시 GraphAPIError)"""
+        url = self.url(path)
+        attempt = 0
+        while True:
+            if self.throttle:
+                self.throttle.acquire()
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                resp = self.session.request(method, url, params=params, data=data, timeout=self.timeout)
+                if self.throttle:
+                    self.throttle.observe(resp.headers)
+                try:
+                    body = resp.json()
+                except ValueError:
+                    body = None
+                error = parse_graph_error(body, resp.status_code)
+                if error is None and body is None:
+                    error = GraphAPIError(f"JSON이 아닌 응답 (HTTP {resp.status_code})", status=resp.status_code)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = GraphAPIError(network_error_message(e, url), transient=True)
+            except requests.RequestException as e:
+                # 그 밖의 requests 오류도 메시지에 URL이 들어갈 수 있음 → 같은 방식으로 (재시도 안 함)
+                error = GraphAPIError(network_error_message(e, url))
+            finally:
+                if self.throttle:
+                    self.throttle.release()
+
+            if error is None:
+                return body
+            if not error.retryable or attempt >= self.max_retries:
+                raise error
+            if self.metrics:
+                self.metrics.record_retry()
+            if self.throttle and self.throttle.pause_remaining() > 0:
+                # API가 알려 준 재개 시각까지는 throttle.acquire()에서 대기 → 백오프 생략
+                print(f"  [재시도 {attempt + 1}/{self.max_retries}] {error.message} → 접근 재개 후")
+            else:
+                delay = self.backoff_delay(attempt)
+                print(f"  [재시도 {attempt + 1}/{self.max_retries}] {error.message} → {delay:.1f}초 후")
+                time.sleep(delay)
+            attempt += 1
+
+    def get(self, path, params=None):
+        return self.request("GET", path, params=params)
+
+    def post(self, path, data=None):
+        return self.request("POST", path, data=data)
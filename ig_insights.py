@@ -5,15 +5,35 @@ Instagram 게시물 인사이트 자동 수집 → Google Sheets 기록
 + 팔로워 일별 추적 시트 포함
 """
 
-import requests
+import argparse
 import gspread
+import json
 from google.oauth2.service_account import Credentials
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
+import traceback
+from contextlib import closing
 import sys
 import os
 import re
 
+from graph_client import AdaptiveThrottle, GraphClient, GraphAPIError, TokenBucket, parse_graph_error
+from accounts import Account, account_from_entry, load_registry
+from convergence import ConvergenceTracker
+from snapshot_store import SnapshotStore
+from sheet_snapshot import GRID_ROW_HEADROOM, SheetSnapshot
+from sheet_layout import ROW_COUNT_KEY, metadata_request
+from scoring import parse_weights, score_rows
+from keyword_matcher import KeywordMatcher
+from caption_analysis import CaptionAnalyzer, analyze_caption
+import run_metrics
+from run_metrics import RunMetrics
+from pipeline import ordered_map, prefetch
+from post_history import shortcode
+from checkpoint import JOURNAL_FILE, CollectJournal
+
 # 설정 불러오기: GitHub Actions → 환경변수 / 로컬 → config.py
 if os.environ.get("GITHUB_ACTIONS"):
     INSTAGRAM_BUSINESS_ACCOUNT_ID = os.environ.get("INSTAGRAM_BUSINESS_ACCOUNT_ID", "")
@@ -35,7 +55,55 @@ else:
         APP_SECRET,
     )
 
-BASE_URL = f"https://graph.facebook.com/{GRAPH_API_VERSION}"
+# GRAPH_BASE_URL: 다른 Graph 서버로 요청 (예: mock_graph_server.py 로컬 목 서버, 버전 경로 포함)
+BASE_URL = os.environ.get("GRAPH_BASE_URL") or f"https://graph.facebook.com/{GRAPH_API_VERSION}"
+
+# 인사이트 동시 수집: 워커 수 / 초당 요청 수 (1이면 순차 수집)
+INSIGHTS_WORKERS = int(os.environ.get("INSIGHTS_WORKERS", "4"))
+INSIGHTS_RATE_PER_SEC = float(os.environ.get("INSIGHTS_RATE_PER_SEC", "5"))
+# 사용량 헤더(X-App-Usage 등) 기반 자동 조절: 사용률이 낮으면 아래 상한까지 속도·워커 수를 올림
+GRAPH_ADAPTIVE_THROTTLE = os.environ.get("GRAPH_ADAPTIVE_THROTTLE", "1") == "1"
+INSIGHTS_MAX_WORKERS = int(os.environ.get("INSIGHTS_MAX_WORKERS", "8"))
+INSIGHTS_MAX_RATE_PER_SEC = float(os.environ.get("INSIGHTS_MAX_RATE_PER_SEC", "20"))
+# 인사이트 요청 방식: single(게시물별 요청) / batch(Graph batch 요청으로 최대 50개씩 묶음)
+#                   / inline(게시물 목록에 insights 중첩 필드로 함께 요청, 누락분만 개별 요청)
+INSIGHTS_FETCH_MODE = os.environ.get("INSIGHTS_FETCH_MODE", "single")
+GRAPH_BATCH_SIZE = 50
+# 게시물 목록을 미리 받아 둘 최대 페이지 수 (페이지당 100개, 인사이트 요청과 겹쳐서 진행)
+PIPELINE_QUEUE_PAGES = int(os.environ.get("PIPELINE_QUEUE_PAGES", "4"))
+# 스냅샷 DB에 한 번에 저장할 행 수
+SNAPSHOT_FLUSH_ROWS = 1000
+# 수집할 최대 게시물 수 (0이면 전체 게시물)
+INSIGHTS_MAX_POSTS = int(os.environ.get("INSIGHTS_MAX_POSTS", "0"))
+# inline 모드에서 목록과 함께 요청할 메트릭 (비우면 IMAGE 메트릭 전체)
+INLINE_INSIGHTS_METRICS = os.environ.get("INLINE_INSIGHTS_METRICS", "")
+# Graph 요청 타임아웃(초) / 일시 오류 재시도 횟수
+GRAPH_TIMEOUT = float(os.environ.get("GRAPH_TIMEOUT", "30"))
+GRAPH_MAX_RETRIES = int(os.environ.get("GRAPH_MAX_RETRIES", "4"))
+
+# 여러 계정 동시 수집 시 최대 동시 계정 수
+ACCOUNT_WORKERS = int(os.environ.get("ACCOUNT_WORKERS", "4"))
+
+# 실행 간 유지되는 로컬 상태 (수렴 추적 등) — Actions에서는 캐시로 복원
+STATE_DIR = os.environ.get("STATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "state"))
+# 수렴 추적: 최근 N개 스냅샷, K회 연속 변화율 TOL 이내면 주간 → 월간 재수집으로 전환
+CONVERGENCE_TRACKING = os.environ.get("CONVERGENCE_TRACKING", "1") == "1"
+CONVERGENCE_HISTORY = int(os.environ.get("CONVERGENCE_HISTORY", "5"))
+CONVERGENCE_STABLE_RUNS = int(os.environ.get("CONVERGENCE_STABLE_RUNS", "3"))
+CONVERGENCE_TOLERANCE = float(os.environ.get("CONVERGENCE_TOLERANCE", "0.02"))
+CONVERGENCE_MIN_AGE_DAYS = int(os.environ.get("CONVERGENCE_MIN_AGE_DAYS", "21"))
+# 게시물별 일별 지표 스냅샷 (SQLite) 기록 여부
+SNAPSHOT_STORE = os.environ.get("SNAPSHOT_STORE", "1") == "1"
+# 캡션 분석 결과 캐시 (캡션이 바뀐 게시물만 다시 분석)
+CAPTION_CACHE = os.environ.get("CAPTION_CACHE", "1") == "1"
+# 종합점수 가중치 (예: "shares=30,saves=25,reach=25,engagement_rate=20", 비우면 기본값)
+SCORE_WEIGHTS = parse_weights(os.environ.get("SCORE_WEIGHTS", ""))
+# 수집 직후 메모리의 결과로 대시보드 JSON(docs/data/) 바로 저장 (export_json.py 별도 실행 불필요)
+EXPORT_JSON_INLINE = os.environ.get("EXPORT_JSON_INLINE", "0") == "1"
+# 시트 쓰기 요청 1회에 담을 최대 셀 수 (변경분이 크면 여러 요청으로 나눠 전송)
+SHEETS_WRITE_CHUNK_CELLS = int(os.environ.get("SHEETS_WRITE_CHUNK_CELLS", "50000"))
+# 단계별 성능 기록(run_metrics.json + 이력)을 계정의 대시보드 데이터 폴더에 저장
+RUN_METRICS = os.environ.get("RUN_METRICS", "1") == "1"
 
 # 한국어 요일
 WEEKDAYS_KO = ["월", "화", "수", "목", "금", "토", "일"]
@@ -43,18 +111,33 @@ WEEKDAYS_KO = ["월", "화", "수", "목", "금", "토", "일"]
 
 # ─── 토큰 자동 갱신 ──────────────────────────────────────────
 
-def refresh_token_if_needed():
-    """토큰 만료 전 자동 갱신 (매 실행 시 체크)"""
-    global ACCESS_TOKEN
+# 여러 계정이 같은 토큰 파일(accounts.json)을 동시에 고쳐 쓰지 않도록
+_token_file_lock = threading.Lock()
+
+
+def save_token(token_file, old_token, new_token):
+    """토큰 파일의 예전 토큰을 새 토큰으로 교체 (임시 파일에 쓴 뒤 os.replace → 중간에 끊겨도 파일이 깨지지 않음)"""
+    with _token_file_lock:
+        with open(token_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        tmp_path = token_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content.replace(old_token, new_token))
+        os.replace(tmp_path, token_file)
 
+
+def refresh_token_if_needed(account):
+    """토큰 만료 전 자동 갱신 (매 실행 시 체크) — 새 토큰은 account.access_token에 반영"""
     if APP_SECRET == "여기에_앱시크릿_붙여넣기":
         print("  ⚠️ 앱 시크릿 미설정 → 토큰 자동 갱신 건너뜀")
-        return ACCESS_TOKEN
+        return account.access_token
 
     # 현재 토큰 유효성 및 만료일 확인
-    debug_url = f"{BASE_URL}/debug_token?input_token={ACCESS_TOKEN}&access_token={APP_ID}|{APP_SECRET}"
     try:
-        resp = requests.get(debug_url).json()
+        resp = account.graph.get("debug_token", params={
+            "input_token": account.access_token,
+            "access_token": f"{APP_ID}|{APP_SECRET}",
+        })
         data = resp.get("data", {})
         expires_at = data.get("expires_at", 0)
 
@@ -67,107 +150,171 @@ def refresh_token_if_needed():
             print(f"  토큰 만료까지: {days_left:.0f}일 남음")
 
             if days_left > 7:
-                return ACCESS_TOKEN  # 7일 이상 남으면 갱신 안 함
+                return account.access_token  # 7일 이상 남으면 갱신 안 함
     except Exception as e:
         print(f"  ⚠️ 토큰 확인 실패: {e}")
 
     # 새 장기 토큰 발급
     print("  🔄 토큰 갱신 중...")
-    refresh_url = (
-        f"{BASE_URL}/oauth/access_token"
-        f"?grant_type=fb_exchange_token"
-        f"&client_id={APP_ID}"
-        f"&client_secret={APP_SECRET}"
-        f"&fb_exchange_token={ACCESS_TOKEN}"
-    )
     try:
-        resp = requests.get(refresh_url).json()
+        resp = account.graph.get("oauth/access_token", params={
+            "grant_type": "fb_exchange_token",
+            "client_id": APP_ID,
+            "client_secret": APP_SECRET,
+            "fb_exchange_token": account.access_token,
+        })
         new_token = resp.get("access_token")
         if new_token:
             # GitHub Actions: gh CLI로 Secret 업데이트
             if os.environ.get("GITHUB_ACTIONS"):
                 repo = os.environ.get("GITHUB_REPOSITORY", "")
-                if repo:
+                if repo and not account.token_secret:
+                    print("  ⚠️ 토큰 갱신됨, 이 계정은 토큰을 직접 입력해서 GitHub Secret 자동 업데이트 불가")
+                elif repo:
                     import subprocess
                     result = subprocess.run(
-                        ["gh", "secret", "set", "ACCESS_TOKEN", "--body", new_token, "--repo", repo],
+                        ["gh", "secret", "set", account.token_secret, "--body", new_token, "--repo", repo],
                         capture_output=True, text=True
                     )
                     if result.returncode == 0:
                         print("  ✅ 토큰 갱신 완료! (GitHub Secret 업데이트됨)")
                     else:
                         print(f"  ⚠️ 토큰 갱신됨, GitHub Secret 업데이트 실패: {result.stderr}")
-            else:
-                # 로컬: config.py 파일에 새 토큰 저장
-                config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.py")
-                with open(config_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                content = content.replace(ACCESS_TOKEN, new_token)
-                with open(config_path, "w", encoding="utf-8") as f:
-                    f.write(content)
+            elif account.token_file:
+                # 로컬: 토큰을 읽어 온 파일(config.py / accounts.json)에 새 토큰 저장
+                save_token(account.token_file, account.access_token, new_token)
                 print("  ✅ 토큰 갱신 완료! (새로운 60일 토큰 저장됨)")
-            ACCESS_TOKEN = new_token
+            else:
+                print(f"  ⚠️ 토큰 갱신됨, 환경변수 {account.token_secret}는 직접 업데이트해 주세요")
+            account.access_token = new_token
         else:
-            error = resp.get("error", {}).get("message", "알 수 없는 오류")
-            print(f"  ❌ 토큰 갱신 실패: {error}")
+            print("  ❌ 토큰 갱신 실패: 응답에 access_token 없음")
+    except GraphAPIError as e:
+        print(f"  ❌ 토큰 갱신 실패: {e.message}")
     except Exception as e:
         print(f"  ❌ 토큰 갱신 오류: {e}")
 
-    return ACCESS_TOKEN
+    return account.access_token
+
+
+# ─── Graph API 클라이언트 ────────────────────────────────────
+
+def new_graph_client():
+    """계정 1개가 쓰는 Graph 클라이언트 (연결 재사용 + 타임아웃 + 재시도)
+
+    속도 제한기(기존 고정 0.3초 대기 대체)도 클라이언트마다 따로 → 계정별 호출 한도
+    자동 조절이 켜져 있으면 INSIGHTS_RATE_PER_SEC / INSIGHTS_WORKERS에서 시작해서 사용량 헤더에 맞춰 조절
+    """
+    rate_limiter = TokenBucket(INSIGHTS_RATE_PER_SEC)
+    throttle = None
+    if GRAPH_ADAPTIVE_THROTTLE:
+        throttle = AdaptiveThrottle(
+            rate_limiter,
+            max_rate=max(INSIGHTS_MAX_RATE_PER_SEC, INSIGHTS_RATE_PER_SEC),
+            concurrency=INSIGHTS_WORKERS,
+            max_concurrency=max(INSIGHTS_MAX_WORKERS, INSIGHTS_WORKERS),
+        )
+    return GraphClient(
+        BASE_URL,
+        timeout=GRAPH_TIMEOUT,
+        max_retries=GRAPH_MAX_RETRIES,
+        rate_limiter=rate_limiter,
+        pool_size=max(INSIGHTS_WORKERS, INSIGHTS_MAX_WORKERS, 1),
+        throttle=throttle,
+    )
+
+
+def load_accounts():
+    """수집할 계정 목록 (ACCOUNTS_JSON / accounts.json 등록 계정, 없으면 환경변수/config.py의 계정 1개)"""
+    entries, registry_path = load_registry()
+    if entries:
+        return [account_from_entry(entry, STATE_DIR, new_graph_client(), registry_path) for entry in entries]
+    return [Account(
+        name=INSTAGRAM_BUSINESS_ACCOUNT_ID or "default",
+        ig_id=INSTAGRAM_BUSINESS_ACCOUNT_ID,
+        access_token=ACCESS_TOKEN,
+        spreadsheet_id=SPREADSHEET_ID,
+        data_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs", "data"),
+        state_dir=STATE_DIR,
+        graph=new_graph_client(),
+        token_file=None if os.environ.get("GITHUB_ACTIONS") else os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "config.py"
+        ),
+    )]
 
 
 # ─── Instagram API ───────────────────────────────────────────
 
-def get_all_media(limit=500):
-    """최근 게시물 목록 가져오기 (페이징 지원)"""
-    url = f"{BASE_URL}/{INSTAGRAM_BUSINESS_ACCOUNT_ID}/media"
+MEDIA_FIELDS = "id,caption,media_type,permalink,timestamp,like_count,comments_count"
+
+
+def get_all_media(account, limit=None, inline_insights=False):
+    """최근 게시물 목록 가져오기 (페이징 지원, limit=None이면 전체)"""
+    return [media for page in iter_media_pages(account, limit, inline_insights) for media in page]
+
+
+def iter_media_pages(account, limit=None, inline_insights=False):
+    """최근 게시물 목록을 페이지(최대 100개) 단위로 받는 대로 생성 (limit=None이면 전체)
+
+    inline_insights=True이면 insights.metric(...)을 중첩 필드로 함께 요청한다.
+    중첩 인사이트 때문에 페이지가 실패하면 기본 메트릭 → 인사이트 없이 순서로 같은 페이지를 다시 요청.
+    """
+    path = f"{account.ig_id}/media"
+    field_options = [MEDIA_FIELDS]
+    if inline_insights:
+        metrics = INLINE_INSIGHTS_METRICS or insights_metrics("IMAGE")
+        field_options = [
+            f"{MEDIA_FIELDS},insights.metric({m})" for m in dict.fromkeys([metrics, BASE_METRICS])
+        ] + field_options
     params = {
-        "fields": "id,caption,media_type,permalink,timestamp,like_count,comments_count",
-        "limit": min(limit, 100),
-        "access_token": ACCESS_TOKEN,
+        "limit": 100 if limit is None else min(limit, 100),
+        "access_token": account.access_token,
     }
-    all_media = []
-    while url and len(all_media) < limit:
-        resp = requests.get(url, params=params).json()
-        if "error" in resp:
-            print(f"[오류] 미디어 목록: {resp['error']['message']}")
+    count = 0
+    while limit is None or count < limit:
+        resp, error = None, None
+        for fields in field_options:
+            params["fields"] = fields
+            try:
+                resp = account.graph.get(path, params=params)
+                break
+            except GraphAPIError as e:
+                error = e
+        if resp is None:
+            print(f"[오류] 미디어 목록: {error.message}")
+            break
+        page = resp.get("data", [])
+        if limit is not None:
+            page = page[:limit - count]
+        count += len(page)
+        if page:
+            yield page
+        # 페이지마다 필드를 바꿔 재요청할 수 있도록 next URL 대신 after 커서로 이동
+        paging = resp.get("paging", {})
+        after = paging.get("cursors", {}).get("after")
+        if not paging.get("next") or not after:
             break
-        all_media.extend(resp.get("data", []))
-        url = resp.get("paging", {}).get("next")
-        params = {}
-    return all_media[:limit]
+        params["after"] = after
 
 
-def get_media_insights(media_id, media_type):
-    """개별 게시물 인사이트 가져오기"""
+# 기본 메트릭 (릴스 및 프로필 메트릭 오류 시 재시도용)
+BASE_METRICS = "reach,views,saved,shares,total_interactions,likes,comments"
+
+
+def insights_metrics(media_type):
+    """콘텐츠 유형별 요청 메트릭"""
     if media_type == "STORY":
-        metrics = "reach,views,shares,total_interactions,replies,taps_forward,taps_back,exits"
+        return "reach,views,shares,total_interactions,replies,taps_forward,taps_back,exits"
     elif media_type == "VIDEO":
         # 릴스는 profile_visits, follows, profile_activity 미지원
-        metrics = "reach,views,saved,shares,total_interactions,likes,comments"
+        return BASE_METRICS
     else:
         # CAROUSEL_ALBUM, IMAGE 등은 프로필 메트릭 지원
-        metrics = "reach,views,saved,shares,total_interactions,likes,comments,profile_visits,follows,profile_activity"
+        return BASE_METRICS + ",profile_visits,follows,profile_activity"
 
-    url = f"{BASE_URL}/{media_id}/insights"
-    params = {
-        "metric": metrics,
-        "access_token": ACCESS_TOKEN,
-    }
-    resp = requests.get(url, params=params).json()
-    if "error" in resp:
-        # 프로필 메트릭 오류 시 기본 메트릭으로 재시도
-        if "profile_visits" in metrics:
-            fallback = "reach,views,saved,shares,total_interactions,likes,comments"
-            params["metric"] = fallback
-            resp = requests.get(url, params=params).json()
-            if "error" in resp:
-                print(f"  [주의] 인사이트 오류 ({media_id}): {resp['error']['message']}")
-                return {}
-        else:
-            print(f"  [주의] 인사이트 오류 ({media_id}): {resp['error']['message']}")
-            return {}
 
+def parse_insights(resp):
+    """인사이트 응답(data 목록) → {메트릭: 값}"""
     result = {}
     for item in resp.get("data", []):
         name = item["name"]
@@ -176,18 +323,151 @@ def get_media_insights(media_id, media_type):
     return result
 
 
-def get_account_info():
+def inline_insights(media):
+    """목록에 중첩된 인사이트 → {메트릭: 값} (유형별 필수 메트릭이 빠져 있으면 None → 개별 요청 필요)"""
+    nested = media.pop("insights", None)
+    if not nested or "error" in nested:
+        return None
+    result = parse_insights(nested)
+    required = insights_metrics(media.get("media_type", "")).split(",")
+    if not all(metric in result for metric in required):
+        return None
+    return result
+
+
+def get_media_insights(account, media_id, media_type):
+    """개별 게시물 인사이트 가져오기
+
+    복구할 수 없는 오류(삭제된 게시물 등)면 None → 그 게시물은 행을 만들지 않음 (0으로 채우지 않음).
+    재시도 가능한 오류가 GraphClient 재시도 후에도 계속되면 GraphAPIError (중단 후 --resume으로 이어서)
+    """
+    metrics = insights_metrics(media_type)
+
+    path = f"{media_id}/insights"
+    params = {
+        "metric": metrics,
+        "access_token": account.access_token,
+    }
+    try:
+        resp = account.graph.get(path, params=params)
+    except GraphAPIError as e:
+        # 프로필 메트릭 오류 시 기본 메트릭으로 재시도
+        if e.retryable or "profile_visits" not in metrics:
+            return _insights_failed(media_id, e)
+        params["metric"] = BASE_METRICS
+        try:
+            resp = account.graph.get(path, params=params)
+        except GraphAPIError as e:
+            return _insights_failed(media_id, e)
+
+    return parse_insights(resp)
+
+
+def _insights_failed(media_id, error):
+    """재시도 가능한 오류는 그대로 발생, 아니면 경고 후 None"""
+    if error.retryable:
+        raise error
+    print(f"  [주의] 인사이트 오류 ({media_id}): {error.message} → 이 게시물은 건너뜀")
+    return None
+
+
+def graph_batch(account, relative_urls):
+    """Graph batch 요청 1회로 GET 하위 요청 여러 개 실행
+
+    → 하위 응답 목록 (순서 유지, 각 항목은 본문 dict 또는 GraphAPIError)
+    batch 요청 자체가 (GraphClient 재시도 후에도) 실패하면 GraphAPIError 발생
+    """
+    batch = [{"method": "GET", "relative_url": rel} for rel in relative_urls]
+    resp = account.graph.post("", data={
+        "access_token": account.access_token,
+        "batch": json.dumps(batch),
+        "include_headers": "false",
+    })
+
+    bodies = []
+    for item in resp:
+        # 처리되지 못한 하위 요청은 null로 돌아옴 → 다시 보내면 되는 오류
+        if not item:
+            bodies.append(GraphAPIError("batch 하위 요청 미처리", transient=True))
+            continue
+        try:
+            body = json.loads(item.get("body") or "{}")
+        except ValueError:
+            body = None
+        error = parse_graph_error(body, item.get("code"))
+        if error is None and body is None:
+            error = GraphAPIError(f"batch 응답 파싱 실패 (HTTP {item.get('code')})", status=item.get("code"))
+        bodies.append(error or body)
+    return bodies
+
+
+def graph_batch_retrying(account, relative_urls):
+    """graph_batch + 재시도 가능한 하위 요청(호출 한도 / 5xx / 미처리)만 모아 다음 batch로 다시 요청
+
+    대기 시간은 GraphClient와 같은 백오프, 횟수도 GRAPH_MAX_RETRIES까지.
+    그래도 남은 재시도 가능 오류는 GraphAPIError로 발생 (받은 결과는 기록에 남으므로 --resume으로 이어서)
+    """
+    graph = account.graph
+    bodies = graph_batch(account, relative_urls)
+    for attempt in range(graph.max_retries + 1):
+        pending = [i for i, body in enumerate(bodies) if isinstance(body, GraphAPIError) and body.retryable]
+        if not pending:
+            return bodies
+        if attempt == graph.max_retries:
+            raise bodies[pending[0]]
+        if graph.metrics:
+            graph.metrics.record_retry()
+        message = f"  [batch 재시도 {attempt + 1}/{graph.max_retries}] 하위 요청 {len(pending)}개 ({bodies[pending[0]].message})"
+        if graph.throttle and graph.throttle.pause_remaining() > 0:
+            print(f"{message} → 접근 재개 후")
+        else:
+            delay = graph.backoff_delay(attempt)
+            print(f"{message} → {delay:.1f}초 후")
+            time.sleep(delay)
+        for i, body in zip(pending, graph_batch(account, [relative_urls[i] for i in pending])):
+            bodies[i] = body
+    return bodies
+
+
+def get_media_insights_batch(account, media_chunk):
+    """게시물 최대 50개의 인사이트를 batch 요청으로 가져오기 (get_media_insights와 같은 결과, 건너뛸 게시물은 None)"""
+    metrics_list = [insights_metrics(m.get("media_type", "")) for m in media_chunk]
+    bodies = graph_batch_retrying(account, [
+        f"{m['id']}/insights?metric={metrics}" for m, metrics in zip(media_chunk, metrics_list)
+    ])
+
+    results = [None] * len(media_chunk)
+    retry = []  # 프로필 메트릭 오류 → 기본 메트릭으로 재시도할 인덱스
+    for i, body in enumerate(bodies):
+        if not isinstance(body, GraphAPIError):
+            results[i] = parse_insights(body)
+        elif "profile_visits" in metrics_list[i]:
+            retry.append(i)
+        else:
+            _insights_failed(media_chunk[i]["id"], body)
+
+    if retry:
+        bodies = graph_batch_retrying(account, [f"{media_chunk[i]['id']}/insights?metric={BASE_METRICS}" for i in retry])
+        for i, body in zip(retry, bodies):
+            if isinstance(body, GraphAPIError):
+                _insights_failed(media_chunk[i]["id"], body)
+            else:
+                results[i] = parse_insights(body)
+
+    return results
+
+
+def get_account_info(account):
     """계정 팔로워 수 가져오기"""
-    url = f"{BASE_URL}/{INSTAGRAM_BUSINESS_ACCOUNT_ID}"
     params = {
         "fields": "followers_count,follows_count,media_count,username",
-        "access_token": ACCESS_TOKEN,
+        "access_token": account.access_token,
     }
-    resp = requests.get(url, params=params).json()
-    if "error" in resp:
-        print(f"[오류] 계정 정보: {resp['error']['message']}")
+    try:
+        return account.graph.get(account.ig_id, params=params)
+    except GraphAPIError as e:
+        print(f"[오류] 계정 정보: {e.message}")
         return {}
-    return resp
 
 
 # ─── 카테고리 자동 분류 ────────────────────────────────────
@@ -203,29 +483,45 @@ CATEGORY_KEYWORDS = {
 }
 
 
+# 키워드 사전은 import 시 한 번만 오토마톤으로 컴파일 → 캡션당 한 번 훑어서 카테고리별 매칭 횟수 계산
+CATEGORY_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS)
+
+
+def category_scores(caption):
+    """캡션 → {카테고리: 키워드 매칭 횟수} (다중 라벨 분류용)"""
+    return CATEGORY_MATCHER.counts(caption)
+
+
 def classify_category(caption):
-    """캡션 전체를 분석하여 카테고리 자동 분류"""
+    """캡션 전체를 분석하여 카테고리 자동 분류
+
+    키워드가 가장 많이 등장한 카테고리 (동점이면 CATEGORY_KEYWORDS 순서가 앞선 쪽, 매칭이 없으면 기타)
+    """
     if not caption:
         return "기타"
-    text = caption.lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in text:
-                return category
-    return "기타"
+    return CATEGORY_MATCHER.best(caption, default="기타")
 
 
-def format_date_ko(timestamp_str):
-    """ISO 타임스탬프 → 한국어 날짜 (예: 26.01.24(토))"""
+def parse_timestamp(timestamp_str):
+    """ISO 타임스탬프 → datetime (파싱 실패 시 None)"""
     if not timestamp_str:
-        return ""
+        return None
     try:
-        dt = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S%z")
+        return datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S%z")
     except ValueError:
         try:
-            dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
         except ValueError:
-            return timestamp_str[:10]
+            return None
+
+
+def format_date_ko(timestamp_str):
+    """ISO 타임스탬프 → 한국어 날짜 (예: 26.01.24(토))"""
+    if not timestamp_str:
+        return ""
+    dt = parse_timestamp(timestamp_str)
+    if dt is None:
+        return timestamp_str[:10]
     weekday = WEEKDAYS_KO[dt.weekday()]
     return f"{dt.strftime('%y.%m.%d')}({weekday})"
 
@@ -238,121 +534,258 @@ def now_date_ko():
     return f"{now.strftime('%y.%m.%d')}({WEEKDAYS_KO[now.weekday()]})"
 
 
-def collect_all_insights(limit=500):
-    """모든 게시물의 인사이트 수집"""
-    print("Instagram 게시물 목록 가져오는 중...")
-    media_list = get_all_media(limit)
-    print(f"  총 {len(media_list)}개 게시물 발견")
+def today_kst():
+    """현재 날짜 (date, 한국 시간 기준)"""
+    from datetime import timezone, timedelta
+    KST = timezone(timedelta(hours=9))
+    return datetime.now(KST).date()
+
+
+def media_age_days(media, today):
+    """업로드 후 경과 일수 (타임스탬프가 없으면 0)"""
+    dt = parse_timestamp(media.get("timestamp", ""))
+    if dt is None or dt.tzinfo is None:
+        return 0
+    from datetime import timezone, timedelta
+    return (today - dt.astimezone(timezone(timedelta(hours=9))).date()).days
+
+
+def build_row(media, insights, followers, username, check_date, analysis=None):
+    """게시물 1건 + 인사이트 → 시트 한 행 (A~X열)
+
+    analysis: 캡션 분석 결과 (없으면 여기서 분석)
+    """
+    media_type = media.get("media_type", "")
+
+    # 캡션 → 제목(한글/영문 텍스트가 포함된 첫 줄, 최대 80자) + 카테고리 자동 분류
+    if analysis is None:
+        analysis = analyze_caption(media.get("caption", ""), CATEGORY_MATCHER)
+    title = analysis["title"]
+    category = analysis["category"]
+
+    # 지표
+    reach = insights.get("reach", 0)
+    views = insights.get("views", 0)
+    likes = insights.get("likes", media.get("like_count", 0))
+    saves = insights.get("saved", 0)
+    shares = insights.get("shares", 0)
+    comments = insights.get("comments", media.get("comments_count", 0))
+    total_interactions = insights.get("total_interactions", 0)
+    # VIDEO/REEL은 API에서 프로필 메트릭 미지원 → 빈칸 처리
+    if media_type == "VIDEO":
+        profile_visits = ""
+        profile_activity = ""
+        follows = ""
+    else:
+        profile_visits = insights.get("profile_visits", 0)
+        profile_activity = insights.get("profile_activity", 0)
+        follows = insights.get("follows", 0)
+
+    # 계산 지표
+    engagement_count = likes + saves + comments + shares
+    engagement_rate = round(engagement_count / reach * 100, 1) if reach > 0 else 0
+    save_rate = round(saves / reach * 100, 1) if reach > 0 else 0
+    share_rate = round(shares / reach * 100, 1) if reach > 0 else 0
+    follower_conversion = round(reach / followers * 100, 1) if followers > 0 else 0
+
+    # 링크에 하이퍼링크 수식 적용
+    # 릴스(VIDEO)는 /username/reel/코드/ 형식으로 변환 (탐색피드 리다이렉트 방지)
+    permalink = media.get("permalink", "")
+    if media_type == "VIDEO" and username:
+        # /p/코드/ 또는 /reel/코드/ → /username/reel/코드/ 로 변환
+        m_sc = re.search(r'/(?:p|reel)/([A-Za-z0-9_-]+)', permalink)
+        if m_sc:
+            shortcode = m_sc.group(1)
+            permalink = f"https://www.instagram.com/{username}/reel/{shortcode}/"
+    hyperlink = f'=HYPERLINK("{permalink}","보기")' if permalink else ""
+
+    return [
+        format_date_ko(media.get("timestamp", "")),  # A: 업로드 일자
+        check_date,                                     # B: 체크 일자
+        media_type,                                     # C: 콘텐츠 유형
+        "",                                             # D: 순위 (나중에 계산)
+        category,                                       # E: 카테고리 (자동분류)
+        title,                                          # F: 콘텐츠 제목
+        hyperlink,                                      # G: 링크 (하이퍼링크)
+        reach,                                          # H: 도달
+        views,                                          # I: 노출(Views)
+        likes,                                          # J: 좋아요
+        saves,                                          # K: 저장
+        shares,                                         # L: 공유
+        comments,                                       # M: 댓글
+        total_interactions,                             # N: 총 상호작용
+        engagement_count,                               # O: 참여수
+        f"{engagement_rate}%",                          # P: 참여율(%)
+        f"{save_rate}%",                                # Q: 저장율(%)
+        f"{share_rate}%",                               # R: 공유율(%)
+        f"{follower_conversion}%",                      # S: 팔로워 대비 도달율(%)
+        profile_visits,                                 # T: 프로필 방문 (API)
+        profile_activity,                               # U: 외부링크 누름 (API)
+        follows,                                        # V: 팔로우 (API)
+        followers,                                      # W: 팔로워 수
+        "",                                             # X: 종합점수 (나중에 계산)
+    ]
+
 
-    account = get_account_info()
-    followers = account.get("followers_count", 0)
-    following = account.get("follows_count", 0)
-    username = account.get("username", "")
+def collect_all_insights(account, limit=None, workers=None, mode=None, journal=None):
+    """모든 게시물의 인사이트 수집 (limit=None이면 전체 게시물)
+
+    게시물 목록 → 인사이트 → 행 생성을 스트리밍으로 연결한다.
+      - 목록은 별도 스레드에서 페이지 단위로 받아 최대 PIPELINE_QUEUE_PAGES페이지까지 미리 쌓아 두고
+      - 첫 페이지가 오는 대로 인사이트 요청 시작 (동시에 진행 중인 요청 묶음은 workers × 2개 이하)
+      - 목록 순서대로 행을 만들고, 스냅샷 DB에는 SNAPSHOT_FLUSH_ROWS행씩 나눠서 저장
+    게시물·인사이트 원본은 행을 만든 뒤 버리므로 게시물 수에 비례해 남는 것은 결과 행뿐이다.
+
+    workers > 1이면 스레드 풀로 인사이트를 동시에 가져오고,
+    요청 간격·동시 요청 수는 계정의 Graph 클라이언트(속도 제한기 / 자동 조절)가 정한다 (결과 행 순서는 목록 순서 그대로).
+    mode="batch"이면 게시물 50개씩 Graph batch 요청 1회로 묶어서 가져오고,
+    mode="inline"이면 목록 요청에 중첩된 인사이트를 쓰고 누락·실패한 게시물만 개별 요청한다.
+    수렴 추적이 켜져 있으면 재수집 주기가 아닌 게시물은 지난번 인사이트를 그대로 쓴다.
+    journal(CollectJournal)이 있으면 새로 받은 인사이트를 받는 대로 기록하고, 이어서 하는 실행이면 기록된 게시물은 요청하지 않는다.
+    """
+    if workers is None:
+        # 자동 조절 시에는 상한만큼 스레드를 두고 실제 동시 요청 수는 throttle이 제한
+        throttle = account.graph.throttle
+        workers = throttle.max_concurrency if throttle else INSIGHTS_WORKERS
+    if mode is None:
+        mode = INSIGHTS_FETCH_MODE
+
+    with run_metrics.stage(account.metrics, "media_listing"):
+        info = get_account_info(account)
+    followers = info.get("followers_count", 0)
+    following = info.get("follows_count", 0)
+    username = info.get("username", "")
     print(f"  현재 팔로워: {followers:,}명 | 팔로잉: {following:,}명")
 
     check_date = now_date_ko()
-
-    results = []
-    for i, media in enumerate(media_list):
-        media_id = media["id"]
-        media_type = media.get("media_type", "")
-        print(f"  [{i+1}/{len(media_list)}] 인사이트 수집: {media_type} - {media_id}")
-
-        insights = get_media_insights(media_id, media_type)
-        time.sleep(0.3)
-
-        # 캡션에서 제목 추출 (한글/영문 텍스트가 포함된 첫 줄, 최대 80자)
-        caption = media.get("caption", "") or ""
-        if caption:
-            lines = [l.strip() for l in caption.split("\n") if l.strip()]
-            title = ""
-            for line in lines:
-                # 한글, 영문, 숫자가 포함된 줄 찾기 (이모지만 있는 줄 건너뛰기)
-                text_only = re.sub(r'[^\w\s가-힣a-zA-Z0-9]', '', line).strip()
-                if text_only and len(text_only) >= 2:
-                    title = line[:80]
-                    break
-            # 텍스트 줄을 못 찾으면 첫 줄 사용
-            if not title and lines:
-                title = lines[0][:80]
-        else:
-            title = "(캡션 없음)"
-
-        # 지표
-        reach = insights.get("reach", 0)
-        views = insights.get("views", 0)
-        likes = insights.get("likes", media.get("like_count", 0))
-        saves = insights.get("saved", 0)
-        shares = insights.get("shares", 0)
-        comments = insights.get("comments", media.get("comments_count", 0))
-        total_interactions = insights.get("total_interactions", 0)
-        # VIDEO/REEL은 API에서 프로필 메트릭 미지원 → 빈칸 처리
-        if media_type == "VIDEO":
-            profile_visits = ""
-            profile_activity = ""
-            follows = ""
+    today = today_kst()
+
+    # 수렴 추적: 재수집 주기가 아닌 게시물은 지난번 인사이트 재사용
+    tracker = None
+    if CONVERGENCE_TRACKING:
+        tracker = ConvergenceTracker(
+            account.state_path("convergence.json"),
+            history=CONVERGENCE_HISTORY,
+            tolerance=CONVERGENCE_TOLERANCE,
+            stable_runs=CONVERGENCE_STABLE_RUNS,
+            min_age_days=CONVERGENCE_MIN_AGE_DAYS,
+        )
+    # 캡션 분석: (게시물 ID, 캡션)이 그대로면 캐시된 결과 사용
+    analyzer = CaptionAnalyzer(CATEGORY_MATCHER, account.state_path("captions.json") if CAPTION_CACHE else None)
+    counts = {"inline": 0, "resumed": 0, "reused": 0}
+
+    def listing():
+        # prefetch 스레드에서 실행 → 이 스레드의 요청은 게시물 목록 단계로 기록
+        with run_metrics.background_stage(account.metrics, "media_listing"):
+            yield from iter_media_pages(account, limit, inline_insights=(mode == "inline"))
+
+    def units(pages):
+        """게시물 스트림 → 인사이트 요청 단위 [[번호, 게시물, 인사이트, 출처], ...]
+
+        출처: inline(목록에 중첩) / resumed(중단된 실행의 기록) / reused(수렴 추적) / None(요청 필요 → fetched)
+
+        요청이 필요한 게시물이 batch 모드는 50개, 그 외는 1개 모일 때마다 내보냄
+        (요청이 필요 없는 게시물은 사이에 그대로 끼워서 목록 순서 유지)
+        """
+        unit_size = GRAPH_BATCH_SIZE if mode == "batch" else 1
+        unit, pending, index = [], 0, 0
+        for page in pages:
+            for media in page:
+                insights = inline_insights(media) if mode == "inline" else None
+                source = "inline"
+                if insights is None and journal:
+                    insights, source = journal.get(media["id"]), "resumed"
+                if insights is None and tracker and not tracker.is_due(media["id"], today):
+                    insights, source = tracker.cached_insights(media["id"]), "reused"
+                if insights is None:
+                    source = None
+                else:
+                    counts[source] += 1
+                unit.append([index, media, insights, source])
+                index += 1
+                if insights is None:
+                    pending += 1
+                    if pending == unit_size:
+                        yield unit
+                        unit, pending = [], 0
+        if unit:
+            yield unit
+
+    def fetch_unit(unit):
+        todo = [entry for entry in unit if entry[2] is None]
+        if not todo:
+            return unit
+        if mode == "batch":
+            print(f"  [{todo[0][0]+1}-{todo[-1][0]+1}] 인사이트 batch 수집 ({len(todo)}개)")
+            fetched = get_media_insights_batch(account, [entry[1] for entry in todo])
         else:
-            profile_visits = insights.get("profile_visits", 0)
-            profile_activity = insights.get("profile_activity", 0)
-            follows = insights.get("follows", 0)
-
-        # 계산 지표
-        engagement_count = likes + saves + comments + shares
-        engagement_rate = round(engagement_count / reach * 100, 1) if reach > 0 else 0
-        save_rate = round(saves / reach * 100, 1) if reach > 0 else 0
-        share_rate = round(shares / reach * 100, 1) if reach > 0 else 0
-        follower_conversion = round(reach / followers * 100, 1) if followers > 0 else 0
-
-        # 링크에 하이퍼링크 수식 적용
-        # 릴스(VIDEO)는 /username/reel/코드/ 형식으로 변환 (탐색피드 리다이렉트 방지)
-        permalink = media.get("permalink", "")
-        if media_type == "VIDEO" and username:
-            # /p/코드/ 또는 /reel/코드/ → /username/reel/코드/ 로 변환
-            m_sc = re.search(r'/(?:p|reel)/([A-Za-z0-9_-]+)', permalink)
-            if m_sc:
-                shortcode = m_sc.group(1)
-                permalink = f"https://www.instagram.com/{username}/reel/{shortcode}/"
-        hyperlink = f'=HYPERLINK("{permalink}","보기")' if permalink else ""
-
-        # 종합점수: 공유(30%) + 저장(25%) + 도달(25%) + 참여율(20%) 정규화 점수
-        # 팔로워 성장 최적화 가중치 (바이럴·알고리즘 추천 중심)
-        # (순위는 write_to_sheet에서 전체 데이터 기준으로 계산)
-        composite_raw = {
-            "shares": shares,
-            "saves": saves,
-            "reach": reach,
-            "engagement_rate": engagement_rate,
-        }
-
-        # 캡션 전체로 카테고리 자동 분류
-        category = classify_category(caption)
-
-        results.append([
-            format_date_ko(media.get("timestamp", "")),  # A: 업로드 일자
-            check_date,                                     # B: 체크 일자
-            media_type,                                     # C: 콘텐츠 유형
-            "",                                             # D: 순위 (나중에 계산)
-            category,                                       # E: 카테고리 (자동분류)
-            title,                                          # F: 콘텐츠 제목
-            hyperlink,                                      # G: 링크 (하이퍼링크)
-            reach,                                          # H: 도달
-            views,                                          # I: 노출(Views)
-            likes,                                          # J: 좋아요
-            saves,                                          # K: 저장
-            shares,                                         # L: 공유
-            comments,                                       # M: 댓글
-            total_interactions,                             # N: 총 상호작용
-            engagement_count,                               # O: 참여수
-            f"{engagement_rate}%",                          # P: 참여율(%)
-            f"{save_rate}%",                                # Q: 저장율(%)
-            f"{share_rate}%",                               # R: 공유율(%)
-            f"{follower_conversion}%",                      # S: 팔로워 대비 도달율(%)
-            profile_visits,                                 # T: 프로필 방문 (API)
-            profile_activity,                               # U: 외부링크 누름 (API)
-            follows,                                        # V: 팔로우 (API)
-            followers,                                      # W: 팔로워 수
-            composite_raw,                                  # X: 종합점수 (나중에 계산)
-        ])
+            fetched = []
+            for index, media, _, _ in todo:
+                media_type = media.get("media_type", "")
+                print(f"  [{index+1}] 인사이트 수집: {media_type} - {media['id']}")
+                fetched.append(get_media_insights(account, media["id"], media_type))
+        for entry, insights in zip(todo, fetched):
+            entry[2], entry[3] = insights, "fetched"
+            if journal:
+                journal.record(entry[1]["id"], insights)
+        return unit
+
+    print("Instagram 게시물 목록 + 인사이트 수집 중...")
+    results, media_ids, unsaved, saved, skipped = [], [], [], 0, 0
+    store = SnapshotStore(account.state_path("snapshots.sqlite3")) if SNAPSHOT_STORE else None
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with run_metrics.stage(account.metrics, "insights"), closing(prefetch(listing(), PIPELINE_QUEUE_PAGES)) as pages:
+            for unit in ordered_map(fetch_unit, units(pages), pool, window=workers * 2):
+                for _, media, insights, source in unit:
+                    media_ids.append(media["id"])
+                    if insights is None:
+                        # 인사이트를 받을 수 없는 게시물 (오류 출력은 수집 쪽에서) → 0으로 채운 행을 만들지 않음
+                        skipped += 1
+                        continue
+                    if tracker and source != "reused":
+                        tracker.record(media["id"], insights, today, media_age_days(media, today))
+                    analysis = analyzer.analyze(media["id"], media.get("caption", ""))
+                    row = build_row(media, insights, followers, username, check_date, analysis)
+                    results.append(row)
+                    # 게시물별 일별 스냅샷 (시트는 매일 덮어쓰므로 이력은 여기에만 남음)
+                    # 수렴 추적으로 재사용한 값은 예전 날짜의 인사이트 → 오늘 날짜로 저장하지 않음 (다시 요청한 날에만 기록)
+                    if store and source != "reused":
+                        unsaved.append((media, row))
+                        if len(unsaved) >= SNAPSHOT_FLUSH_ROWS:
+                            saved += store.record_rows(today.isoformat(), *zip(*unsaved))
+                            unsaved = []
+
+        print(f"  총 {len(results)}개 게시물 처리")
+        if skipped:
+            print(f"  ⚠️ 인사이트 오류로 {skipped}개 게시물 제외 (0으로 기록하지 않음)")
+        if mode == "inline":
+            print(f"  인라인 인사이트: {counts['inline']}개 완료, {len(results) - counts['inline']}개 추가 요청")
+        if counts["resumed"]:
+            print(f"  이어서 수집: 중단된 실행에서 받은 {counts['resumed']}개 게시물은 요청 생략")
+
+        # 수렴 추적 / 캡션 캐시 정리 + 남은 스냅샷 저장
+        with run_metrics.stage(account.metrics, "rows"):
+            if tracker:
+                print(f"  수렴 추적: {counts['reused']}개 게시물은 이전 인사이트 재사용")
+                tracker.prune(media_ids)
+                tracker.save()
+                tiers = tracker.tier_counts()
+                print(f"  수집 주기: 매일 {tiers['daily']}개 / 매주 {tiers['weekly']}개 / 매월 {tiers['monthly']}개")
+
+            analyzer.prune(media_ids)
+            analyzer.save()
+            print(f"  캡션 분석: {analyzer.misses}개 새로 분석, {analyzer.hits}개 캐시 사용")
+
+            if store:
+                if unsaved:
+                    saved += store.record_rows(today.isoformat(), *zip(*unsaved))
+                print(f"  스냅샷 저장: {saved}개 게시물 ({today.isoformat()})")
+    finally:
+        if pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if store:
+            store.close()
 
     return results, followers, following
 
@@ -387,8 +820,23 @@ HEADERS = [
 ]
 
 
-def get_sheet():
-    """Google Sheets 연결"""
+# 이번 실행에서 쓰는 시트 (한 번의 읽기로 모두 가져옴)
+SHEET_TITLES = ["자동수집", "팔로워추적", "일별종합리포트"]
+
+_gspread_client = None
+_gspread_lock = threading.Lock()
+
+
+def get_gspread_client():
+    """Google 인증 (실행 중 한 번만, 모든 계정이 공유)"""
+    global _gspread_client
+    with _gspread_lock:
+        if _gspread_client is None:
+            _gspread_client = _authorize()
+    return _gspread_client
+
+
+def _authorize():
     scopes = [
         "https://www.googleapis.com/auth/spreadsheets",
         "https://www.googleapis.com/auth/drive",
@@ -397,34 +845,133 @@ def get_sheet():
     # 로컬: google_credentials.json 파일에서 로드
     google_creds_json = os.environ.get("GOOGLE_CREDENTIALS_JSON")
     if google_creds_json:
-        import json
         info = json.loads(google_creds_json)
         creds = Credentials.from_service_account_info(info, scopes=scopes)
     else:
         creds_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), GOOGLE_CREDENTIALS_FILE)
         creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
     client = gspread.authorize(creds)
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
-    return spreadsheet
-
-
-def write_to_sheet(results):
-    """Google Sheets '자동수집' 시트에 전체 데이터 덮어쓰기"""
-    print("\nGoogle Sheets 연결 중...")
-    spreadsheet = get_sheet()
-
+    # 계정 스레드마다 activate()한 RunMetrics에 Sheets 호출 기록
+    run_metrics.install_session_hook(client.http_client.session, run_metrics.active)
+    return client
+
+
+def get_sheet(account):
+    """계정의 스프레드시트 열기 (실행 중 한 번만 열고 재사용)"""
+    if account.spreadsheet is None:
+        account.spreadsheet = get_gspread_client().open_by_key(account.spreadsheet_id)
+    return account.spreadsheet
+
+
+def _same_cell(new, old):
+    """새로 쓸 값과 시트의 기존 값(FORMULA 렌더링)이 같은지
+
+    USER_ENTERED로 쓴 값은 시트에서 변환되어 돌아오므로 ('5.2%' → 0.052, '123' → 123) 숫자로 맞춰 비교
+    """
+    if old is None:
+        old = ""
+    if isinstance(new, bool) or isinstance(old, bool):
+        return new == old
+    if isinstance(old, (int, float)):
+        if isinstance(new, str):
+            text = new.replace(",", "").strip()
+            scale = 1
+            if text.endswith("%"):
+                text, scale = text[:-1], 100
+            try:
+                new = float(text) / scale
+            except ValueError:
+                return False
+        if isinstance(new, (int, float)):
+            return abs(new - old) <= 1e-9 * max(1, abs(old))
+        return False
+    return str(new) == str(old)
+
+
+def diff_ranges(old_grid, new_grid, max_gap=2):
+    """기존 그리드 → 새 그리드로 바꾸는 데 필요한 최소 쓰기 범위 목록
+
+    → [(시작 행, 시작 열, 2차원 값), ...] (0-based)
+    - 행마다 바뀐 칸을 연속 구간으로 묶고 (max_gap칸 이하 틈은 합쳐서 범위 수 감소)
+    - 같은 열 구간이 연속된 행끼리는 하나의 범위로 합침 (한 행에 구간이 여러 개여도 열 구간별로)
+    - 새 그리드 밖에 남은 기존 값은 빈칸으로 덮어씀 (clear() 대체)
+    """
+    height = max(len(old_grid), len(new_grid))
+    width = max([len(r) for r in old_grid] + [len(r) for r in new_grid] + [0])
+
+    row_spans = []  # (행, 시작 열, 끝 열(미포함), 값)
+    for r in range(height):
+        old_row = old_grid[r] if r < len(old_grid) else []
+        new_row = new_grid[r] if r < len(new_grid) else []
+        new_row = list(new_row) + [""] * (width - len(new_row))
+        changed = [
+            c for c in range(width)
+            if not _same_cell(new_row[c], old_row[c] if c < len(old_row) else "")
+        ]
+        if not changed:
+            continue
+        start = prev = changed[0]
+        for c in changed[1:] + [None]:
+            if c is not None and c - prev <= max_gap + 1:
+                prev = c
+                continue
+            row_spans.append((r, start, prev + 1, new_row[start:prev + 1]))
+            if c is not None:
+                start = prev = c
+
+    ranges = []
+    open_ranges = {}  # (시작 열, 끝 열) → 그 열 구간의 마지막 범위
+    for r, c0, c1, values in row_spans:
+        last = open_ranges.get((c0, c1))
+        if last and last[0] + len(last[2]) == r:
+            last[2].append(values)
+        else:
+            open_ranges[(c0, c1)] = (r, c0, [values])
+            ranges.append(open_ranges[(c0, c1)])
+    return ranges
+
+
+def chunk_ranges(ranges, max_cells):
+    """diff_ranges 결과를 요청 1회당 max_cells 이하로 묶음 (큰 범위는 행 단위로 잘라서 나눔)"""
+    chunk, cells = [], 0
+    for r, c, values in ranges:
+        width = len(values[0])
+        step = max(1, max_cells // width)
+        for i in range(0, len(values), step):
+            part = values[i:i + step]
+            size = len(part) * width
+            if chunk and cells + size > max_cells:
+                yield chunk
+                chunk, cells = [], 0
+            chunk.append((r + i, c, part))
+            cells += size
+    if chunk:
+        yield chunk
+
+
+def write_to_sheet(account, results, snapshot=None):
+    """Google Sheets '자동수집' 시트에 전체 데이터 기록 → 기록한 전체 행 반환
+
+    기존 값과 비교해서 바뀐 범위만 values.batchUpdate 1회로 전송 (시트를 비우지 않음)
+    snapshot: 미리 읽어 둔 SheetSnapshot (없으면 이 시트만 읽음)
+    """
     sheet_name = "자동수집"
-    try:
-        worksheet = spreadsheet.worksheet(sheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=30)
+    if snapshot is None:
+        print("\nGoogle Sheets 연결 중...")
+        snapshot = SheetSnapshot(get_sheet(account), [sheet_name])
+    spreadsheet = snapshot.spreadsheet
+
+    if not snapshot.has(sheet_name):
+        # 게시물 수 + TOTAL·평균 행이 들어가는 크기로 생성
+        snapshot.add(spreadsheet.add_worksheet(
+            title=sheet_name, rows=len(results) + 3 + GRID_ROW_HEADROOM, cols=30
+        ))
 
     # 수기 입력 데이터 보존 (카테고리 + 제목)
     # 매칭 키: permalink URL (HYPERLINK 수식에서 추출) — 표시값("보기")이 아닌 실제 URL로 매칭
     # T/U/V열(프로필방문, 프로필활동, 팔로우)은 API에서 자동 수집하므로 보존 불필요
-    existing = worksheet.get_all_values()
-    # G열을 FORMULA로 읽어서 실제 permalink URL 추출
-    existing_formulas = worksheet.get('G1:G500', value_render_option='FORMULA')
+    # 스냅샷의 FORMULA 값 → G열에서 실제 permalink URL 추출 + 변경분 비교에 사용
+    existing = snapshot.formulas(sheet_name)
     manual_data = {}  # permalink URL -> {category, title}
     if len(existing) > 1:
         header = existing[0]
@@ -432,7 +979,7 @@ def write_to_sheet(results):
         cat_idx = header.index("카테고리") if "카테고리" in header else 4
         for i, row in enumerate(existing[1:], start=1):
             # FORMULA에서 permalink URL 추출
-            formula = existing_formulas[i][0] if i < len(existing_formulas) and existing_formulas[i] else ""
+            formula = str(row[6]) if len(row) > 6 else ""
             m = re.search(r'instagram\.com/(?:p|reel|[^/]+/reel)/([A-Za-z0-9_-]+)', formula)
             if m:
                 shortcode = m.group(1)
@@ -456,40 +1003,12 @@ def write_to_sheet(results):
                 if md["title"]:
                     row[5] = md["title"]     # 수정된 제목 유지
 
-    # ─── 종합점수 계산 (정규화 후 가중합) ─────────────
-    # 팔로워 성장 최적화: 공유(30%) + 저장(25%) + 도달(25%) + 참여율(20%)
-    # X열(index 23) = 종합점수
-    raw_scores = [r[23] for r in results if isinstance(r[23], dict)]
-    if raw_scores:
-        max_shares = max(s["shares"] for s in raw_scores) or 1
-        max_saves = max(s["saves"] for s in raw_scores) or 1
-        max_reach = max(s["reach"] for s in raw_scores) or 1
-        max_eng_rate = max(s["engagement_rate"] for s in raw_scores) or 1
-
-        for row in results:
-            if isinstance(row[23], dict):
-                s = row[23]
-                score = (
-                    (s["shares"] / max_shares) * 30 +
-                    (s["saves"] / max_saves) * 25 +
-                    (s["reach"] / max_reach) * 25 +
-                    (s["engagement_rate"] / max_eng_rate) * 20
-                )
-                row[23] = round(score, 1)
-            else:
-                row[23] = 0
-
-        # 순위 계산 (종합점수 높은 순) → D열(index 3)에 입력
-        scored = [(i, r[23]) for i, r in enumerate(results)]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        for rank, (idx, _) in enumerate(scored, 1):
-            results[idx][3] = rank
-
-    # 전체 시트 초기화 후 새로 쓰기
-    worksheet.clear()
+    # ─── 종합점수 + 순위 계산 (정규화 후 가중합, scoring.py) ─────
+    # 기본 가중치 = 팔로워 성장 최적화: 공유(30%) + 저장(25%) + 도달(25%) + 참여율(20%)
+    # X열(index 23) = 종합점수, D열(index 3) = 순위 (종합점수 높은 순)
+    score_rows(results, SCORE_WEIGHTS)
 
     all_data = [HEADERS] + results
-    worksheet.update(range_name="A1", values=all_data, value_input_option="USER_ENTERED")
 
     # TOTAL, 평균 행 추가
     data_count = len(results)
@@ -517,22 +1036,124 @@ def write_to_sheet(results):
             col_letter = chr(ord("A") + col_idx) if col_idx < 26 else ""
             avg_row.append(f"=AVERAGE({col_letter}2:{col_letter}{last_data_row})")
 
-        worksheet.update(range_name=f"A{total_row_num}", values=[total_row, avg_row], value_input_option="USER_ENTERED")
+        all_data += [total_row, avg_row]
+
+    # 게시물 행을 shortcode 기준으로 맞춤: 사라진 게시물 행 삭제 + 맨 위 새 게시물만큼 행 삽입
+    # → 나머지 기존 행은 시트 안에서 통째로 옮겨져 다시 쓰지 않음 (새 게시물 때문에 전체가 한 칸씩 밀리는 diff 방지)
+    deleted, inserted = row_alignment(existing, all_data)
+    if deleted or inserted:
+        snapshot.realign_rows(sheet_name, deleted, inserted)
+        existing = snapshot.formulas(sheet_name)
+        print(f"  행 맞춤: 새 게시물 {inserted}개 행 삽입, 사라진 게시물 {len(deleted)}개 행 삭제")
+
+    # 기존 값과 다른 범위만 전송 (clear() + 전체 재작성 대체)
+    # 시트보다 행이 많아지면 먼저 시트를 늘림 (크기를 넘는 쓰기는 400 오류)
+    ranges = diff_ranges(existing, all_data)
+    if ranges:
+        snapshot.ensure_grid(sheet_name, len(all_data), len(HEADERS))
+    chunks = list(chunk_ranges(ranges, SHEETS_WRITE_CHUNK_CELLS))
+    for chunk in chunks:
+        spreadsheet.values_batch_update({
+            "valueInputOption": "USER_ENTERED",
+            "data": [
+                {
+                    "range": gspread.utils.absolute_range_name(
+                        sheet_name,
+                        f"{gspread.utils.rowcol_to_a1(r + 1, c + 1)}:"
+                        f"{gspread.utils.rowcol_to_a1(r + len(values), c + len(values[0]))}",
+                    ),
+                    "values": values,
+                }
+                for r, c, values in chunk
+            ],
+        })
+    changed_cells = sum(len(values) * len(values[0]) for _, _, values in ranges)
+    print(f"  변경분 기록: {len(ranges)}개 범위, {changed_cells:,}개 셀 전송 (요청 {len(chunks)}회)")
 
     print(f"✅ {data_count}개 게시물 데이터를 '{sheet_name}' 시트에 기록했습니다.")
+    return all_data
 
 
-def write_follower_tracking(spreadsheet, followers, following):
-    """'팔로워 추적' 시트에 일별 팔로워 수 기록 (누적)"""
-    sheet_name = "팔로워추적"
+def _data_shortcodes(grid):
+    """그리드의 게시물 행(헤더 다음 ~ TOTAL/평균 행 전) → G열 링크의 shortcode 목록"""
+    codes = []
+    for row in grid[1:]:
+        if len(row) > 5 and row[5] in ("TOTAL", "평균"):
+            break
+        codes.append(shortcode(str(row[6])) if len(row) > 6 else None)
+    return codes
+
+
+def row_alignment(old_grid, new_grid):
+    """기존 게시물 행을 새 그리드 위치에 맞추는 방법 → (삭제할 기존 행 번호 목록, 헤더 다음에 삽입할 행 수)
+
+    새 게시물이 맨 위에만 추가되고 나머지 게시물 순서가 그대로일 때만 (사라진 게시물은 삭제),
+    그 외(순서 변경·링크 없는 행 등)는 ([], 0) → 값 비교 diff로만 기록
+    """
+    old_codes, new_codes = _data_shortcodes(old_grid), _data_shortcodes(new_grid)
+    if not old_codes or None in old_codes or None in new_codes:
+        return [], 0
+    old_set, new_set = set(old_codes), set(new_codes)
+    inserted = next((i for i, code in enumerate(new_codes) if code in old_set), len(new_codes))
+    kept = [code for code in old_codes if code in new_set]
+    if new_codes[inserted:] != kept:
+        return [], 0
+    deleted = [i + 1 for i, code in enumerate(old_codes) if code not in new_set]
+    return deleted, inserted
+
+
+def record_row_counts(snapshot, grids):
+    """시트별 행 수(헤더 포함)를 개발자 메타데이터에 기록
+
+    format_sheet.py가 셀 값을 내려받지 않고 서식 범위를 정할 수 있도록 남겨 둔다.
+    값이 바뀐 시트만 batchUpdate 1회로 전송
+    """
+    requests_list = []
+    for title, grid in grids.items():
+        if not snapshot.has(title):
+            continue
+        metadata = snapshot.metadata(title)
+        stored = metadata.get(ROW_COUNT_KEY)
+        if stored and stored[1] == str(len(grid)):
+            continue
+        sheet_id = snapshot.sheets[title]["properties"]["sheetId"]
+        requests_list.append(metadata_request(sheet_id, ROW_COUNT_KEY, len(grid), metadata))
+    if requests_list:
+        snapshot.spreadsheet.batch_update({"requests": requests_list})
+
+
+def sheet_number(val):
+    """시트 표시값 → 숫자 ('1,234' → 1234, 변환 불가 시 0)"""
+    if isinstance(val, (int, float)):
+        return val
+    val = str(val).replace(",", "").strip()
     try:
-        worksheet = spreadsheet.worksheet(sheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=6)
-        worksheet.update(range_name="A1", values=[["날짜", "팔로워", "팔로잉", "일일 변화", "누적 변화", "메모"]])
+        return int(val)
+    except ValueError:
+        try:
+            return float(val)
+        except ValueError:
+            return 0
+
+
+def write_follower_tracking(spreadsheet, followers, following, snapshot=None):
+    """'팔로워 추적' 시트에 일별 팔로워 수 기록 (누적)
 
-    # 기존 데이터 확인
-    existing = worksheet.get_all_values()
+    → 기록 후 시트 값 (헤더 포함, 오늘 행의 수식 칸은 계산된 값) — JSON 바로 내보내기용
+    """
+    sheet_name = "팔로워추적"
+    if snapshot is None:
+        snapshot = SheetSnapshot(spreadsheet, [sheet_name])
+    if snapshot.has(sheet_name):
+        worksheet = snapshot.worksheet(sheet_name)
+        # 기존 데이터 확인
+        existing = snapshot.values(sheet_name)
+    else:
+        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=GRID_ROW_HEADROOM, cols=6)
+        snapshot.add(worksheet)
+        header = ["날짜", "팔로워", "팔로잉", "일일 변화", "누적 변화", "메모"]
+        worksheet.update(range_name="A1", values=[header])
+        existing = [header]
     today = now_date_ko()
 
     # 오늘 이미 기록되었으면 업데이트, 아니면 추가
@@ -546,6 +1167,11 @@ def write_follower_tracking(spreadsheet, followers, following):
         # 오늘 데이터 업데이트
         worksheet.update(range_name=f"B{today_row_idx}", values=[[followers, following]])
         print(f"  팔로워 추적: 오늘 데이터 업데이트 ({followers:,}명)")
+        row = list(existing[today_row_idx - 1]) + [""] * 6
+        if today_row_idx > 2:
+            row[3] = followers - sheet_number(existing[today_row_idx - 2][1])
+            row[4] = followers - sheet_number(existing[1][1])
+        existing[today_row_idx - 1] = [today, followers, following] + row[3:6]
     else:
         # 새 행 추가
         new_row_num = len(existing) + 1
@@ -559,17 +1185,31 @@ def write_follower_tracking(spreadsheet, followers, following):
             cumul_change_formula = 0
 
         new_row = [today, followers, following, daily_change_formula, cumul_change_formula, ""]
+        snapshot.ensure_grid(sheet_name, new_row_num, len(new_row))
         worksheet.update(range_name=f"A{new_row_num}", values=[new_row])
         print(f"  팔로워 추적: 새 기록 추가 ({followers:,}명)")
+        if len(existing) > 1:
+            new_row[3] = followers - sheet_number(existing[-1][1])
+            new_row[4] = followers - sheet_number(existing[1][1])
+        existing.append(new_row)
+
+    return existing
 
 
-def write_daily_report(spreadsheet, results, followers, following):
-    """'일별종합리포트' 시트에 매일 전체 수치 요약 기록"""
+def write_daily_report(spreadsheet, results, followers, following, snapshot=None):
+    """'일별종합리포트' 시트에 매일 전체 수치 요약 기록
+
+    → 기록 후 시트 값 (헤더 포함, 오늘 행의 수식 칸은 계산된 값) — JSON 바로 내보내기용
+    """
     sheet_name = "일별종합리포트"
-    try:
-        worksheet = spreadsheet.worksheet(sheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=16)
+    if snapshot is None:
+        snapshot = SheetSnapshot(spreadsheet, [sheet_name])
+    if snapshot.has(sheet_name):
+        worksheet = snapshot.worksheet(sheet_name)
+        existing = snapshot.values(sheet_name)
+    else:
+        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=GRID_ROW_HEADROOM, cols=16)
+        snapshot.add(worksheet)
         headers = [
             "날짜", "팔로워", "팔로워 변화", "팔로잉",
             "게시물 수", "총 도달", "총 노출", "총 좋아요",
@@ -577,8 +1217,8 @@ def write_daily_report(spreadsheet, results, followers, following):
             "평균 참여율", "평균 저장율", "평균 공유율", "메모"
         ]
         worksheet.update(range_name="A1", values=[headers], value_input_option="USER_ENTERED")
+        existing = [headers]
 
-    existing = worksheet.get_all_values()
     today = now_date_ko()
 
     # 수치 계산 (열 순서: H=도달(7), I=노출(8), J=좋아요(9), K=저장(10), L=공유(11), M=댓글(12), O=참여수(14))
@@ -632,42 +1272,149 @@ def write_daily_report(spreadsheet, results, followers, following):
         f"{avg_eng}%", f"{avg_save}%", f"{avg_share}%", ""
     ]
 
+    snapshot.ensure_grid(sheet_name, new_row_num, len(new_row))
     worksheet.update(range_name=f"A{new_row_num}", values=[new_row], value_input_option="USER_ENTERED")
     action = "업데이트" if today_row_idx else "추가"
     print(f"  일별종합리포트: 오늘 데이터 {action} 완료")
 
+    if isinstance(follower_change_formula, str):
+        new_row[2] = followers - sheet_number(existing[new_row_num - 2][1])
+    if today_row_idx:
+        existing[today_row_idx - 1] = new_row
+    else:
+        existing.append(new_row)
+    return existing
+
 
 # ─── 실행 ────────────────────────────────────────────────────
 
-def main():
-    print("=" * 50)
-    print("  Instagram 인사이트 자동 수집기")
-    print(f"  실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 50)
+def run_account(account, resume=False):
+    """계정 1개 수집 → 시트 기록 → 대시보드 JSON (수집된 게시물 수 반환)
+
+    resume=True이면 같은 날 중단된 실행의 인사이트 기록(checkpoint.py)을 이어서 사용
+
+    단계별 소요 시간·API 호출은 account.metrics에 모아서 끝나면 run_metrics.json으로 저장 (실패한 실행도 저장)
+    """
+    if account.access_token == "여기에_장기토큰_붙여넣기" or not account.access_token:
+        raise ValueError("ACCESS_TOKEN이 설정되지 않았습니다 (config.py / 계정 설정 확인)")
+
+    account.metrics = account.graph.metrics = RunMetrics(account.name)
+    count, status = 0, "failed"
+    try:
+        with run_metrics.activate(account.metrics):
+            count = collect_and_write(account, resume)
+        status = "ok"
+        return count
+    finally:
+        account.metrics.finish(posts=count, status=status)
+        if RUN_METRICS:
+            print(f"\n[{account.name}] 단계별 성능:")
+            for line in account.metrics.summary_lines():
+                print(line)
+            try:
+                run_metrics.write_report(account.metrics.report(), account.data_dir)
+            except OSError as e:
+                print(f"  ⚠️ 성능 기록 저장 실패: {e}")
 
-    if ACCESS_TOKEN == "여기에_장기토큰_붙여넣기":
-        print("\n[오류] config.py에서 ACCESS_TOKEN을 설정해 주세요.")
-        sys.exit(1)
+
+def collect_and_write(account, resume=False):
+    """run_account의 본체 (단계마다 account.metrics에 기록)
+
+    받은 인사이트는 시트 기록까지 끝날 때까지 state/collect_journal.jsonl에 남겨 둠
+    (수집·시트 기록 중 어디서 중단되든 --resume 실행이 Graph 요청을 반복하지 않음)
+    """
+    metrics = account.metrics
 
     # 토큰 자동 갱신 체크
-    refresh_token_if_needed()
+    with run_metrics.stage(metrics, "token_check"):
+        refresh_token_if_needed(account)
 
-    results, followers, following = collect_all_insights(limit=500)
+    journal = CollectJournal(account.state_path(JOURNAL_FILE), now_date_ko(), account.ig_id, resume=resume)
+    with journal:
+        results, followers, following = collect_all_insights(
+            account, limit=INSIGHTS_MAX_POSTS or None, journal=journal
+        )
 
     if results:
-        write_to_sheet(results)
+        # 인증 1회 + 세 시트 값을 한 번에 읽어 두고 각 쓰기 함수가 공유
+        print(f"\n[{account.name}] Google Sheets 연결 중...")
+        with run_metrics.stage(metrics, "sheet_read"):
+            spreadsheet = get_sheet(account)
+            snapshot = SheetSnapshot(spreadsheet, SHEET_TITLES)
+
+        with run_metrics.stage(metrics, "sheet_write"):
+            auto_values = write_to_sheet(account, results, snapshot)
 
         # 팔로워 추적 + 일별종합리포트 시트에도 기록
-        spreadsheet = get_sheet()
-        write_follower_tracking(spreadsheet, followers, following)
-        write_daily_report(spreadsheet, results, followers, following)
+        with run_metrics.stage(metrics, "follower_tracking"):
+            follower_values = write_follower_tracking(spreadsheet, followers, following, snapshot)
+        with run_metrics.stage(metrics, "daily_report"):
+            report_values = write_daily_report(spreadsheet, results, followers, following, snapshot)
+
+        # 서식 적용(format_sheet.py)용 행 수 메타데이터
+        with run_metrics.stage(metrics, "sheet_write"):
+            record_row_counts(snapshot, {
+                "자동수집": auto_values,
+                "팔로워추적": follower_values,
+                "일별종합리포트": report_values,
+            })
+
+        # 대시보드 JSON: 시트를 다시 읽지 않고 메모리의 결과로 바로 저장
+        if EXPORT_JSON_INLINE:
+            import export_json
+            print(f"\n[{account.name}] 대시보드 JSON 저장 중...")
+            with run_metrics.stage(metrics, "export"):
+                export_json.write_outputs(
+                    export_json.posts_from_rows(results),
+                    export_json.followers_from_values(follower_values),
+                    export_json.daily_report_from_values(report_values),
+                    data_dir=account.data_dir,
+                )
 
         print(f"\n{'='*50}")
-        print(f"  수집 완료! 총 {len(results)}개 게시물")
+        print(f"  [{account.name}] 수집 완료! 총 {len(results)}개 게시물")
         print(f"  팔로워: {followers:,}명 | 팔로잉: {following:,}명")
         print(f"{'='*50}")
     else:
-        print("\n수집된 데이터가 없습니다.")
+        print(f"\n[{account.name}] 수집된 데이터가 없습니다.")
+    journal.discard()
+    return len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instagram 인사이트 수집 → Google Sheets 기록")
+    parser.add_argument("--resume", action="store_true",
+                        help="같은 날 중단된 실행의 인사이트 기록을 이어서 사용 (빠졌거나 실패한 게시물만 다시 요청)")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("  Instagram 인사이트 자동 수집기")
+    print(f"  실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 50)
+
+    accounts = load_accounts()
+    if len(accounts) > 1:
+        print(f"\n계정 {len(accounts)}개 동시 수집: {', '.join(a.name for a in accounts)}")
+
+    # 계정별로 따로 실행 → 전체 소요 시간 ≈ 가장 느린 계정 1개, 한 계정의 오류는 다른 계정에 영향 없음
+    def run(account):
+        try:
+            return run_account(account, resume=args.resume), None
+        except Exception as e:
+            print(f"\n[오류] [{account.name}] 수집 실패: {e}")
+            traceback.print_exc()
+            return 0, e
+
+    workers = max(1, min(len(accounts), ACCOUNT_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(run, accounts))
+
+    failed = [a.name for a, (_, error) in zip(accounts, outcomes) if error is not None]
+    if len(accounts) > 1:
+        print(f"\n계정 {len(accounts) - len(failed)}/{len(accounts)}개 완료")
+    if failed:
+        print(f"  실패: {', '.join(failed)}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
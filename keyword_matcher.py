@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+다중 키워드 매칭 (Aho–Corasick 오토마톤)
+키워드 사전을 한 번 컴파일해 두고, 본문을 한 번만 훑어서 모든 키워드 등장을 찾음
+키워드 수와 무관하게 본문 길이 + 매칭 수에 비례하는 시간으로 라벨별 매칭 횟수 계산
+"""
+
+import hashlib
+import json
+from collections import deque
+
+
+class KeywordMatcher:
+    """{라벨: [키워드, ...]} → 라벨별 매칭 횟수 계산기 (대소문자 무시)
+
+    - 겹치는 키워드도 모두 셈 (예: "맛집" 안의 "맛"도 1회)
+    - 같은 키워드가 여러 라벨에 있으면 각 라벨에 1회씩
+    """
+
+    def __init__(self, keywords_by_label):
+        self.labels = list(keywords_by_label)
+        # 사전 내용 지문 (키워드가 바뀌면 매칭 결과 캐시를 무효화하는 데 사용)
+        self.fingerprint = hashlib.sha1(
+            json.dumps(keywords_by_label, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+        # 상태별 전이 / 실패 링크 / 출력(라벨 인덱스 목록) — 상태 0이 루트
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for label_idx, keywords in enumerate(keywords_by_label.values()):
+            for keyword in keywords:
+                if keyword:
+                    self._add(keyword.lower(), label_idx)
+        self._link()
+
+    def _add(self, keyword, label_idx):
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append(label_idx)
+
+    def _link(self):
+        """BFS로 실패 링크 계산 + 실패 경로의 출력을 미리 합쳐 둠 (매칭 시 실패 링크를 따라 출력 수집 불필요)"""
+        queue = deque(self.goto[0].values())  # 깊이 1 상태의 실패 링크는 루트
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+        self.output = [tuple(o) for o in self.output]
+
+    def counts(self, text):
+        """본문 → {라벨: 매칭 횟수} (매칭 없는 라벨도 0으로 포함, 라벨 정의 순서)"""
+        hits = [0] * len(self.labels)
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for ch in (text or "").lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for label_idx in output[state]:
+                hits[label_idx] += 1
+        return dict(zip(self.labels, hits))
+
+    def best(self, text, default=None):
+        """매칭 횟수가 가장 많은 라벨 (동점이면 먼저 정의된 라벨, 매칭이 없으면 default)"""
+        counts = self.counts(text)
+        label = max(counts, key=counts.get, default=None)
+        return label if label is not None and counts[label] > 0 else default
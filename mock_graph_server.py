@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+로컬 Graph API 목(mock) 서버 — 실제 Instagram API 없이 수집기 성능 측정·동작 확인용
+게시물/인사이트는 시드 기반 합성 데이터 (같은 설정이면 항상 같은 응답)
+
+지원 엔드포인트 (경로 앞의 /v24.0 등 버전은 무시):
+  GET  /{ig_id}/media          게시물 목록 (limit, after 커서, insights.metric(...) 중첩 필드)
+  GET  /{media_id}/insights    게시물 인사이트 (VIDEO는 프로필 메트릭 요청 시 오류 #100)
+  GET  /{ig_id}                계정 정보 (followers_count 등)
+  GET  /debug_token            토큰 만료일
+  GET  /oauth/access_token     장기 토큰 교환
+  POST /                       batch 요청 (하위 요청 최대 50개)
+  GET  /__stats, POST /__reset 요청 통계 조회 / 초기화 (벤치마크용)
+
+장애 주입:
+  latency_ms / jitter_ms   응답 지연
+  error_rate               HTTP 500 (code 2, 일시 오류) 비율
+  throttle_rate            호출 한도 초과(code 4) 응답 비율
+  usage_budget             usage_window초 동안 허용 호출 수 → X-App-Usage 사용률 계산, 100% 넘으면 code 4
+  regain_minutes           호출 한도 응답의 estimated_time_to_regain_access (분)
+
+사용 예:
+  python mock_graph_server.py --posts 5000 --port 8765 --latency-ms 30 --error-rate 0.01
+  GRAPH_BASE_URL=http://127.0.0.1:8765/v24.0 INSTAGRAM_BUSINESS_ACCOUNT_ID=17841400000000000 ...
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+MOCK_IG_ID = "17841400000000000"
+MEDIA_ID_BASE = 18000000000000000
+# 합성 게시물의 최신 업로드 시각 (게시물마다 12시간씩 과거로)
+LATEST_TIMESTAMP = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+BATCH_LIMIT = 50
+
+VERSION_RE = re.compile(r"^/v\d+(?:\.\d+)?(?=/|$)")
+
+BASE_METRICS = ["reach", "views", "saved", "shares", "total_interactions", "likes", "comments"]
+PROFILE_METRICS = ["profile_visits", "follows", "profile_activity"]
+# 유형별 지원 메트릭 (ig_insights.insights_metrics와 같은 규칙)
+SUPPORTED_METRICS = {
+    "VIDEO": set(BASE_METRICS),
+    "IMAGE": set(BASE_METRICS + PROFILE_METRICS),
+    "CAROUSEL_ALBUM": set(BASE_METRICS + PROFILE_METRICS),
+}
+# 10개 중 VIDEO 5 / IMAGE 3 / CAROUSEL_ALBUM 2
+MEDIA_TYPES = ["VIDEO", "IMAGE", "VIDEO", "CAROUSEL_ALBUM", "VIDEO", "IMAGE", "VIDEO", "IMAGE", "VIDEO", "CAROUSEL_ALBUM"]
+
+CAPTION_TOPICS = [
+    "도쿄 라멘 맛집 BEST 5 🍜",
+    "오사카 야경 명소 포토스팟 총정리 ✨",
+    "일본 편의점 꿀팁, 모르면 손해!",
+    "교토 료칸 숙소 추천 🏯",
+    "스이카 카드 충전 방법과 교통 꿀정보",
+    "현지인만 아는 이자카야 에티켓",
+    "면세 쇼핑 할인 쿠폰 총정리 💸",
+    "후쿠오카 카페 투어 코스 ☕",
+]
+CAPTION_TAGS = ["#일본여행", "#도쿄", "#오사카", "#맛집", "#여행팁", "#flyingjapan"]
+
+
+def _split_fields(fields):
+    """'id,caption,insights.metric(a,b)' → ['id', 'caption', 'insights.metric(a,b)'] (괄호 안 쉼표 무시)"""
+    out, depth, current = [], 0, ""
+    for ch in fields:
+        if ch == "," and depth == 0:
+            out.append(current)
+            current = ""
+            continue
+        depth += ch == "("
+        depth -= ch == ")"
+        current += ch
+    if current:
+        out.append(current)
+    return [f.strip() for f in out if f.strip()]
+
+
+def graph_error(status, code, message, **extra):
+    return status, {"error": {"message": message, "type": "OAuthException", "code": code, **extra}}
+
+
+class MockGraph:
+    """합성 데이터 + 장애 주입 + 요청 통계 (HTTP 처리와 분리해서 batch 하위 요청도 같은 경로로 처리)"""
+
+    def __init__(self, posts=500, ig_id=MOCK_IG_ID, username="mock_account", followers=12345,
+                 latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, throttle_rate=0.0,
+                 usage_budget=0, usage_window=60.0, regain_minutes=0.0, seed=0):
+        self.posts = posts
+        self.ig_id = ig_id
+        self.username = username
+        self.followers = followers
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.usage_budget = usage_budget
+        self.usage_window = usage_window
+        self.regain_minutes = regain_minutes
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = deque()  # 사용률 계산용 최근 호출 시각
+        self.stats = Counter()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    # ── 합성 데이터 ─────────────────────────────────
+
+    def media_index(self, media_id):
+        """게시물 ID → 목록 순번 (없는 ID면 None)"""
+        try:
+            index = int(media_id) - MEDIA_ID_BASE
+        except ValueError:
+            return None
+        return index if 0 <= index < self.posts else None
+
+    def media(self, index):
+        rng = random.Random(self.seed * 1_000_003 + index)
+        media_type = MEDIA_TYPES[index % len(MEDIA_TYPES)]
+        timestamp = LATEST_TIMESTAMP - timedelta(hours=12 * index)
+        caption = "\n".join([
+            rng.choice(CAPTION_TOPICS),
+            "",
+            f"{index + 1}번째 게시물 @{self.username}",
+            " ".join(rng.sample(CAPTION_TAGS, 3)),
+        ])
+        shortcode = f"M{index:09d}"
+        path = "reel" if media_type == "VIDEO" else "p"
+        insights = self.insights_values(index)
+        return {
+            "id": str(MEDIA_ID_BASE + index),
+            "caption": caption,
+            "media_type": media_type,
+            "permalink": f"https://www.instagram.com/{path}/{shortcode}/",
+            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+            "like_count": insights["likes"],
+            "comments_count": insights["comments"],
+        }
+
+    def insights_values(self, index):
+        rng = random.Random(self.seed * 2_000_003 + index)
+        reach = rng.randint(300, 60000)
+        values = {
+            "reach": reach,
+            "views": int(reach * rng.uniform(1.1, 2.5)),
+            "likes": int(reach * rng.uniform(0.01, 0.08)),
+            "saved": int(reach * rng.uniform(0.0, 0.05)),
+            "shares": int(reach * rng.uniform(0.0, 0.03)),
+            "comments": int(reach * rng.uniform(0.0, 0.005)),
+            "profile_visits": int(reach * rng.uniform(0.0, 0.02)),
+            "follows": int(reach * rng.uniform(0.0, 0.004)),
+            "profile_activity": int(reach * rng.uniform(0.0, 0.003)),
+        }
+        values["total_interactions"] = values["likes"] + values["saved"] + values["shares"] + values["comments"]
+        return values
+
+    def insights_body(self, index, metrics):
+        """메트릭 목록 → (status, 본문) — 유형이 지원하지 않는 메트릭이 있으면 오류 #100"""
+        media_type = MEDIA_TYPES[index % len(MEDIA_TYPES)]
+        unsupported = [m for m in metrics if m not in SUPPORTED_METRICS[media_type]]
+        if unsupported:
+            return graph_error(400, 100, f"(#100) The following metrics are not supported for this media: {', '.join(unsupported)}")
+        values = self.insights_values(index)
+        return 200, {"data": [
+            {
+                "name": m,
+                "period": "lifetime",
+                "values": [{"value": values[m]}],
+                "id": f"{MEDIA_ID_BASE + index}/insights/{m}/lifetime",
+            }
+            for m in metrics
+        ]}
+
+    # ── 엔드포인트 ──────────────────────────────────
+
+    def list_media(self, params, base_url):
+        limit = max(1, min(int(params.get("limit", "25")), 100))
+        start = int(params.get("after", "0") or 0)
+        end = min(start + limit, self.posts)
+        fields = _split_fields(params.get("fields", "id"))
+        nested = [f for f in fields if f.startswith("insights")]
+        metrics = []
+        if nested:
+            m = re.match(r"insights\.metric\(([^)]*)\)", nested[0])
+            metrics = m.group(1).split(",") if m else list(BASE_METRICS)
+
+        data = []
+        for index in range(start, end):
+            media = self.media(index)
+            item = {k: v for k, v in media.items() if k in fields}
+            if nested:
+                status, body = self.insights_body(index, metrics)
+                if status != 200:
+                    # 중첩 필드 오류는 페이지 전체 실패
+                    return status, body
+                item["insights"] = body
+            data.append(item)
+
+        body = {"data": data, "paging": {"cursors": {"before": str(start), "after": str(end)}}}
+        if end < self.posts:
+            body["paging"]["next"] = f"{base_url}?{urlencode({**params, 'after': str(end)})}"
+        return 200, body
+
+    def dispatch(self, method, path, params, base_url):
+        """경로 + 파라미터 → (status, 본문) — 장애 주입 없이 순수 응답만"""
+        parts = [p for p in path.split("/") if p]
+        if method == "GET" and parts == ["debug_token"]:
+            self.count("debug_token")
+            expires = int(time.time()) + 60 * 86400
+            return 200, {"data": {"is_valid": True, "expires_at": expires, "type": "USER"}}
+        if method == "GET" and parts == ["oauth", "access_token"]:
+            self.count("oauth")
+            return 200, {"access_token": f"mock-token-{int(time.time())}", "token_type": "bearer", "expires_in": 5184000}
+        if method == "GET" and parts == [self.ig_id]:
+            self.count("account")
+            return 200, {
+                "id": self.ig_id,
+                "username": self.username,
+                "followers_count": self.followers,
+                "follows_count": 321,
+                "media_count": self.posts,
+            }
+        if method == "GET" and parts == [self.ig_id, "media"]:
+            self.count("media")
+            return self.list_media(params, base_url)
+        if method == "GET" and len(parts) == 2 and parts[1] == "insights":
+            self.count("insights")
+            index = self.media_index(parts[0])
+            if index is None:
+                return graph_error(400, 100, f"(#100) Object with ID '{parts[0]}' does not exist")
+            metrics = [m for m in params.get("metric", "").split(",") if m]
+            if not metrics:
+                return graph_error(400, 100, "(#100) The parameter metric is required")
+            return self.insights_body(index, metrics)
+        return graph_error(400, 803, f"(#803) Unknown path: {method} /{'/'.join(parts)}")
+
+    def batch(self, form):
+        try:
+            items = json.loads(form.get("batch", "[]"))
+        except ValueError:
+            return graph_error(400, 100, "(#100) batch 파라미터가 JSON이 아닙니다")
+        if len(items) > BATCH_LIMIT:
+            return graph_error(400, 1, f"(#1) Batch requests cannot exceed {BATCH_LIMIT} items")
+        self.count("batch_items", len(items))
+        results = []
+        for item in items:
+            rel = urlsplit("/" + item.get("relative_url", "").lstrip("/"))
+            params = {k: v[-1] for k, v in parse_qs(rel.query).items()}
+            status, body = self.dispatch(item.get("method", "GET").upper(), rel.path, params, "")
+            results.append({"code": status, "body": json.dumps(body)})
+        return 200, results
+
+    # ── 호출 한도 / 장애 ────────────────────────────
+
+    def usage_percent(self):
+        """최근 usage_window초 호출 수 / usage_budget → 사용률 % (예산이 없으면 0)"""
+        now = time.monotonic()
+        with self.lock:
+            self.calls.append(now)
+            while self.calls and self.calls[0] < now - self.usage_window:
+                self.calls.popleft()
+            count = len(self.calls)
+        if not self.usage_budget:
+            return 0
+        return min(100, int(count * 100 / self.usage_budget))
+
+    def usage_headers(self, usage, regain=0.0):
+        return {
+            "X-App-Usage": json.dumps({"call_count": usage, "total_cputime": usage // 2, "total_time": usage // 2}),
+            "X-Business-Use-Case-Usage": json.dumps({self.ig_id: [{
+                "type": "instagram",
+                "call_count": usage,
+                "total_cputime": usage // 2,
+                "total_time": usage // 2,
+                "estimated_time_to_regain_access": regain,
+            }]}),
+        }
+
+    def handle(self, method, path, params, base_url):
+        """HTTP 요청 1건 → (status, 본문, 헤더) — 지연·장애 주입 포함"""
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.random.uniform(0, self.jitter))
+        self.count("requests")
+        usage = self.usage_percent()
+
+        if (self.usage_budget and usage >= 100) or self.random.random() < self.throttle_rate:
+            self.count("throttled")
+            status, body = graph_error(400, 4, "(#4) Application request limit reached", is_transient=True)
+            return status, body, self.usage_headers(100, self.regain_minutes)
+        if self.random.random() < self.error_rate:
+            self.count("errors")
+            status, body = graph_error(500, 2, "An unexpected error has occurred. Please retry your request later.",
+                                       is_transient=True)
+            return status, body, self.usage_headers(usage)
+
+        if method == "POST" and not [p for p in path.split("/") if p]:
+            self.count("batch")
+            status, body = self.batch(params)
+        else:
+            status, body = self.dispatch(method, path, params, base_url)
+        return status, body, self.usage_headers(usage)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+            self.calls.clear()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (수집기의 연결 재사용과 같은 조건)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.graph.count("bytes_out", len(payload))
+
+    def _route(self, method, params):
+        url = urlsplit(self.path)
+        version = VERSION_RE.match(url.path)
+        path = url.path[version.end():] if version else url.path
+        graph = self.server.graph
+        if path == "/__stats":
+            return self._send(200, graph.snapshot())
+        if path == "/__reset":
+            graph.reset()
+            return self._send(200, {"ok": True})
+        host = self.headers.get("Host", "localhost")
+        base_url = f"http://{host}{version.group(0) if version else ''}{path}"
+        params = {**{k: v[-1] for k, v in parse_qs(url.query).items()}, **params}
+        status, body, headers = graph.handle(method, path, params, base_url)
+        self._send(status, body, headers)
+
+    def do_GET(self):
+        self._route("GET", {})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8")) if length else {}
+        self._route("POST", {k: v[-1] for k, v in form.items()})
+
+
+class MockGraphServer:
+    """백그라운드 스레드에서 도는 목 서버 (with 문 지원)
+
+    base_url: GRAPH_BASE_URL로 넘길 주소 (버전 경로 포함)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, version="v24.0", **options):
+        self.graph = MockGraph(**options)
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 128
+        self.httpd.graph = self.graph
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}/{version}"
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_fault_arguments(parser):
+    """목 서버 옵션 (bench_collector.py와 공유)"""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 (밀리초)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="추가 무작위 지연 최대값 (밀리초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 응답 비율 (0~1)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="호출 한도(code 4) 응답 비율 (0~1)")
+    parser.add_argument("--usage-budget", type=int, default=0, help="usage-window초당 허용 호출 수 (0이면 사용률 0%%)")
+    parser.add_argument("--usage-window", type=float, default=60.0)
+    parser.add_argument("--regain-minutes", type=float, default=0.0, help="호출 한도 응답의 접근 재개 대기 (분)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def fault_options(args):
+    return {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "usage_budget": args.usage_budget,
+        "usage_window": args.usage_window,
+        "regain_minutes": args.regain_minutes,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Graph API 목 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--posts", type=int, default=500, help="합성 게시물 수")
+    parser.add_argument("--ig-id", default=MOCK_IG_ID)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockGraphServer(args.host, args.port, posts=args.posts, ig_id=args.ig_id, **fault_options(args))
+    print(f"목 Graph 서버 실행 중: {server.base_url}  (게시물 {args.posts:,}개, 계정 {args.ig_id})")
+    print(f"  GRAPH_BASE_URL={server.base_url} INSTAGRAM_BUSINESS_ACCOUNT_ID={args.ig_id}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,765 @@
+#!/usr/bin/env python3
+"""
+메모리 안의 Google Sheets API 대역(stand-in) — 인증 없이 시트 기록 함수 실행 + API 호출 비용 측정용
+gspread의 HTTP 전송 계층(session.request)만 바꿔 끼우므로 gspread 코드 경로는 실제와 같다.
+
+  session = MockSheetsSession()
+  session.create_spreadsheet("test-id")
+  spreadsheet = session.client().open_by_key("test-id")
+  with session.stage("write_to_sheet"):
+      ...                       # 이 구간의 읽기/쓰기 호출 수, 셀 수, 바이트를 단계별로 집계
+  session.report()
+
+지원 범위:
+  spreadsheets.get (includeGridData / ranges, 개발자 메타데이터 포함)
+  values.get / batchGet / update / batchUpdate / append / clear / batchClear
+    (렌더링: FORMATTED_VALUE / UNFORMATTED_VALUE / FORMULA, 입력: RAW / USER_ENTERED)
+  spreadsheets.batchUpdate: addSheet / deleteSheet / updateSheetProperties / appendDimension /
+    insertDimension / deleteDimension / 개발자 메타데이터 생성·수정·삭제 /
+    서식 요청(repeatCell, updateBorders 등 — 범위만 검사하고 표시값에는 반영하지 않음)
+  수식: HYPERLINK / SUM / AVERAGE / 셀 참조 덧셈·뺄셈 (그 외 수식은 #NAME?)
+
+strict_grid=True(기본)이면 시트 크기(rowCount/columnCount)를 넘는 쓰기를 400 오류로 처리
+→ 워크시트 크기 확장이 빠진 코드를 로컬에서 잡아냄
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import unquote, urlencode
+
+import gspread
+import requests
+
+SHEETS_API = "https://sheets.googleapis.com/v4/spreadsheets/"
+# 스프레드시트 전체 셀 한도
+MAX_CELLS = 10_000_000
+
+CELL_RE = re.compile(r"^([A-Z]{0,3})(\d*)$")
+REF = r"\$?([A-Z]+)\$?(\d+)"
+HYPERLINK_RE = re.compile(r'^=HYPERLINK\("((?:[^"]|"")*)"\s*(?:,\s*"((?:[^"]|"")*)")?\s*\)$', re.I)
+AGGREGATE_RE = re.compile(rf"^=(SUM|AVERAGE)\(\s*{REF}\s*:\s*{REF}\s*\)$", re.I)
+ARITH_RE = re.compile(rf"^=\s*(?:{REF}|\d+(?:\.\d+)?)(?:\s*[+-]\s*(?:{REF}|\d+(?:\.\d+)?))*\s*$")
+TERM_RE = re.compile(rf"([+-]?)\s*(?:{REF}|(\d+(?:\.\d+)?))")
+NUMBER_RE = re.compile(r"^[+-]?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?$|^[+-]?\.\d+$")
+PERCENT_RE = re.compile(r"^([+-]?(?:\d+(?:\.(\d+))?|\.(\d+)))%$")
+
+
+class SheetsError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Formula(str):
+    """USER_ENTERED로 입력된 수식 (RAW로 입력된 '='로 시작하는 문자열과 구분)"""
+
+
+class Percent(float):
+    """'5.2%'처럼 입력된 숫자 (표시값을 같은 소수 자릿수의 %로)"""
+
+    def __new__(cls, value, decimals=0):
+        obj = super().__new__(cls, value)
+        obj.decimals = decimals
+        return obj
+
+
+# ─── A1 표기 ────────────────────────────────────────────
+
+def column_index(letters):
+    """'A' → 0, 'AA' → 26"""
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - ord("A") + 1
+    return n - 1
+
+
+def split_range(range_name):
+    """"'자동수집'!A1:X10" → ("자동수집", "A1:X10") / 시트 이름만 있으면 (이름, "")"""
+    if "!" in range_name:
+        title, _, cells = range_name.rpartition("!")
+    elif CELL_RE.match(range_name.split(":")[0]) and any(ch.isdigit() for ch in range_name):
+        title, cells = None, range_name
+    else:
+        title, cells = range_name, ""
+    if title and title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def parse_cells(cells):
+    """"A1:X10" → (r0, c0, r1, c1) 0-based, 끝은 미포함 (열/행 전체 범위는 끝이 None)"""
+    if not cells:
+        return 0, 0, None, None
+    start, _, end = cells.partition(":")
+    m0, m1 = CELL_RE.match(start), CELL_RE.match(end or start)
+    if not m0 or not m1 or not (start.strip()):
+        raise SheetsError(400, f"Unable to parse range: {cells}")
+    c0 = column_index(m0.group(1)) if m0.group(1) else 0
+    r0 = int(m0.group(2)) - 1 if m0.group(2) else 0
+    c1 = column_index(m1.group(1)) + 1 if m1.group(1) else None
+    r1 = int(m1.group(2)) if m1.group(2) else None
+    return r0, c0, r1, c1
+
+
+def _a1(row, col):
+    letters = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return f"{letters}{row + 1}"
+
+
+# ─── 값 변환 ────────────────────────────────────────────
+
+def parse_entered(value, input_option):
+    """API로 들어온 값 1개 → 저장 값 (USER_ENTERED면 시트처럼 수식·숫자·%를 해석)"""
+    if not isinstance(value, str) or input_option != "USER_ENTERED":
+        return value
+    text = value.strip()
+    if text.startswith("="):
+        return Formula(value)
+    if value.startswith("'"):
+        return value[1:]
+    m = PERCENT_RE.match(text)
+    if m:
+        decimals = len(m.group(2) or m.group(3) or "")
+        return Percent(float(m.group(1)) / 100, decimals)
+    if NUMBER_RE.match(text):
+        number = float(text.replace(",", ""))
+        return int(number) if number.is_integer() and "." not in text else number
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper() == "TRUE"
+    return value
+
+
+def format_value(value):
+    """계산된 값 → 표시값 (FORMATTED_VALUE)"""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, Percent):
+        return f"{value * 100:.{value.decimals}f}%"
+    if isinstance(value, (int, float)):
+        if float(value).is_integer():
+            return str(int(value))
+        return f"{value:.10g}"
+    return str(value)
+
+
+def entered_json(value):
+    """저장 값 → userEnteredValue JSON"""
+    if isinstance(value, Formula):
+        return {"formulaValue": str(value)}
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, (int, float)):
+        return {"numberValue": float(value) if isinstance(value, Percent) else value}
+    return {"stringValue": str(value)}
+
+
+# ─── 시트 모델 ──────────────────────────────────────────
+
+class MockSheet:
+    def __init__(self, sheet_id, title, index, rows=1000, cols=26):
+        self.properties = {
+            "sheetId": sheet_id,
+            "title": title,
+            "index": index,
+            "sheetType": "GRID",
+            "gridProperties": {"rowCount": rows, "columnCount": cols},
+        }
+        self.rows = []  # 행별 저장 값 목록 (빈칸 None)
+        self.developer_metadata = []
+
+    @property
+    def title(self):
+        return self.properties["title"]
+
+    @property
+    def row_count(self):
+        return self.properties["gridProperties"]["rowCount"]
+
+    @property
+    def column_count(self):
+        return self.properties["gridProperties"]["columnCount"]
+
+    def get(self, r, c):
+        if r < len(self.rows) and c < len(self.rows[r]):
+            return self.rows[r][c]
+        return None
+
+    def set(self, r, c, value):
+        while len(self.rows) <= r:
+            self.rows.append([])
+        row = self.rows[r]
+        if value == "" or value is None:
+            if c < len(row):
+                row[c] = None
+            return
+        if len(row) <= c:
+            row.extend([None] * (c + 1 - len(row)))
+        row[c] = value
+
+    def used_bounds(self, r0, c0, r1, c1):
+        """범위 안에서 값이 있는 마지막 행/열까지로 끝을 줄임"""
+        r1 = min(len(self.rows), self.row_count if r1 is None else r1)
+        width = max((len(row) for row in self.rows[r0:r1]), default=0)
+        c1 = min(width, self.column_count if c1 is None else c1)
+        return r1, c1
+
+
+class FormulaEvaluator:
+    """읽기 요청 1회 동안 수식 계산 결과를 캐시"""
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.cache = {}
+
+    def value(self, r, c, depth=0):
+        raw = self.sheet.get(r, c)
+        if not isinstance(raw, Formula):
+            return raw
+        key = (r, c)
+        if key not in self.cache:
+            self.cache[key] = "#REF!" if depth > 50 else self._evaluate(raw, depth)
+        return self.cache[key]
+
+    def _evaluate(self, formula, depth):
+        m = HYPERLINK_RE.match(formula)
+        if m:
+            return (m.group(2) if m.group(2) is not None else m.group(1)).replace('""', '"')
+        m = AGGREGATE_RE.match(formula)
+        if m:
+            func, col0, row0, col1, row1 = m.groups()
+            numbers, fmt = [], None
+            for r in range(int(row0) - 1, int(row1)):
+                for c in range(column_index(col0), column_index(col1) + 1):
+                    v = self.value(r, c, depth + 1)
+                    if isinstance(v, (int, float)) and not isinstance(v, bool):
+                        numbers.append(v)
+                        fmt = fmt or v
+            if func.upper() == "SUM":
+                total = sum(numbers)
+            elif numbers:
+                total = sum(numbers) / len(numbers)
+            else:
+                return "#DIV/0!"
+            # 시트처럼 참조한 첫 숫자 칸의 % 서식을 결과에 이어받음
+            return Percent(total, fmt.decimals) if isinstance(fmt, Percent) else total
+        if ARITH_RE.match(formula):
+            total = 0
+            for sign, col, row, number in TERM_RE.findall(formula[1:]):
+                if number:
+                    v = float(number)
+                else:
+                    v = self.value(int(row) - 1, column_index(col), depth + 1)
+                    if v is None or v == "":
+                        v = 0
+                    if not isinstance(v, (int, float)):
+                        return "#VALUE!"
+                total = total - v if sign == "-" else total + v
+            return total
+        return "#NAME?"
+
+    def render(self, r, c, option):
+        raw = self.sheet.get(r, c)
+        if raw is None:
+            return ""
+        if option == "FORMULA":
+            return str(raw) if isinstance(raw, Formula) else (float(raw) if isinstance(raw, Percent) else raw)
+        value = self.value(r, c)
+        if option == "UNFORMATTED_VALUE":
+            return float(value) if isinstance(value, Percent) else value
+        return format_value(value)
+
+
+class MockSpreadsheet:
+    def __init__(self, spreadsheet_id, title):
+        self.id = spreadsheet_id
+        self.title = title
+        self.sheets = []
+        self.next_sheet_id = 0
+        self.next_metadata_id = 1
+
+    def add_sheet(self, title, rows=1000, cols=26, index=None, sheet_id=None):
+        if self.find(title):
+            raise SheetsError(400, f'Invalid requests[0].addSheet: A sheet with the name "{title}" already exists.')
+        if sheet_id is None:
+            sheet_id = self.next_sheet_id
+        self.next_sheet_id = max(self.next_sheet_id, sheet_id) + 1
+        sheet = MockSheet(sheet_id, title, len(self.sheets), rows, cols)
+        self.sheets.insert(len(self.sheets) if index is None else index, sheet)
+        for i, s in enumerate(self.sheets):
+            s.properties["index"] = i
+        self.check_cell_limit()
+        return sheet
+
+    def find(self, title):
+        return next((s for s in self.sheets if s.title == title), None)
+
+    def by_id(self, sheet_id):
+        sheet = next((s for s in self.sheets if s.properties["sheetId"] == sheet_id), None)
+        if sheet is None:
+            raise SheetsError(400, f"No grid with id: {sheet_id}")
+        return sheet
+
+    def resolve(self, range_name):
+        """A1 범위 → (시트, r0, c0, r1, c1) — 시트 이름이 없으면 첫 시트"""
+        title, cells = split_range(range_name)
+        sheet = self.find(title) if title is not None else (self.sheets[0] if self.sheets else None)
+        if sheet is None:
+            raise SheetsError(400, f"Unable to parse range: {range_name}")
+        return (sheet,) + parse_cells(cells)
+
+    def check_cell_limit(self):
+        cells = sum(s.row_count * s.column_count for s in self.sheets)
+        if cells > MAX_CELLS:
+            raise SheetsError(400, f"This action would increase the number of cells in the workbook above the limit of {MAX_CELLS} cells.")
+
+
+# ─── HTTP 대역 ──────────────────────────────────────────
+
+class MockSheetsSession:
+    """gspread HTTPClient가 쓰는 requests.Session 자리에 넣는 대역
+
+    stats: 단계 이름 → Counter(read_calls, write_calls, cells_read, cells_written,
+                               batch_requests, bytes_sent, bytes_received)
+    """
+
+    def __init__(self, strict_grid=True):
+        self.strict_grid = strict_grid
+        self.spreadsheets = {}
+        self.stats = defaultdict(Counter)
+        self.current_stage = "기타"
+        self.lock = threading.RLock()
+        self.hooks = {"response": []}  # requests.Session과 같은 응답 훅 (run_metrics 기록용)
+
+    def create_spreadsheet(self, spreadsheet_id, title="대역 스프레드시트", sheets=("시트1",)):
+        spreadsheet = MockSpreadsheet(spreadsheet_id, title)
+        for name in sheets:
+            spreadsheet.add_sheet(name)
+        self.spreadsheets[spreadsheet_id] = spreadsheet
+        return spreadsheet
+
+    def client(self):
+        """이 대역으로 요청하는 gspread.Client (인증 없음)"""
+        return gspread.Client(None, session=self)
+
+    @contextmanager
+    def stage(self, name):
+        """이 블록 안의 호출을 name 단계로 집계"""
+        previous = self.current_stage
+        self.current_stage = name
+        try:
+            yield self.stats[name]
+        finally:
+            self.current_stage = previous
+
+    def report(self):
+        """단계별 집계 + 합계 → {단계: {지표: 값}}"""
+        report = {name: dict(counter) for name, counter in self.stats.items()}
+        total = Counter()
+        for counter in self.stats.values():
+            total.update(counter)
+        report["합계"] = dict(total)
+        return report
+
+    def reset_stats(self):
+        self.stats.clear()
+
+    # requests.Session.request와 같은 시그니처 (gspread HTTPClient가 키워드 인자로 호출)
+    def request(self, method, url, params=None, data=None, json=None, files=None, headers=None, timeout=None, **kwargs):
+        method = method.upper()
+        started = time.perf_counter()
+        body = json if json is not None else _loads(data)
+        sent = len(urlencode(params or {}, doseq=True)) + (len(_dumps(body)) if body is not None else 0)
+        with self.lock:
+            stats = self.stats[self.current_stage]
+            stats["read_calls" if method == "GET" else "write_calls"] += 1
+            stats["bytes_sent"] += sent
+            try:
+                status, payload = 200, self._route(method, url, params or {}, body or {}, stats)
+            except SheetsError as e:
+                status = e.status
+                payload = {"error": {"code": e.status, "message": e.message,
+                                     "status": "NOT_FOUND" if e.status == 404 else "INVALID_ARGUMENT"}}
+            content = _dumps(payload)
+            stats["bytes_received"] += len(content)
+
+        resp = requests.Response()
+        resp.status_code = status
+        resp._content = content
+        resp.headers["Content-Type"] = "application/json; charset=UTF-8"
+        resp.encoding = "utf-8"
+        resp.url = url
+        resp.reason = "OK" if status == 200 else "Bad Request"
+        resp.request = requests.Request(method, url, params=params, json=body).prepare()
+        resp.elapsed = timedelta(seconds=time.perf_counter() - started)
+        for hook in self.hooks["response"]:
+            resp = hook(resp) or resp
+        return resp
+
+    def _route(self, method, url, params, body, stats):
+        if not url.startswith(SHEETS_API):
+            raise SheetsError(404, f"대역이 지원하지 않는 URL: {url}")
+        rest = url[len(SHEETS_API):]
+        spreadsheet_id, _, path = rest.partition("/")
+        action = ""
+        if not path and ":" in spreadsheet_id:
+            spreadsheet_id, _, action = spreadsheet_id.partition(":")
+        spreadsheet = self.spreadsheets.get(spreadsheet_id)
+        if spreadsheet is None:
+            raise SheetsError(404, "Requested entity was not found.")
+
+        if not path:
+            if method == "GET" and not action:
+                return self._get_spreadsheet(spreadsheet, params, stats)
+            if method == "POST" and action == "batchUpdate":
+                return self._batch_update(spreadsheet, body.get("requests", []), stats)
+        elif path == "values:batchGet" and method == "GET":
+            ranges = params.get("ranges", [])
+            ranges = [ranges] if isinstance(ranges, str) else list(ranges)
+            return {
+                "spreadsheetId": spreadsheet.id,
+                "valueRanges": [self._get_values(spreadsheet, r, params, stats) for r in ranges],
+            }
+        elif path == "values:batchUpdate" and method == "POST":
+            option = body.get("valueInputOption", "RAW")
+            responses = [self._write_values(spreadsheet, d["range"], d.get("values", []), option,
+                                            d.get("majorDimension"), stats) for d in body.get("data", [])]
+            return {
+                "spreadsheetId": spreadsheet.id,
+                "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+                "responses": responses,
+            }
+        elif path == "values:batchClear" and method == "POST":
+            cleared = [self._clear(spreadsheet, r) for r in body.get("ranges", [])]
+            return {"spreadsheetId": spreadsheet.id, "clearedRanges": cleared}
+        elif path.startswith("values/"):
+            range_name = unquote(path[len("values/"):])
+            if method == "GET":
+                return self._get_values(spreadsheet, range_name, params, stats)
+            if method == "PUT":
+                option = params.get("valueInputOption", "RAW")
+                return self._write_values(spreadsheet, range_name, body.get("values", []), option,
+                                          body.get("majorDimension"), stats)
+            if method == "POST" and range_name.endswith(":append"):
+                option = params.get("valueInputOption", "RAW")
+                return self._append(spreadsheet, range_name[:-len(":append")], body.get("values", []), option, stats)
+            if method == "POST" and range_name.endswith(":clear"):
+                return {"spreadsheetId": spreadsheet.id, "clearedRange": self._clear(spreadsheet, range_name[:-len(":clear")])}
+        raise SheetsError(404, f"대역이 지원하지 않는 요청: {method} {url}")
+
+    # ── spreadsheets.get ────────────────────────────
+
+    def _sheet_json(self, sheet):
+        out = {"properties": json_copy(sheet.properties)}
+        if sheet.developer_metadata:
+            out["developerMetadata"] = json_copy(sheet.developer_metadata)
+        return out
+
+    def _get_spreadsheet(self, spreadsheet, params, stats):
+        result = {
+            "spreadsheetId": spreadsheet.id,
+            "properties": {"title": spreadsheet.title, "locale": "ko_KR", "timeZone": "Asia/Seoul"},
+            "sheets": [],
+        }
+        include_grid = str(params.get("includeGridData", "false")).lower() == "true"
+        ranges = params.get("ranges") or []
+        ranges = [ranges] if isinstance(ranges, str) else list(ranges)
+        if not ranges:
+            result["sheets"] = [self._sheet_json(s) for s in spreadsheet.sheets]
+            return result
+
+        # 범위가 있으면 해당 시트만 (없는 시트가 하나라도 있으면 400)
+        by_sheet = {}
+        for range_name in ranges:
+            sheet, r0, c0, r1, c1 = spreadsheet.resolve(range_name)
+            self._check_read_bounds(sheet, range_name, r1, c1)
+            by_sheet.setdefault(sheet.title, (sheet, []))[1].append((r0, c0, r1, c1))
+        for sheet, blocks in by_sheet.values():
+            entry = self._sheet_json(sheet)
+            if include_grid:
+                entry["data"] = [self._grid_data(sheet, block, stats) for block in blocks]
+            result["sheets"].append(entry)
+        return result
+
+    def _grid_data(self, sheet, block, stats):
+        r0, c0, r1, c1 = block
+        r1, c1 = sheet.used_bounds(r0, c0, r1, c1)
+        evaluator = FormulaEvaluator(sheet)
+        row_data = []
+        for r in range(r0, r1):
+            cells = []
+            for c in range(c0, min(c1, len(sheet.rows[r]))):
+                raw = sheet.get(r, c)
+                if raw is None:
+                    cells.append({})
+                    continue
+                cells.append({
+                    "userEnteredValue": entered_json(raw),
+                    "formattedValue": format_value(evaluator.value(r, c)),
+                })
+                stats["cells_read"] += 1
+            while cells and not cells[-1]:
+                cells.pop()
+            row_data.append({"values": cells} if cells else {})
+        while row_data and not row_data[-1]:
+            row_data.pop()
+        return {"startRow": r0, "startColumn": c0, "rowData": row_data}
+
+    # ── values ──────────────────────────────────────
+
+    def _check_read_bounds(self, sheet, range_name, r1, c1):
+        if (r1 is not None and r1 > sheet.row_count) or (c1 is not None and c1 > sheet.column_count):
+            raise SheetsError(400, f"Range ({range_name}) exceeds grid limits. "
+                                   f"Max rows: {sheet.row_count}, max columns: {sheet.column_count}")
+
+    def _get_values(self, spreadsheet, range_name, params, stats):
+        sheet, r0, c0, r1, c1 = spreadsheet.resolve(range_name)
+        self._check_read_bounds(sheet, range_name, r1, c1)
+        option = params.get("valueRenderOption", "FORMATTED_VALUE")
+        major = params.get("majorDimension", "ROWS")
+        end_r, end_c = sheet.used_bounds(r0, c0, r1, c1)
+        evaluator = FormulaEvaluator(sheet)
+        grid = [[evaluator.render(r, c, option) for c in range(c0, end_c)] for r in range(r0, end_r)]
+        if major == "COLUMNS":
+            grid = [list(col) for col in zip(*grid)] if grid else []
+        values = _trim(grid)
+        stats["cells_read"] += sum(1 for row in values for v in row if v != "")
+        out = {"range": range_name, "majorDimension": major}
+        if values:
+            out["values"] = values
+        return out
+
+    def _write_values(self, spreadsheet, range_name, values, input_option, major, stats):
+        sheet, r0, c0, r1, c1 = spreadsheet.resolve(range_name)
+        if major == "COLUMNS":
+            values = [list(col) for col in zip(*values)] if values else []
+        height = len(values)
+        width = max((len(row) for row in values), default=0)
+        single_cell = r1 == r0 + 1 and c1 == c0 + 1
+        if not single_cell and ((r1 is not None and r0 + height > r1) or (c1 is not None and c0 + width > c1)):
+            raise SheetsError(400, f"Requested writing within range [{range_name}], but tried writing to "
+                                   f"row [{r0 + height}] / column [{c0 + width}]")
+        self._check_write_grid(sheet, r0 + height, c0 + width)
+        cells = 0
+        for dr, row in enumerate(values):
+            for dc, value in enumerate(row):
+                if value is None:
+                    continue  # null = 기존 값 유지
+                sheet.set(r0 + dr, c0 + dc, parse_entered(value, input_option))
+                cells += 1
+        stats["cells_written"] += cells
+        updated = f"'{sheet.title}'!{_a1(r0, c0)}:{_a1(r0 + max(height, 1) - 1, c0 + max(width, 1) - 1)}"
+        return {
+            "spreadsheetId": spreadsheet.id,
+            "updatedRange": updated,
+            "updatedRows": height,
+            "updatedColumns": width,
+            "updatedCells": cells,
+        }
+
+    def _check_write_grid(self, sheet, rows, cols):
+        if rows <= sheet.row_count and cols <= sheet.column_count:
+            return
+        if self.strict_grid:
+            raise SheetsError(400, f"Range ('{sheet.title}'!{_a1(rows - 1, cols - 1)}) exceeds grid limits. "
+                                   f"Max rows: {sheet.row_count}, max columns: {sheet.column_count}")
+        sheet.properties["gridProperties"]["rowCount"] = max(sheet.row_count, rows)
+        sheet.properties["gridProperties"]["columnCount"] = max(sheet.column_count, cols)
+
+    def _append(self, spreadsheet, range_name, values, input_option, stats):
+        """표의 마지막 값 있는 행 다음에 추가 (append는 시트 크기를 자동으로 늘림)"""
+        sheet, r0, c0, _, _ = spreadsheet.resolve(range_name)
+        last = len(sheet.rows)
+        while last > r0 and not any(v is not None for v in sheet.rows[last - 1]):
+            last -= 1
+        start = max(last, r0)
+        width = max((len(row) for row in values), default=0)
+        grid = sheet.properties["gridProperties"]
+        grid["rowCount"] = max(grid["rowCount"], start + len(values))
+        grid["columnCount"] = max(grid["columnCount"], c0 + width)
+        spreadsheet.check_cell_limit()
+        anchor = f"'{sheet.title}'!{_a1(start, c0)}"
+        return {"spreadsheetId": spreadsheet.id, "tableRange": range_name,
+                "updates": self._write_values(spreadsheet, anchor, values, input_option, None, stats)}
+
+    def _clear(self, spreadsheet, range_name):
+        sheet, r0, c0, r1, c1 = spreadsheet.resolve(range_name)
+        end_r, end_c = sheet.used_bounds(r0, c0, r1, c1)
+        for r in range(r0, end_r):
+            for c in range(c0, end_c):
+                sheet.set(r, c, None)
+        return range_name
+
+    # ── spreadsheets.batchUpdate ────────────────────
+
+    def _batch_update(self, spreadsheet, requests_list, stats):
+        stats["batch_requests"] += len(requests_list)
+        replies = []
+        for i, request in enumerate(requests_list):
+            (kind, spec), = request.items()
+            handler = getattr(self, f"_req_{kind}", None)
+            if handler is None:
+                if kind not in FORMAT_REQUESTS:
+                    raise SheetsError(400, f"Invalid requests[{i}]: 대역이 지원하지 않는 요청 {kind}")
+                self._check_format_range(spreadsheet, kind, spec, i)
+                replies.append({})
+                continue
+            replies.append(handler(spreadsheet, spec) or {})
+        return {"spreadsheetId": spreadsheet.id, "replies": replies}
+
+    def _check_format_range(self, spreadsheet, kind, spec, i):
+        """서식 요청: 범위가 시트 안에 있는지만 검사 (표시값에는 반영 안 함)"""
+        grid = spec.get("range") or spec.get("properties") or {}
+        if "sheetId" not in grid:
+            return
+        sheet = spreadsheet.by_id(grid["sheetId"])
+        if grid.get("dimension") == "ROWS":
+            end_r, end_c = grid.get("endIndex", 0), 0
+        elif grid.get("dimension") == "COLUMNS":
+            end_r, end_c = 0, grid.get("endIndex", 0)
+        else:
+            end_r, end_c = grid.get("endRowIndex", 0), grid.get("endColumnIndex", 0)
+        if end_r > sheet.row_count or end_c > sheet.column_count:
+            raise SheetsError(400, f"Invalid requests[{i}].{kind}: range exceeds grid limits "
+                                   f"(rows {sheet.row_count}, columns {sheet.column_count})")
+
+    def _req_addSheet(self, spreadsheet, spec):
+        props = spec.get("properties", {})
+        grid = props.get("gridProperties", {})
+        sheet = spreadsheet.add_sheet(
+            props.get("title") or f"시트{len(spreadsheet.sheets) + 1}",
+            rows=grid.get("rowCount", 1000),
+            cols=grid.get("columnCount", 26),
+            index=props.get("index"),
+            sheet_id=props.get("sheetId"),
+        )
+        return {"addSheet": {"properties": json_copy(sheet.properties)}}
+
+    def _req_deleteSheet(self, spreadsheet, spec):
+        spreadsheet.sheets.remove(spreadsheet.by_id(spec["sheetId"]))
+
+    def _req_updateSheetProperties(self, spreadsheet, spec):
+        props = spec.get("properties", {})
+        sheet = spreadsheet.by_id(props.get("sheetId"))
+        _merge(sheet.properties, {k: v for k, v in props.items() if k != "sheetId"})
+        spreadsheet.check_cell_limit()
+
+    def _req_appendDimension(self, spreadsheet, spec):
+        sheet = spreadsheet.by_id(spec["sheetId"])
+        key = "rowCount" if spec["dimension"] == "ROWS" else "columnCount"
+        sheet.properties["gridProperties"][key] += spec["length"]
+        spreadsheet.check_cell_limit()
+
+    def _req_insertDimension(self, spreadsheet, spec):
+        rng = spec["range"]
+        sheet = spreadsheet.by_id(rng["sheetId"])
+        start, count = rng["startIndex"], rng["endIndex"] - rng["startIndex"]
+        if rng["dimension"] == "ROWS":
+            sheet.rows[start:start] = [[] for _ in range(count)] if start < len(sheet.rows) else []
+            sheet.properties["gridProperties"]["rowCount"] += count
+        else:
+            for row in sheet.rows:
+                if start < len(row):
+                    row[start:start] = [None] * count
+            sheet.properties["gridProperties"]["columnCount"] += count
+        spreadsheet.check_cell_limit()
+
+    def _req_deleteDimension(self, spreadsheet, spec):
+        rng = spec["range"]
+        sheet = spreadsheet.by_id(rng["sheetId"])
+        start, end = rng["startIndex"], rng["endIndex"]
+        if rng["dimension"] == "ROWS":
+            del sheet.rows[start:end]
+            sheet.properties["gridProperties"]["rowCount"] -= end - start
+        else:
+            for row in sheet.rows:
+                del row[start:end]
+            sheet.properties["gridProperties"]["columnCount"] -= end - start
+
+    def _req_createDeveloperMetadata(self, spreadsheet, spec):
+        meta = json_copy(spec["developerMetadata"])
+        sheet = spreadsheet.by_id(meta.get("location", {}).get("sheetId"))
+        meta["metadataId"] = meta.get("metadataId") or spreadsheet.next_metadata_id
+        spreadsheet.next_metadata_id = max(spreadsheet.next_metadata_id, meta["metadataId"]) + 1
+        meta["location"] = {"locationType": "SHEET", "sheetId": sheet.properties["sheetId"]}
+        sheet.developer_metadata.append(meta)
+        return {"createDeveloperMetadata": {"developerMetadata": json_copy(meta)}}
+
+    def _matching_metadata(self, spreadsheet, data_filters):
+        ids = {f.get("developerMetadataLookup", {}).get("metadataId") for f in data_filters}
+        keys = {f.get("developerMetadataLookup", {}).get("metadataKey") for f in data_filters}
+        for sheet in spreadsheet.sheets:
+            for meta in sheet.developer_metadata:
+                if meta["metadataId"] in ids or meta["metadataKey"] in keys:
+                    yield sheet, meta
+
+    def _req_updateDeveloperMetadata(self, spreadsheet, spec):
+        fields = [f.strip() for f in spec.get("fields", "").split(",") if f.strip()]
+        updated = []
+        for _, meta in self._matching_metadata(spreadsheet, spec.get("dataFilters", [])):
+            for field in fields:
+                if field in spec["developerMetadata"]:
+                    meta[field] = spec["developerMetadata"][field]
+            updated.append(json_copy(meta))
+        return {"updateDeveloperMetadata": {"developerMetadata": updated}}
+
+    def _req_deleteDeveloperMetadata(self, spreadsheet, spec):
+        deleted = []
+        for sheet, meta in list(self._matching_metadata(spreadsheet, [spec.get("dataFilter", {})])):
+            sheet.developer_metadata.remove(meta)
+            deleted.append(meta)
+        return {"deleteDeveloperMetadata": {"deletedDeveloperMetadata": deleted}}
+
+
+# 값에는 영향이 없고 범위만 검사하는 서식 요청
+FORMAT_REQUESTS = {
+    "repeatCell", "updateBorders", "updateDimensionProperties", "setDataValidation",
+    "mergeCells", "unmergeCells", "addConditionalFormatRule", "deleteConditionalFormatRule",
+    "setBasicFilter", "clearBasicFilter", "autoResizeDimensions",
+}
+
+
+def _loads(data):
+    if not data:
+        return None
+    return json.loads(data.decode("utf-8") if isinstance(data, bytes) else data)
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_copy(obj):
+    return json.loads(json.dumps(obj))
+
+
+def _merge(target, updates):
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _trim(grid):
+    """values API처럼 각 행 끝의 빈칸과 끝의 빈 행 제거"""
+    out = []
+    for row in grid:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
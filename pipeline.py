@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인용 스트리밍 도구
+  prefetch     : 생성기를 별도 스레드에서 미리 돌려 크기 제한 큐로 넘김 (게시물 목록 페이지 요청과 인사이트 요청을 겹침)
+  ordered_map  : 스레드 풀로 동시에 처리하되 결과는 입력 순서대로, 진행 중인 작업 수는 window개 이하
+둘 다 입력을 끝까지 미리 읽지 않으므로 게시물 수와 무관하게 중간 데이터가 일정 크기로 유지됨
+"""
+
+import queue
+import threading
+from collections import deque
+
+_END = object()
+
+
+def prefetch(iterable, maxsize):
+    """iterable을 별도 스레드에서 읽어 최대 maxsize개까지 먼저 받아 둠
+
+    생산자 쪽 예외는 소비자 쪽에서 다시 발생하고, 소비자가 중간에 멈추면 생산자 스레드도 정리된다.
+    """
+    q = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_END, e))
+            return
+        put((_END, None))
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = q.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def ordered_map(fn, iterable, pool=None, window=1):
+    """fn(item) 결과를 입력 순서대로 생성 (pool이 있으면 최대 window개를 동시에 처리)"""
+    if pool is None:
+        for item in iterable:
+            yield fn(item)
+        return
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+게시물별 지표 변화 이력 (docs/data/post_history.jsonl) — posts_yesterday.json 전체 복사 대체
+하루 한 줄씩 추가하고, 전날과 달라진 지표만 기록 (키: 게시물 shortcode)
+
+  키프레임: {"date", "key": true, "fields": [...], "posts": {shortcode: [값, ...]}}
+  변경분:   {"date", "posts": {shortcode: [필드 번호, 값, 필드 번호, 값, ...]}, "removed": [shortcode, ...]}
+
+KEYFRAME_INTERVAL일마다 전체 값을 담은 키프레임을 넣어서, 임의의 날짜는
+그 이전 마지막 키프레임 + 이후 변경분만 적용해 복원한다 (대시보드의 전일 / N일 전 비교).
+
+대시보드는 전체 파일 대신 키프레임마다 나눈 조각(post_history/<키프레임 날짜>.jsonl)과
+목록(post_history/index.json)을 읽어서 비교 날짜가 속한 조각 하나만 받는다.
+"""
+
+import json
+import os
+import re
+
+HISTORY_FILE = "post_history.jsonl"
+KEYFRAME_INTERVAL = 7
+
+SEGMENT_DIR = "post_history"
+SEGMENT_INDEX = "index.json"
+
+# 게시물별로 날마다 바뀌는 지표 (제목·카테고리 등은 posts.json의 현재 값 사용)
+# 계정 전체 값인 followers와 그걸로 계산하는 follower_reach_rate는 followers.json에서 다시 구함
+HISTORY_FIELDS = [
+    "rank", "reach", "views", "likes", "saves", "shares", "comments",
+    "total_interactions", "engagement_count", "engagement_rate", "save_rate", "share_rate",
+    "profile_visits", "profile_activity", "follows", "composite_score",
+]
+
+SHORTCODE_RE = re.compile(r"instagram\.com/(?:p|reel|[^/]+/reel)/([A-Za-z0-9_-]+)")
+
+
+def shortcode(url):
+    m = SHORTCODE_RE.search(url or "")
+    return m.group(1) if m else None
+
+
+def _compact(val):
+    return int(val) if isinstance(val, float) and val.is_integer() else val
+
+
+def post_metrics(posts, fields=HISTORY_FIELDS):
+    """posts.json 항목 → {shortcode: [지표 값, ...]} (URL에서 shortcode를 못 찾으면 제외)"""
+    state = {}
+    for post in posts:
+        code = shortcode(post.get("url"))
+        if code:
+            state[code] = [_compact(post.get(f)) for f in fields]
+    return state
+
+
+def read_history(path):
+    """이력 파일 → 날짜순 항목 목록 (쓰다 만 줄은 무시)"""
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def apply_entry(state, fields, entry):
+    """state({shortcode: [값]})에 항목 하나 적용 → (state, fields)"""
+    if entry.get("key"):
+        return {code: list(values) for code, values in entry["posts"].items()}, entry["fields"]
+    for code in entry.get("removed", []):
+        state.pop(code, None)
+    for code, pairs in entry["posts"].items():
+        values = state.setdefault(code, [None] * len(fields))
+        for i in range(0, len(pairs), 2):
+            values[pairs[i]] = pairs[i + 1]
+    return state, fields
+
+
+def state_at(entries, date=None):
+    """date(YYYY-MM-DD) 이전 마지막 기록 시점의 값 → (기록 날짜, 필드 목록, {shortcode: [값]})
+
+    마지막 키프레임부터만 적용하므로 이력이 길어도 최대 KEYFRAME_INTERVAL개 항목만 읽는다.
+    """
+    end = len(entries)
+    if date is not None:
+        end = next((i for i, e in enumerate(entries) if e["date"] > date), len(entries))
+    start = next((i for i in range(end - 1, -1, -1) if entries[i].get("key")), None)
+    if start is None:
+        return None, HISTORY_FIELDS, {}
+    state, fields = {}, HISTORY_FIELDS
+    for entry in entries[start:end]:
+        state, fields = apply_entry(state, fields, entry)
+    return entries[end - 1]["date"], fields, state
+
+
+def diff_entry(date, previous, current):
+    """전날 값과 비교해 달라진 필드만 담은 변경분 항목"""
+    posts = {}
+    for code, values in current.items():
+        old = previous.get(code)
+        pairs = []
+        for i, val in enumerate(values):
+            if (old[i] if old else None) != val:
+                pairs += [i, val]
+        if pairs:
+            posts[code] = pairs
+    removed = sorted(code for code in previous if code not in current)
+    entry = {"date": date, "posts": posts}
+    if removed:
+        entry["removed"] = removed
+    return entry
+
+
+def append_day(path, date, posts, keyframe_interval=KEYFRAME_INTERVAL):
+    """오늘(date) 값을 이력에 추가 → 추가한 항목
+
+    같은 날 다시 실행하면 그날 항목을 새 값으로 교체 (파일을 다시 씀), 그 외에는 한 줄만 추가.
+    마지막 키프레임 이후 keyframe_interval개 항목이 쌓였거나 필드 구성이 바뀌면 키프레임으로 기록.
+    """
+    entries = read_history(path)
+    # 같은 날 재실행 / 쓰다 만 마지막 줄이 있으면 파일을 다시 씀
+    rewrite = (bool(entries) and entries[-1]["date"] >= date) or not _ends_cleanly(path)
+    while entries and entries[-1]["date"] >= date:
+        entries.pop()
+
+    current = post_metrics(posts)
+    _, fields, previous = state_at(entries)
+    since_key = next((n for n, e in enumerate(reversed(entries)) if e.get("key")), None)
+    if since_key is None or since_key + 1 >= keyframe_interval or fields != HISTORY_FIELDS:
+        entry = {"date": date, "key": True, "fields": HISTORY_FIELDS, "posts": current}
+    else:
+        entry = diff_entry(date, previous, current)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if rewrite:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for e in entries + [entry]:
+                f.write(_line(e))
+        os.replace(tmp_path, path)
+    else:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(_line(entry))
+    return entry
+
+
+def _ends_cleanly(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return True
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _line(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def write_segments(entries, data_dir):
+    """이력을 키프레임마다 나눈 조각 파일 + 목록으로 저장 → 목록 항목 [{"file", "dates"}] (오래된 조각부터)
+
+    키프레임 전의 변경분(키프레임 도입 전 기록)은 복원할 수 없으므로 제외.
+    지난 조각은 내용이 그대로라 커밋 diff가 없고, 목록에 없는 예전 조각 파일은 삭제한다.
+    """
+    segment_dir = os.path.join(data_dir, SEGMENT_DIR)
+    os.makedirs(segment_dir, exist_ok=True)
+    segments = []
+    for entry in entries:
+        if entry.get("key"):
+            segments.append([])
+        if segments:
+            segments[-1].append(entry)
+
+    index, keep = [], {SEGMENT_INDEX}
+    for segment in segments:
+        filename = f"{segment[0]['date']}.jsonl"
+        content = "".join(_line(e) for e in segment)
+        path = os.path.join(segment_dir, filename)
+        if not os.path.exists(path) or _read_text(path) != content:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        keep.add(filename)
+        index.append({"file": f"{SEGMENT_DIR}/{filename}", "dates": [e["date"] for e in segment]})
+    with open(os.path.join(segment_dir, SEGMENT_INDEX), "w", encoding="utf-8") as f:
+        json.dump({"segments": index}, f, ensure_ascii=False, separators=(",", ":"))
+    for name in os.listdir(segment_dir):
+        if name not in keep:
+            os.remove(os.path.join(segment_dir, name))
+    return index
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+대시보드 KPI / 요일별 차트용 기간 집계 (docs/data/rollups.json)
+브라우저가 필터를 바꿀 때마다 전체 게시물을 다시 훑던 계산을 내보내기 때 한 번만 해 둠
+
+  {"format": 1, "updated_at", "milestone_date", "fields": [...], "titles": [...],
+   "groups": {마일스톤: {유형: {"total", "year", "month", "week", "day", "dow"}}}}
+
+  마일스톤: all / before / after (MILESTONE_DATE 기준, 대시보드 필터와 같음)
+  유형:     ALL + 게시물 media_type별
+  집계 값:  fields 순서의 배열 (게시물 수, TOP 게시물 제목의 titles 번호, 합계, 값 없는 게시물 수 …)
+            평균은 대시보드에서 합계 ÷ 개수로 계산
+  week:     "YYYY-MM-i" (그 달의 i번째 주, 월요일 시작 — app.js getWeeksInMonth와 같은 구간)
+  dow:      {"all" 또는 "YYYY-MM": [월~일 7개 집계, 게시물 없는 요일은 null]}
+  before / after 그룹은 마일스톤 날짜가 걸친 기간만 저장 (빈 배열은 게시물 없음) — 없는 키는
+  기간 시작일이 그쪽이면 all 그룹의 값, 아니면 게시물 없음
+"""
+
+import operator
+import re
+from datetime import date, timedelta
+
+ROLLUPS_FILE = "rollups.json"
+ROLLUP_FORMAT = 1
+MILESTONE_DATE = date(2025, 12, 26)
+MILESTONES = ("all", "before", "after")
+
+# 합계 (값이 없으면 0으로 더함) — engagement는 좋아요 + 저장 + 공유 + 댓글
+SUM_FIELDS = ["reach", "views", "likes", "saves", "shares", "comments", "engagement", "follows"]
+RATE_FIELDS = ["engagement_rate", "save_rate", "share_rate"]
+# 값이 없는 게시물 수 (평균의 분모 = posts - 이 값)
+MISSING_FIELDS = ["reach", "views", "likes", "saves", "shares", "comments"] + RATE_FIELDS
+# 값이 0이거나 없는 게시물 수 (요일별·일별 차트는 0이 아닌 값만 평균)
+ZERO_FIELDS = ["reach", "engagement_rate"]
+
+# 뒤쪽 개수 필드는 대부분 0 → 배열 끝의 0은 생략 (대시보드는 없는 값을 0으로 읽음)
+ROLLUP_FIELDS = (
+    ["posts", "top"] + SUM_FIELDS + RATE_FIELDS
+    + [f"missing_{f}" for f in MISSING_FIELDS]
+    + [f"zero_{f}" for f in ZERO_FIELDS]
+)
+
+
+def upload_date(post):
+    """upload_date "26.02.07(토)" → date (형식이 다르면 None)"""
+    m = re.match(r"(\d{2})\.(\d{2})\.(\d{2})", post.get("upload_date") or "")
+    if not m:
+        return None
+    try:
+        return date(2000 + int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return None
+
+
+def week_index(d):
+    """그 달에서 몇 번째 주인지 (1일이 속한 주가 0, 이후 월요일마다 1씩 증가)"""
+    first = d.replace(day=1)
+    first_monday = first + timedelta(days=(7 - first.weekday()) % 7 or 7)
+    return 0 if d < first_monday else 1 + (d - first_monday).days // 7
+
+
+def _contribution(post):
+    """게시물 하나가 집계에 더하는 값 (ROLLUP_FIELDS에서 top을 뺀 순서)"""
+    engagement = sum(post.get(f) or 0 for f in ("likes", "saves", "shares", "comments"))
+    return (
+        [1]
+        + [engagement if f == "engagement" else post.get(f) or 0 for f in SUM_FIELDS + RATE_FIELDS]
+        + [1 if post.get(f) is None else 0 for f in MISSING_FIELDS]
+        + [0 if post.get(f) else 1 for f in ZERO_FIELDS]
+    )
+
+
+class _Rollup:
+    """게시물을 하나씩 더해 가는 집계 (게시물 순서대로 더해서 대시보드의 합계와 같은 부동소수점 값)"""
+
+    def __init__(self):
+        self.values = [0] * (len(ROLLUP_FIELDS) - 1)
+        self.top = None  # 종합순위 1위, 없으면 도달이 가장 큰 첫 게시물
+        self.top_reach = None
+
+    def add(self, post, contribution):
+        self.values = list(map(operator.add, self.values, contribution))
+        if self.top is None or self.top.get("rank") != 1:
+            if post.get("rank") == 1 or self.top_reach is None or (post.get("reach") or 0) > self.top_reach:
+                self.top, self.top_reach = post, post.get("reach") or 0
+
+    def to_list(self, titles):
+        top = titles.setdefault(self.top.get("title") or "", len(titles)) if self.top is not None else None
+        values = [self.values[0], top] + [_compact(v) for v in self.values[1:]]
+        while len(values) > 2 and values[-1] == 0:
+            values.pop()
+        return values
+
+
+def _compact(val):
+    # 반올림하지 않음 → 대시보드가 게시물로 직접 더한 값과 비트 단위로 같음
+    return int(val) if isinstance(val, float) and val.is_integer() else val
+
+
+def _period_keys(d):
+    """게시물 날짜 → (기간 종류, 키) 목록 (dow는 월별 요일 집계의 키)"""
+    month = f"{d.year}-{d.month:02d}"
+    return [("year", str(d.year)), ("month", month), ("week", f"{month}-{week_index(d)}"), ("day", d.isoformat()), ("dow", month)]
+
+
+# 마일스톤 날짜가 걸친 기간 — before / after 그룹은 이 기간만 따로 집계
+MILESTONE_PERIODS = set(_period_keys(MILESTONE_DATE))
+
+
+def _in_milestone(milestone, d):
+    if milestone == "all":
+        return True
+    if d is None:
+        return False
+    return d < MILESTONE_DATE if milestone == "before" else d >= MILESTONE_DATE
+
+
+def _new_group():
+    return {"total": _Rollup(), "year": {}, "month": {}, "week": {}, "day": {}, "dow": {}}
+
+
+def build_rollups(posts, updated_at=None):
+    """posts.json 항목 → rollups.json 내용 (게시물 순서대로 더해서 대시보드의 계산과 같은 결과)"""
+    groups = {}
+    for post in posts:
+        d = upload_date(post)
+        contribution = _contribution(post)
+        periods = _period_keys(d) if d is not None else []
+        media_type = post.get("media_type") or "OTHER"
+        for milestone in MILESTONES:
+            if not _in_milestone(milestone, d):
+                continue
+            for kind in ("ALL", media_type):
+                group = groups.setdefault(milestone, {}).setdefault(kind, _new_group())
+                group["total"].add(post, contribution)
+                if d is None:
+                    continue
+                for period, key in periods:
+                    if milestone != "all" and (period, key) not in MILESTONE_PERIODS:
+                        continue
+                    if period == "dow":
+                        _add_dow(group["dow"], key, d, post, contribution)
+                    else:
+                        group[period].setdefault(key, _Rollup()).add(post, contribution)
+                _add_dow(group["dow"], "all", d, post, contribution)
+
+    titles = {}
+
+    def encode(group):
+        out = {"total": group["total"].to_list(titles)}
+        for period in ("year", "month", "week", "day"):
+            out[period] = {key: r.to_list(titles) for key, r in sorted(group[period].items())}
+        out["dow"] = {
+            scope: [r.to_list(titles) if r is not None else None for r in days]
+            for scope, days in sorted(group["dow"].items())
+        }
+        return out
+
+    encoded = {"all": {kind: encode(g) for kind, g in sorted(groups.get("all", {}).items())}}
+    # before / after는 마일스톤 날짜가 걸친 기간과 dow "all"만 저장 (그쪽에 게시물이 없으면 빈 배열)
+    for milestone in MILESTONES[1:]:
+        encoded[milestone] = {}
+        for kind, full in encoded["all"].items():
+            part = encode(groups.get(milestone, {}).get(kind) or _new_group())
+            kept = {"total": part["total"]}
+            for period in ("year", "month", "week", "day", "dow"):
+                kept[period] = {
+                    key: part[period].get(key, [])
+                    for key in full[period]
+                    if (period, key) in MILESTONE_PERIODS or (period, key) == ("dow", "all")
+                }
+            encoded[milestone][kind] = kept
+
+    return {
+        "format": ROLLUP_FORMAT,
+        "updated_at": updated_at,
+        "milestone_date": MILESTONE_DATE.isoformat(),
+        "fields": ROLLUP_FIELDS,
+        "groups": encoded,
+        "titles": list(titles),
+    }
+
+
+def _add_dow(dow, scope, d, post, contribution):
+    days = dow.setdefault(scope, [None] * 7)
+    if days[d.weekday()] is None:
+        days[d.weekday()] = _Rollup()
+    days[d.weekday()].add(post, contribution)
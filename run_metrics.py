@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+실행 1회의 단계별 성능 기록 (소요 시간 / API 호출 수 / 재시도 / 송수신 바이트 / 요청 지연 p50·p95·최대)
+docs/data/run_metrics.json(최근 실행) + run_metrics_history.jsonl(실행마다 한 줄 추가)로 저장
+
+API 호출은 requests 세션의 응답 훅으로 기록한다.
+  - Graph: 계정별 GraphClient 세션 → 그 클라이언트의 metrics
+  - Sheets: 모든 계정이 공유하는 gspread 세션 → 현재 스레드에서 activate()한 metrics
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+# 단계 이름 → 출력용 한국어 이름 (보고서의 단계 순서)
+STAGE_LABELS = {
+    "token_check": "토큰 확인",
+    "media_listing": "게시물 목록",
+    "insights": "인사이트",
+    "rows": "행 생성",
+    "sheet_read": "시트 읽기",
+    "sheet_write": "시트 기록",
+    "follower_tracking": "팔로워추적",
+    "daily_report": "일별종합리포트",
+    "export": "JSON 내보내기",
+}
+
+REPORT_FILE = "run_metrics.json"
+HISTORY_FILE = "run_metrics_history.jsonl"
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 pct 백분위수 (nearest-rank, 값이 없으면 None)"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class RunMetrics:
+    """계정 1개 실행의 단계별 기록 (워커 스레드에서 동시에 기록해도 안전)
+
+    단계는 계정마다 순서대로 진행되므로, 스레드 풀의 요청도 현재 단계(current)로 집계한다.
+    다른 단계와 겹쳐서 도는 스레드(게시물 목록 미리 받기 등)는 background_stage()로 그 스레드의 요청만 따로 집계한다.
+    """
+
+    def __init__(self, account=None):
+        self.account = account
+        self.started_at = datetime.now(KST)
+        self.started = time.perf_counter()
+        self.finished = None
+        self.stages = {}
+        self.current = None
+        self.extra = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def _entry(self, name):
+        if name not in self.stages:
+            self.stages[name] = {
+                "seconds": 0.0, "api_calls": 0, "errors": 0, "retries": 0,
+                "bytes_out": 0, "bytes_in": 0, "latencies": [],
+            }
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name):
+        previous = self.current
+        with self.lock:
+            entry = self._entry(name)
+        self.current = name
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                entry["seconds"] += elapsed
+            self.current = previous
+
+    @contextmanager
+    def background_stage(self, name):
+        """이 스레드에서 보내는 요청만 name 단계로 기록 (소요 시간은 다른 단계와 겹칠 수 있음)"""
+        with self.lock:
+            entry = self._entry(name)
+        self._local.stage = name
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                entry["seconds"] += elapsed
+            self._local.stage = None
+
+    def _current(self):
+        return getattr(self._local, "stage", None) or self.current or "other"
+
+    def record_request(self, latency, bytes_out=0, bytes_in=0, error=False):
+        with self.lock:
+            entry = self._entry(self._current())
+            entry["api_calls"] += 1
+            entry["errors"] += int(error)
+            entry["bytes_out"] += bytes_out
+            entry["bytes_in"] += bytes_in
+            entry["latencies"].append(latency)
+
+    def record_retry(self):
+        with self.lock:
+            self._entry(self._current())["retries"] += 1
+
+    def finish(self, **extra):
+        """실행 종료 시각 + 게시물 수 등 부가 정보 기록"""
+        self.finished = time.perf_counter()
+        self.extra.update(extra)
+
+    def report(self):
+        """JSON으로 저장할 보고서 (지연 시간 목록 대신 p50 / p95 / 최대, 밀리초)"""
+        finished = self.finished or time.perf_counter()
+        order = list(STAGE_LABELS) + [name for name in self.stages if name not in STAGE_LABELS]
+        stages = {}
+        totals = {"seconds": round(finished - self.started, 3), "api_calls": 0, "errors": 0, "retries": 0,
+                  "bytes_out": 0, "bytes_in": 0}
+        with self.lock:
+            for name in order:
+                if name not in self.stages:
+                    continue
+                entry = self.stages[name]
+                latencies = sorted(entry["latencies"])
+                stages[name] = {
+                    "seconds": round(entry["seconds"], 3),
+                    "api_calls": entry["api_calls"],
+                    "errors": entry["errors"],
+                    "retries": entry["retries"],
+                    "bytes_out": entry["bytes_out"],
+                    "bytes_in": entry["bytes_in"],
+                    "latency_ms": {
+                        "p50": _ms(percentile(latencies, 50)),
+                        "p95": _ms(percentile(latencies, 95)),
+                        "max": _ms(latencies[-1] if latencies else None),
+                    },
+                }
+                for key in ("api_calls", "errors", "retries", "bytes_out", "bytes_in"):
+                    totals[key] += entry[key]
+        return {
+            "account": self.account,
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            **self.extra,
+            "total": totals,
+            "stages": stages,
+        }
+
+    def summary_lines(self):
+        report = self.report()
+        lines = []
+        for name, s in report["stages"].items():
+            latency = s["latency_ms"]
+            line = f"  {STAGE_LABELS.get(name, name)}: {s['seconds']:.1f}초"
+            if s["api_calls"]:
+                line += (f" | 호출 {s['api_calls']:,}회 (재시도 {s['retries']}) | "
+                         f"수신 {s['bytes_in'] / 1024:,.0f}KB | p50 {latency['p50']:.0f}ms p95 {latency['p95']:.0f}ms")
+            lines.append(line)
+        total = report["total"]
+        lines.append(f"  전체: {total['seconds']:.1f}초 | 호출 {total['api_calls']:,}회 (재시도 {total['retries']})")
+        return lines
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def write_report(report, data_dir):
+    """run_metrics.json 덮어쓰기 + run_metrics_history.jsonl에 한 줄 추가"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, REPORT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    with open(os.path.join(data_dir, HISTORY_FILE), "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def stage(metrics, name):
+    """metrics가 없으면 아무것도 하지 않는 단계 컨텍스트"""
+    return metrics.stage(name) if metrics else nullcontext()
+
+
+def background_stage(metrics, name):
+    """metrics가 없으면 아무것도 하지 않는 스레드별 단계 컨텍스트"""
+    return metrics.background_stage(name) if metrics else nullcontext()
+
+
+# ─── 요청 기록 (requests 응답 훅) ──────────────────────────
+
+_local = threading.local()
+
+
+@contextmanager
+def activate(metrics):
+    """이 스레드의 공유 세션(gspread) 요청을 metrics에 기록"""
+    previous = getattr(_local, "metrics", None)
+    _local.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        _local.metrics = previous
+
+
+def active():
+    return getattr(_local, "metrics", None)
+
+
+def _request_size(request):
+    body = request.body or b""
+    return len(request.url or "") + len(body.encode("utf-8") if isinstance(body, str) else body)
+
+
+def _response_size(resp):
+    """응답 크기 (압축 전송이면 Content-Length 기준, 없으면 본문 길이)"""
+    length = resp.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else len(resp.content)
+
+
+def install_session_hook(session, resolve):
+    """requests 세션의 모든 응답을 resolve()가 돌려주는 RunMetrics에 기록 (None이면 기록 안 함)"""
+    def hook(resp, *args, **kwargs):
+        metrics = resolve()
+        if metrics is not None:
+            metrics.record_request(
+                resp.elapsed.total_seconds(),
+                bytes_out=_request_size(resp.request),
+                bytes_in=_response_size(resp),
+                error=resp.status_code >= 400,
+            )
+        return resp
+
+    session.hooks.setdefault("response", []).append(hook)
+    return hook
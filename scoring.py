@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+종합점수 + 순위 계산 (NumPy 벡터 연산)
+지표별 최댓값으로 정규화 → 가중합 → 순위를 배열 연산 한 번에 처리
+그룹(계정 등)을 주면 그룹마다 따로 정규화·순위 매김
+
+사용 예 (API 호출 없이 posts.json을 다른 가중치로 다시 채점):
+  python scoring.py docs/data/posts.json --weights shares=40,saves=30,reach=20,engagement_rate=10
+  python scoring.py docs/data/posts.json --group-by media_type --top 5
+  python scoring.py docs/data/posts.json --weights reach=50,follows=50 --write
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from snapshot_store import METRIC_COLUMNS
+
+# 팔로워 성장 최적화 가중치 (바이럴·알고리즘 추천 중심)
+#   공유(30%) + 저장(25%) + 도달(25%) + 참여율(20%)
+DEFAULT_WEIGHTS = {"shares": 30, "saves": 25, "reach": 25, "engagement_rate": 20}
+
+# 지표 이름 → 자동수집 행(A~X열) 인덱스
+ROW_INDEX = {name: idx for name, idx, _ in METRIC_COLUMNS}
+
+
+def _row_value(val):
+    """시트 행 값 → 숫자 ('5.2%' → 5.2, 빈칸·문자 → 0)"""
+    if isinstance(val, str) and val.endswith("%"):
+        try:
+            return float(val[:-1])
+        except ValueError:
+            return 0
+    return val if isinstance(val, (int, float)) else 0
+
+
+def parse_weights(text):
+    """'shares=30,saves=25' → {"shares": 30.0, "saves": 25.0} (빈 값이면 기본 가중치)"""
+    if not text or not text.strip():
+        return dict(DEFAULT_WEIGHTS)
+    weights = {}
+    for part in text.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in ROW_INDEX:
+            raise ValueError(f"알 수 없는 지표: {name} (가능: {', '.join(ROW_INDEX)})")
+        try:
+            weights[name] = float(value)
+        except ValueError:
+            raise ValueError(f"가중치가 숫자가 아닙니다: {part.strip()}") from None
+    return weights
+
+
+def score(matrix, weights, groups=None):
+    """지표 행렬 (게시물 수 × 지표 수) → (종합점수, 순위) 배열
+
+    - 지표별 최댓값으로 나눠 0~1로 정규화 (최댓값이 0이면 1로 나눔)
+    - 가중합을 소수 첫째 자리로 반올림
+    - 점수 높은 순으로 1부터 순위 (동점은 원래 순서)
+    groups: 게시물별 그룹 값 — 있으면 정규화·순위를 그룹 안에서만 계산
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=int)
+    if groups is None:
+        inverse = np.zeros(n, dtype=int)
+        group_count = 1
+    else:
+        _, inverse = np.unique(np.asarray(groups), return_inverse=True)
+        inverse = inverse.reshape(-1)
+        group_count = inverse.max() + 1
+
+    maxima = np.zeros((group_count, matrix.shape[1]))
+    np.maximum.at(maxima, inverse, matrix)
+    maxima[maxima == 0] = 1
+    scores = np.round((matrix / maxima[inverse]) @ weights, 1)
+
+    # 그룹 → 점수 내림차순 → 원래 순서로 정렬한 뒤 그룹 시작 위치 기준으로 순위
+    positions = np.arange(n)
+    order = np.lexsort((positions, -scores, inverse))
+    sorted_groups = inverse[order]
+    group_start = np.zeros(n, dtype=int)
+    boundaries = np.flatnonzero(sorted_groups[1:] != sorted_groups[:-1]) + 1
+    group_start[boundaries] = boundaries
+    group_start = np.maximum.accumulate(group_start)
+    ranks = np.empty(n, dtype=int)
+    ranks[order] = positions - group_start + 1
+    return scores, ranks
+
+
+def _metric_matrix(records, weights, get):
+    names = list(weights)
+    matrix = np.array(
+        [[get(record, name) or 0 for name in names] for record in records],
+        dtype=float,
+    ).reshape(len(records), len(names))
+    return matrix, np.array([weights[name] for name in names], dtype=float)
+
+
+def score_rows(rows, weights=None, groups=None):
+    """자동수집 행 목록에 종합점수(X열)와 순위(D열) 기록 (행을 직접 수정)"""
+    weights = weights or DEFAULT_WEIGHTS
+    matrix, w = _metric_matrix(rows, weights, lambda row, name: _row_value(row[ROW_INDEX[name]]))
+    scores, ranks = score(matrix, w, groups)
+    for row, s, rank in zip(rows, scores.tolist(), ranks.tolist()):
+        row[23] = s
+        row[3] = rank
+    return rows
+
+
+def score_posts(posts, weights=None, group_by=None):
+    """posts.json 항목 목록에 composite_score / rank 다시 계산 (항목을 직접 수정)"""
+    weights = weights or DEFAULT_WEIGHTS
+    matrix, w = _metric_matrix(posts, weights, lambda post, name: post.get(name))
+    groups = [str(post.get(group_by, "")) for post in posts] if group_by else None
+    scores, ranks = score(matrix, w, groups)
+    for post, s, rank in zip(posts, scores.tolist(), ranks.tolist()):
+        post["composite_score"] = s
+        post["rank"] = rank
+    return posts
+
+
+def main():
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs", "data", "posts.json")
+    parser = argparse.ArgumentParser(description="posts.json 종합점수 다시 계산 (API 호출 없음)")
+    parser.add_argument("posts", nargs="?", default=default_path)
+    parser.add_argument("--weights", default="", help="예: shares=30,saves=25,reach=25,engagement_rate=20")
+    parser.add_argument("--group-by", default=None, help="그룹별로 따로 순위 (예: media_type)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--write", action="store_true", help="계산 결과를 파일에 저장")
+    args = parser.parse_args()
+
+    weights = parse_weights(args.weights)
+    with open(args.posts, "r", encoding="utf-8") as f:
+        posts = json.load(f)
+    before = {post.get("url"): post.get("rank") for post in posts}
+    score_posts(posts, weights, args.group_by)
+
+    print(f"가중치: {', '.join(f'{k}={v:g}' for k, v in weights.items())}")
+    for post in sorted(posts, key=lambda p: (str(p.get(args.group_by, "")) if args.group_by else "", p["rank"])):
+        if post["rank"] > args.top:
+            continue
+        group = f"[{post.get(args.group_by, '')}] " if args.group_by else ""
+        prev = before.get(post.get("url"))
+        print(f"  {group}{post['rank']:>3}. {post['composite_score']:>5}  (기존 {prev})  {post.get('title', '')[:40]}")
+
+    if args.write:
+        with open(args.posts, "w", encoding="utf-8") as f:
+            json.dump(posts, f, ensure_ascii=False, indent=2)
+        print(f"저장 완료: {args.posts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+선언형 시트 서식 엔진
+열/구역 단위 서식 정의(레이아웃) → 병합된 최소 범위의 batchUpdate 요청으로 변환
+적용한 레이아웃의 지문(fingerprint)과 서식을 적용한 행 수를 시트 개발자 메타데이터에 저장해서
+레이아웃이 바뀐 시트만 전체 다시 서식 적용, 행만 늘어난 시트는 늘어난 행만 적용
+
+레이아웃 dict 키:
+  columns       서식 대상 열 개수
+  widths        열 너비 목록 (열 순서대로)
+  header        1행 서식 (userEnteredFormat)
+  header_height 1행 높이 (없으면 그대로 둠)
+  body          [(시작 열, 끝 열, 서식), ...] — 뒤의 항목이 앞의 항목을 덮어씀
+  overlays      [(시작 열, 끝 열, 부분 서식), ...] — 본문/하단 행에 지정한 키만 덧씌움 (숫자 형식 등)
+  footer        [서식, ...] — 마지막 행들(TOTAL/평균 등) 전체 열 서식, 위에서부터 순서대로
+  validations   [(시작 열, 끝 열, 규칙), ...] — 본문 행에만 적용
+  borders       테두리 적용 여부
+  frozen_rows   고정 행 수
+"""
+
+import hashlib
+import json
+
+# 개발자 메타데이터 키 (시트 단위)
+#   ROW_COUNT_KEY: 수집기가 기록한 데이터 행 수 (헤더/TOTAL/평균 포함) → 서식 적용 시 셀 값을 내려받지 않음
+#   FINGERPRINT_KEY: 마지막으로 적용한 레이아웃의 지문 (행 수와 무관)
+#   FORMATTED_ROWS_KEY: 마지막으로 서식을 적용한 행 수
+ROW_COUNT_KEY = "insights.row_count"
+FINGERPRINT_KEY = "insights.format_fingerprint"
+FORMATTED_ROWS_KEY = "insights.formatted_rows"
+
+METADATA_FIELDS = "developerMetadata(metadataId,metadataKey,metadataValue)"
+
+BORDER_OUTER = {"style": "SOLID", "color": {"red": 0.7, "green": 0.7, "blue": 0.7}}
+BORDER_INNER = {"style": "SOLID", "color": {"red": 0.85, "green": 0.85, "blue": 0.85}}
+
+
+def sheet_metadata(sheet):
+    """spreadsheets.get 응답의 시트 하나 → {키: (metadataId, 값)}"""
+    return {
+        m["metadataKey"]: (m["metadataId"], m.get("metadataValue", ""))
+        for m in sheet.get("developerMetadata", [])
+    }
+
+
+def metadata_request(sheet_id, key, value, existing):
+    """개발자 메타데이터 값 기록 요청 (있으면 update, 없으면 create)
+
+    existing: sheet_metadata() 결과
+    """
+    if key in existing:
+        return {
+            "updateDeveloperMetadata": {
+                "dataFilters": [{"developerMetadataLookup": {"metadataId": existing[key][0]}}],
+                "developerMetadata": {"metadataValue": str(value)},
+                "fields": "metadataValue",
+            }
+        }
+    return {
+        "createDeveloperMetadata": {
+            "developerMetadata": {
+                "metadataKey": key,
+                "metadataValue": str(value),
+                "location": {"sheetId": sheet_id},
+                "visibility": "DOCUMENT",
+            }
+        }
+    }
+
+
+def _runs(items):
+    """열별 값 목록 → 같은 값이 이어지는 구간 [(시작, 끝, 값), ...] (None은 건너뜀)"""
+    runs = []
+    for col, item in enumerate(items):
+        if item is None:
+            continue
+        if runs and runs[-1][1] == col and runs[-1][2] == item:
+            runs[-1] = (runs[-1][0], col + 1, item)
+        else:
+            runs.append((col, col + 1, item))
+    return runs
+
+
+def _column_formats(columns, body, overlays):
+    """열별 최종 서식 → [(fields, 서식 JSON) 또는 None, ...]
+
+    body 항목은 userEnteredFormat 전체를 바꾸고(뒤 항목 우선), overlays는 지정한 키만 바꾼다.
+    열 단위로 최종 결과를 먼저 계산하므로 겹치는 구역이 있어도 열마다 요청은 1개로 끝난다.
+    """
+    formats = [None] * columns
+    full = [False] * columns
+    for start, end, fmt in body:
+        for col in range(start, end):
+            formats[col] = dict(fmt)
+            full[col] = True
+    for start, end, fmt in overlays:
+        for col in range(start, end):
+            formats[col] = {**(formats[col] or {}), **fmt}
+    out = []
+    for col in range(columns):
+        if formats[col] is None:
+            out.append(None)
+            continue
+        if full[col]:
+            fields = "userEnteredFormat"
+        else:
+            fields = ",".join(f"userEnteredFormat.{k}" for k in sorted(formats[col]))
+        out.append((fields, json.dumps(formats[col], sort_keys=True)))
+    return out
+
+
+def _grid(sheet_id, row0, row1, col0, col1):
+    return {
+        "sheetId": sheet_id,
+        "startRowIndex": row0,
+        "endRowIndex": row1,
+        "startColumnIndex": col0,
+        "endColumnIndex": col1,
+    }
+
+
+def _repeat_cells(sheet_id, row0, row1, column_formats):
+    """행 구간 하나에 열별 서식 적용 — 서식이 같은 인접 열은 요청 1개로 합침"""
+    return [
+        {
+            "repeatCell": {
+                "range": _grid(sheet_id, row0, row1, start, end),
+                "cell": {"userEnteredFormat": json.loads(fmt)},
+                "fields": fields,
+            }
+        }
+        for start, end, (fields, fmt) in _runs(column_formats)
+    ]
+
+
+def _footer(layout, row_count):
+    """하단 행 서식 목록 (본문이 1행 이상 있을 때만)"""
+    footer = layout.get("footer", [])
+    return [] if row_count - 1 <= len(footer) else footer
+
+
+def growth_start(layout, old_count):
+    """서식을 적용한 행 수가 old_count인 시트에 행이 늘었을 때 다시 적용할 첫 행 (예전 하단 행부터, 빈 시트였으면 0 = 전체)"""
+    if old_count == 0:
+        return 0
+    return max(1, old_count - len(_footer(layout, old_count)))
+
+
+def compile_layout(layout, sheet_id, row_count, start_row=0):
+    """레이아웃 + 현재 행 수(헤더 포함) → batchUpdate 요청 목록
+
+    start_row > 0이면 그 행부터 끝까지의 본문·하단 행 서식만 (열 너비·헤더·고정 행은 그대로 둠)
+    """
+    columns = layout["columns"]
+    requests_list = []
+
+    if start_row == 0:
+        # 열 너비: 너비가 같은 인접 열은 한 범위로
+        for start, end, width in _runs(list(layout.get("widths", []))):
+            requests_list.append({
+                "updateDimensionProperties": {
+                    "range": {"sheetId": sheet_id, "dimension": "COLUMNS", "startIndex": start, "endIndex": end},
+                    "properties": {"pixelSize": width},
+                    "fields": "pixelSize",
+                }
+            })
+
+        if layout.get("header"):
+            requests_list += _repeat_cells(
+                sheet_id, 0, 1, _column_formats(columns, [(0, columns, layout["header"])], [])
+            )
+        if layout.get("header_height"):
+            requests_list.append({
+                "updateDimensionProperties": {
+                    "range": {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": 0, "endIndex": 1},
+                    "properties": {"pixelSize": layout["header_height"]},
+                    "fields": "pixelSize",
+                }
+            })
+
+    # 본문 + 하단 행 (하단 행은 본문이 1행 이상 있을 때만)
+    footer = _footer(layout, row_count)
+    body_start = max(1, start_row)
+    body_end = row_count - len(footer)
+    if body_end > body_start:
+        requests_list += _repeat_cells(sheet_id, body_start, body_end, _column_formats(columns, layout.get("body", []), []))
+        for start, end, rule in layout.get("validations", []):
+            requests_list.append({"setDataValidation": {"range": _grid(sheet_id, body_start, body_end, start, end), "rule": rule}})
+    for offset, fmt in enumerate(footer):
+        row = body_end + offset
+        if row >= body_start:
+            requests_list += _repeat_cells(sheet_id, row, row + 1, _column_formats(columns, [(0, columns, fmt)], []))
+    # 덧씌우는 서식은 본문 + 하단 행 전체에 열 단위로 한 번만
+    if row_count > body_start:
+        requests_list += _repeat_cells(sheet_id, body_start, row_count, _column_formats(columns, [], layout.get("overlays", [])))
+
+    if layout.get("borders") and row_count > start_row:
+        requests_list.append({
+            "updateBorders": {
+                "range": _grid(sheet_id, start_row, row_count, 0, columns),
+                # 늘어난 행만 적용할 때 위쪽은 기존 행과의 안쪽 선
+                "top": BORDER_OUTER if start_row == 0 else BORDER_INNER,
+                "bottom": BORDER_OUTER,
+                "left": BORDER_OUTER,
+                "right": BORDER_OUTER,
+                "innerHorizontal": BORDER_INNER,
+                "innerVertical": BORDER_INNER,
+            }
+        })
+
+    if start_row == 0 and layout.get("frozen_rows") is not None:
+        requests_list.append({
+            "updateSheetProperties": {
+                "properties": {"sheetId": sheet_id, "gridProperties": {"frozenRowCount": layout["frozen_rows"]}},
+                "fields": "gridProperties.frozenRowCount",
+            }
+        })
+    return requests_list
+
+
+def fingerprint(layout):
+    """레이아웃 정의의 지문 (행 수와 무관 → 게시물이 늘어도 그대로)"""
+    payload = json.dumps(layout, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+실행 1회에 필요한 모든 시트 값을 한꺼번에 읽어 두는 스냅샷
+자동수집 / 팔로워추적 / 일별종합리포트를 각각 get_all_values() + 수식 범위로 따로 읽던 방식 대체
+시트가 커지면 (게시물 수만 개) 행 구간별 요청으로 나눠 읽음
+"""
+
+import os
+
+import gspread
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from sheet_layout import METADATA_FIELDS, sheet_metadata
+
+# 셀마다 수식(입력값)과 표시값을 같이 받아서
+#   formulas() = FORMULA 렌더링과 같은 값 (수식 / 입력된 숫자·문자)
+#   values()   = get_all_values()와 같은 표시값 (천 단위 콤마, % 포함)
+# 을 모두 만들 수 있게 함. values:batchGet은 요청 전체에 렌더링 방식이 하나뿐이라
+# spreadsheets.get(includeGridData + 필드 마스크)으로 한 번에 읽는다.
+SHEET_FIELDS = f"sheets(properties(sheetId,title,index,gridProperties(rowCount,columnCount,frozenRowCount)),{METADATA_FIELDS})"
+GRID_FIELDS = "sheets(properties(title),data(startRow,startColumn,rowData(values(userEnteredValue,formattedValue))))"
+
+# 읽기 요청 1회에 담을 최대 셀 수 (시트 크기 기준) — 큰 시트는 행 구간으로 나눠 여러 번 읽음
+READ_CHUNK_CELLS = int(os.environ.get("SHEETS_READ_CHUNK_CELLS", "200000"))
+# 시트 크기를 늘릴 때 추가로 확보할 여유 행 (매일 조금씩 늘어나는 시트의 크기 변경 요청 횟수 감소)
+GRID_ROW_HEADROOM = 1000
+
+
+def _entered_value(cell):
+    """userEnteredValue → FORMULA 렌더링 값"""
+    entered = cell.get("userEnteredValue")
+    if not entered:
+        return ""
+    for key in ("formulaValue", "stringValue", "numberValue", "boolValue"):
+        if key in entered:
+            return entered[key]
+    return ""
+
+
+def _trim(grid):
+    """values API처럼 각 행 끝의 빈칸과 끝의 빈 행 제거"""
+    out = []
+    for row in grid:
+        while row and row[-1] == "":
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+class SheetSnapshot:
+    """여러 시트의 값을 한 번에 읽어 두고, 각 쓰기 함수는 여기서 읽음
+
+    시트 속성·메타데이터 조회 1회 + 셀 읽기 (전체 셀 수가 chunk_cells 이하면 1회, 크면 행 구간별로 나눠서)
+    """
+
+    def __init__(self, spreadsheet, titles, chunk_cells=READ_CHUNK_CELLS):
+        self.spreadsheet = spreadsheet
+        self.chunk_cells = chunk_cells
+        self.sheets = {}  # 시트 이름 → {"properties", "metadata", "formulas", "values"}
+        self._load(list(titles))
+
+    def _load(self, titles):
+        if not titles:
+            return
+        # 없는 시트는 범위에 넣으면 400 → 속성 조회로 있는 시트만 골라서 읽음
+        meta = self.spreadsheet.fetch_sheet_metadata(params={"fields": SHEET_FIELDS})
+        grids = {}
+        for sheet in meta.get("sheets", []):
+            title = sheet["properties"]["title"]
+            if title in titles:
+                self.sheets[title] = {"properties": sheet["properties"], "metadata": sheet_metadata(sheet)}
+                grids[title] = ([], [])
+
+        for ranges in self._read_plan():
+            data = self.spreadsheet.fetch_sheet_metadata(params={
+                "includeGridData": "true",
+                "ranges": ranges,
+                "fields": GRID_FIELDS,
+            })
+            for sheet in data.get("sheets", []):
+                formulas, values = grids[sheet["properties"]["title"]]
+                for block in sheet.get("data", []):
+                    start = block.get("startRow", 0)
+                    for r, row_data in enumerate(block.get("rowData", []), start=start):
+                        while len(formulas) <= r:
+                            formulas.append([])
+                            values.append([])
+                        cells = row_data.get("values", [])
+                        formulas[r] = [_entered_value(c) for c in cells]
+                        values[r] = [c.get("formattedValue", "") for c in cells]
+
+        for title, (formulas, values) in grids.items():
+            self.sheets[title]["formulas"] = _trim(formulas)
+            self.sheets[title]["values"] = _trim(values)
+
+    def _read_plan(self):
+        """시트 크기(행 × 열) 기준으로 요청별 범위 목록 — 요청 1회가 chunk_cells를 넘지 않게 나눔"""
+        pieces = []  # (범위, 셀 수)
+        for title, sheet in self.sheets.items():
+            grid = sheet["properties"].get("gridProperties", {})
+            rows, cols = grid.get("rowCount", 0), max(1, grid.get("columnCount", 1))
+            step = max(1, self.chunk_cells // cols)
+            if rows <= step:
+                pieces.append((absolute_range_name(title), rows * cols))
+                continue
+            last_col = rowcol_to_a1(1, cols).rstrip("0123456789")
+            for r0 in range(0, rows, step):
+                r1 = min(rows, r0 + step)
+                pieces.append((absolute_range_name(title, f"A{r0 + 1}:{last_col}{r1}"), (r1 - r0) * cols))
+
+        plan, current, cells = [], [], 0
+        for range_name, size in pieces:
+            if current and cells + size > self.chunk_cells:
+                plan.append(current)
+                current, cells = [], 0
+            current.append(range_name)
+            cells += size
+        if current:
+            plan.append(current)
+        return plan
+
+    def add(self, worksheet):
+        """이번 실행에 새로 만든 빈 시트 등록 (크기 확장·메타데이터 기록에 사용)"""
+        self.sheets[worksheet.title] = {
+            "properties": {
+                "sheetId": worksheet.id,
+                "title": worksheet.title,
+                "index": worksheet.index,
+                "gridProperties": {"rowCount": worksheet.row_count, "columnCount": worksheet.col_count},
+            },
+            "metadata": {},
+            "formulas": [],
+            "values": [],
+        }
+
+    def ensure_grid(self, title, rows, cols):
+        """시트 크기가 rows × cols보다 작으면 여유 행을 더해서 늘림 (필요할 때만 batchUpdate 1회)"""
+        props = self.sheets[title]["properties"]
+        grid = props.setdefault("gridProperties", {})
+        row_count, col_count = grid.get("rowCount", 0), grid.get("columnCount", 0)
+        if row_count >= rows and col_count >= cols:
+            return False
+        new_rows = row_count if row_count >= rows else rows + GRID_ROW_HEADROOM
+        new_cols = max(col_count, cols)
+        self.spreadsheet.batch_update({"requests": [{
+            "updateSheetProperties": {
+                "properties": {"sheetId": props["sheetId"], "gridProperties": {"rowCount": new_rows, "columnCount": new_cols}},
+                "fields": "gridProperties.rowCount,gridProperties.columnCount",
+            }
+        }]})
+        grid["rowCount"], grid["columnCount"] = new_rows, new_cols
+        print(f"  '{title}' 시트 크기 확장: {new_rows:,}행 × {new_cols}열")
+        return True
+
+    def realign_rows(self, title, deleted, inserted, insert_at=1):
+        """기존 행 삭제(deleted: 0-based 행 번호) + insert_at행 앞에 빈 행 inserted개 삽입 (batchUpdate 1회)
+
+        읽어 둔 값·시트 크기도 같이 옮겨 둠. 삽입한 행은 아래 행의 서식을 이어받음 (헤더 바로 아래에 넣어도 본문 서식)
+        """
+        props = self.sheets[title]["properties"]
+        requests_list = [
+            {"deleteDimension": {"range": {"sheetId": props["sheetId"], "dimension": "ROWS", "startIndex": r, "endIndex": r + 1}}}
+            for r in sorted(deleted, reverse=True)
+        ]
+        if inserted:
+            requests_list.append({"insertDimension": {
+                "range": {"sheetId": props["sheetId"], "dimension": "ROWS", "startIndex": insert_at, "endIndex": insert_at + inserted},
+                "inheritFromBefore": False,
+            }})
+        if not requests_list:
+            return
+        self.spreadsheet.batch_update({"requests": requests_list})
+        grid = props.setdefault("gridProperties", {})
+        grid["rowCount"] = grid.get("rowCount", 0) - len(deleted) + inserted
+        for key in ("formulas", "values"):
+            cached = self.sheets[title][key]
+            for r in sorted(deleted, reverse=True):
+                if r < len(cached):
+                    del cached[r]
+            if insert_at < len(cached):
+                cached[insert_at:insert_at] = [[] for _ in range(inserted)]
+
+    def has(self, title):
+        return title in self.sheets
+
+    def worksheet(self, title):
+        """스냅샷의 시트 속성으로 Worksheet 생성 (spreadsheet.worksheet()의 메타데이터 재요청 없음)"""
+        if title not in self.sheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return gspread.Worksheet(
+            self.spreadsheet, self.sheets[title]["properties"], self.spreadsheet.id, self.spreadsheet.client
+        )
+
+    def metadata(self, title):
+        """시트 개발자 메타데이터 {키: (metadataId, 값)}"""
+        return dict(self.sheets.get(title, {}).get("metadata", {}))
+
+    def formulas(self, title):
+        """FORMULA 렌더링 값 (없는 시트면 빈 목록)"""
+        return [list(r) for r in self.sheets.get(title, {}).get("formulas", [])]
+
+    def values(self, title):
+        """표시값 (get_all_values()와 같음, 없는 시트면 빈 목록)"""
+        return [list(r) for r in self.sheets.get(title, {}).get("values", [])]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+게시물 일별 지표 스냅샷 저장소 (로컬 SQLite)
+(shortcode, 체크 일자)당 1행씩 쌓아서 게시물별 성장 추이·주간 상승 게시물을 로컬 쿼리로 조회
+
+사용 예:
+  python snapshot_store.py growth <shortcode> --metric reach --days 30
+  python snapshot_store.py movers --metric reach --days 7 --limit 10
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+from datetime import date, timedelta
+
+# 저장하는 지표 컬럼 (시트 열 인덱스와 같은 순서: H ~ W)
+METRIC_COLUMNS = [
+    ("reach", 7, "INTEGER"),
+    ("views", 8, "INTEGER"),
+    ("likes", 9, "INTEGER"),
+    ("saves", 10, "INTEGER"),
+    ("shares", 11, "INTEGER"),
+    ("comments", 12, "INTEGER"),
+    ("total_interactions", 13, "INTEGER"),
+    ("engagement_count", 14, "INTEGER"),
+    ("engagement_rate", 15, "REAL"),
+    ("save_rate", 16, "REAL"),
+    ("share_rate", 17, "REAL"),
+    ("follower_reach_rate", 18, "REAL"),
+    ("profile_visits", 19, "INTEGER"),
+    ("profile_activity", 20, "INTEGER"),
+    ("follows", 21, "INTEGER"),
+    ("followers", 22, "INTEGER"),
+]
+METRIC_NAMES = [name for name, _, _ in METRIC_COLUMNS]
+
+SHORTCODE_RE = re.compile(r'instagram\.com/(?:p|reel|[^/]+/reel)/([A-Za-z0-9_-]+)')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS post_snapshots (
+    shortcode TEXT NOT NULL,
+    check_date TEXT NOT NULL,
+    media_id TEXT,
+    media_type TEXT,
+    upload_date TEXT,
+    {", ".join(f"{name} {sql_type}" for name, _, sql_type in METRIC_COLUMNS)},
+    PRIMARY KEY (shortcode, check_date)
+);
+-- 기본 키 (shortcode, check_date)가 shortcode 조회 인덱스 역할
+CREATE INDEX IF NOT EXISTS idx_post_snapshots_date ON post_snapshots (check_date);
+"""
+
+
+def _cell_value(val):
+    """시트 행 값 → 저장 값 ('5.2%' → 5.2, 빈칸 → NULL)"""
+    if val is None or val == "":
+        return None
+    if isinstance(val, str) and val.endswith("%"):
+        try:
+            return float(val[:-1])
+        except ValueError:
+            return None
+    return val if isinstance(val, (int, float)) else None
+
+
+class SnapshotStore:
+    """post_snapshots 테이블 읽기/쓰기 (WAL 모드)"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        # WAL 내용을 본 파일에 반영해서 캐시/백업 시 파일 하나만 옮기면 되도록
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_rows(self, check_date, media_list, rows):
+        """수집 결과 행(A~X열) 저장 — 같은 날 재실행하면 덮어씀"""
+        records = []
+        for media, row in zip(media_list, rows):
+            m = SHORTCODE_RE.search(media.get("permalink", "") or "")
+            if not m:
+                continue
+            records.append([
+                m.group(1), check_date, media.get("id"), media.get("media_type", ""),
+                (media.get("timestamp") or "")[:10],
+            ] + [_cell_value(row[idx]) for _, idx, _ in METRIC_COLUMNS])
+        columns = ["shortcode", "check_date", "media_id", "media_type", "upload_date"] + METRIC_NAMES
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO post_snapshots ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                records,
+            )
+        return len(records)
+
+    def latest_date(self):
+        row = self.conn.execute("SELECT MAX(check_date) FROM post_snapshots").fetchone()
+        return row[0]
+
+    def history(self, shortcode, metric="reach", days=30):
+        """게시물 하나의 최근 days일 지표 추이 → [(날짜, 값), ...]"""
+        self._check_metric(metric)
+        end = self.latest_date()
+        if end is None:
+            return []
+        start = (date.fromisoformat(end) - timedelta(days=days)).isoformat()
+        return self.conn.execute(
+            f"SELECT check_date, {metric} FROM post_snapshots "
+            "WHERE shortcode = ? AND check_date >= ? ORDER BY check_date",
+            (shortcode, start),
+        ).fetchall()
+
+    def growth(self, shortcode, metric="reach", days=30):
+        """최근 days일 동안의 지표 증가량 (데이터가 부족하면 None)"""
+        points = [v for _, v in self.history(shortcode, metric, days) if v is not None]
+        if len(points) < 2:
+            return None
+        return points[-1] - points[0]
+
+    def top_movers(self, metric="reach", days=7, limit=10):
+        """최근 days일 동안 지표가 가장 많이 오른 게시물 → [(shortcode, 현재값, 증가량), ...]"""
+        self._check_metric(metric)
+        end = self.latest_date()
+        if end is None:
+            return []
+        start = (date.fromisoformat(end) - timedelta(days=days)).isoformat()
+        # 기준일 값: 기준일 이전 가장 최근 스냅샷 (기본 키 인덱스로 조회)
+        return self.conn.execute(
+            f"""
+            SELECT shortcode, cur_value, cur_value - base_value AS delta FROM (
+                SELECT cur.shortcode, cur.{metric} AS cur_value,
+                       (SELECT prev.{metric} FROM post_snapshots prev
+                        WHERE prev.shortcode = cur.shortcode AND prev.check_date <= ?
+                        ORDER BY prev.check_date DESC LIMIT 1) AS base_value
+                FROM post_snapshots cur
+                WHERE cur.check_date = ?
+            )
+            WHERE base_value IS NOT NULL AND cur_value IS NOT NULL
+            ORDER BY delta DESC
+            LIMIT ?
+            """,
+            (start, end, limit),
+        ).fetchall()
+
+    @staticmethod
+    def _check_metric(metric):
+        if metric not in METRIC_NAMES:
+            raise ValueError(f"알 수 없는 지표: {metric} (가능: {', '.join(METRIC_NAMES)})")
+
+
+def main():
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "state", "snapshots.sqlite3")
+    parser = argparse.ArgumentParser(description="게시물 지표 스냅샷 조회")
+    parser.add_argument("--db", default=os.environ.get("SNAPSHOT_DB", default_path))
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_growth = sub.add_parser("growth", help="게시물 하나의 지표 추이")
+    p_growth.add_argument("shortcode")
+    p_growth.add_argument("--metric", default="reach")
+    p_growth.add_argument("--days", type=int, default=30)
+    p_movers = sub.add_parser("movers", help="기간 내 지표 상승 상위 게시물")
+    p_movers.add_argument("--metric", default="reach")
+    p_movers.add_argument("--days", type=int, default=7)
+    p_movers.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with SnapshotStore(args.db) as store:
+        if args.command == "growth":
+            for check_date, value in store.history(args.shortcode, args.metric, args.days):
+                print(f"  {check_date}  {value}")
+            print(f"  {args.days}일 증가량: {store.growth(args.shortcode, args.metric, args.days)}")
+        else:
+            for rank, (shortcode, value, delta) in enumerate(store.top_movers(args.metric, args.days, args.limit), 1):
+                print(f"  {rank:>2}. {shortcode}  {args.metric}={value:,}  (+{delta:,})")
+
+
+if __name__ == "__main__":
+    main()